@@ -0,0 +1,155 @@
+import threading
+import time
+from collections import Counter
+
+# Seconds between full reconciliations against the employees table
+ANALYTICS_RECONCILE_SECONDS = 300
+
+ANALYTICS_VIEWS = ('department_headcount', 'status_breakdown', 'hires_per_month', 'salary_by_department')
+
+
+def _facts(row):
+    """
+    Reduces an employee row to the (department, status, hire month, salary)
+    it contributes to the aggregates.
+    """
+    joined = row.get('date_of_joining')
+    salary = row.get('salary')
+    return (row.get('department') or 'Unassigned',
+            row.get('status') or 'Unknown',
+            str(joined)[:7] if joined else None,
+            float(salary) if salary is not None else 0.0)
+
+
+class _Aggregates:
+    def __init__(self):
+        self.facts = {}                   # employee id -> _facts(row)
+        self.departments = Counter()
+        self.statuses = Counter()
+        self.hire_months = Counter()
+        self.salary_totals = Counter()
+
+    def _apply(self, facts, sign):
+        department, status, month, salary = facts
+        self.departments[department] += sign
+        self.statuses[status] += sign
+        if month:
+            self.hire_months[month] += sign
+        self.salary_totals[department] += sign * salary
+        for counter, key in ((self.departments, department), (self.statuses, status), (self.hire_months, month)):
+            if key in counter and counter[key] <= 0:
+                del counter[key]
+                if counter is self.departments:
+                    del self.salary_totals[key]
+
+    def put(self, id, row):
+        self.remove(id)
+        facts = _facts(row)
+        self.facts[id] = facts
+        self._apply(facts, 1)
+
+    def remove(self, id):
+        facts = self.facts.pop(id, None)
+        if facts is not None:
+            self._apply(facts, -1)
+
+
+class WorkforceAnalytics:
+    """
+    Materialized HR aggregates (headcount by department and status, hires
+    per month, salary by department) kept in memory. EmployeeList events
+    adjust them incrementally; a full reconciliation from the database runs
+    when they are older than `reconcile_seconds`, which also picks up
+    writes made by other worker processes. Reads cost O(groups); with an
+    `executor`, stale aggregates keep being served while they reconcile.
+    """
+
+    def __init__(self, load_rows, executor=None, reconcile_seconds=ANALYTICS_RECONCILE_SECONDS):
+        self._load_rows = load_rows
+        self._executor = executor
+        self._reconcile_seconds = reconcile_seconds
+        self._lock = threading.Lock()
+        self._reconcile_lock = threading.Lock()
+        self._aggregates = None
+        self._reconciled_at = 0.0
+        # Events seen while a reconciliation is loading, replayed onto its result
+        self._pending = None
+        self._observers = []
+
+    # Observers are notified after every reconciliation, which is when other
+    # workers' writes show up here
+    def register_observer(self, observer):
+        self._observers.append(observer)
+
+    def reconcile(self):
+        with self._reconcile_lock:
+            self._reconcile()
+
+    def _reconcile(self):
+        # Caller holds _reconcile_lock
+        with self._lock:
+            self._pending = []
+        try:
+            fresh = _Aggregates()
+            for row in self._load_rows():
+                fresh.put(row['id'], row)
+        finally:
+            with self._lock:
+                pending, self._pending = self._pending, None
+        with self._lock:
+            for event in pending:
+                self._apply_event(fresh, event)
+            self._aggregates = fresh
+            self._reconciled_at = time.monotonic()
+        for observer in self._observers:
+            observer.update("Workforce analytics reconciled")
+
+    def _current(self):
+        if self._aggregates is None:
+            # Concurrent first requests wait for one reconciliation instead of each running their own
+            with self._reconcile_lock:
+                if self._aggregates is None:
+                    self._reconcile()
+        elif time.monotonic() - self._reconciled_at > self._reconcile_seconds:
+            if self._executor is None:
+                self.reconcile()
+            elif not self._reconcile_lock.locked():
+                self._executor.submit(self.reconcile)
+        return self._aggregates
+
+    @staticmethod
+    def _apply_event(aggregates, event):
+        if event.action == 'deleted':
+            aggregates.remove(event.entity_id)
+        elif event.new is not None:
+            aggregates.put(event.entity_id, event.new)
+
+    # Observer hook called by EmployeeList after every write
+    def update(self, event):
+        if getattr(event, 'entity', None) != 'employee':
+            return
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(event)
+            if self._aggregates is not None:
+                self._apply_event(self._aggregates, event)
+
+    def view(self, name):
+        aggregates = self._current()
+        with self._lock:
+            if name == 'department_headcount':
+                return [{'department': key, 'count': count} for key, count in sorted(aggregates.departments.items())]
+            if name == 'status_breakdown':
+                return [{'status': key, 'count': count} for key, count in sorted(aggregates.statuses.items())]
+            if name == 'hires_per_month':
+                return [{'month': key, 'count': count} for key, count in sorted(aggregates.hire_months.items())]
+            if name == 'salary_by_department':
+                return [{'department': key, 'count': count, 'total': round(aggregates.salary_totals[key], 2),
+                         'average': round(aggregates.salary_totals[key] / count, 2)}
+                        for key, count in sorted(aggregates.departments.items())]
+        raise KeyError(name)
+
+    def summary(self):
+        views = {name: self.view(name) for name in ANALYTICS_VIEWS}
+        views['employee_count'] = sum(row['count'] for row in views['department_headcount'])
+        return views
@@ -0,0 +1,133 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+# Stored hash used for unknown accounts so failed lookups cost as much as failed passwords
+_DUMMY_PASSWORD = 'not-a-real-password'
+
+
+# Werkzeug's parameters for methods given without them
+_DEFAULT_PARAMETERS = {'scrypt': ('32768', '8', '1'), 'pbkdf2': ('sha256', '600000')}
+_PBKDF2_DIGESTS = ('sha1', 'sha224', 'sha256', 'sha384', 'sha512')
+
+
+def hash_strength(method):
+    """
+    Orders werkzeug hash methods ('scrypt:32768:8:1', 'pbkdf2:sha256:600000')
+    by strength: any scrypt is ranked above any PBKDF2, then by cost.
+    Returns None for methods it does not know, which are left alone.
+    """
+    name, *parameters = method.split(':')
+    if name not in _DEFAULT_PARAMETERS:
+        return None
+    parameters = parameters or list(_DEFAULT_PARAMETERS[name])
+    try:
+        if name == 'scrypt':
+            n, r, p = (int(value) for value in parameters)
+            return (1, n * r * p, 0)
+        digest, iterations = parameters
+        return (0, int(iterations), _PBKDF2_DIGESTS.index(digest) if digest in _PBKDF2_DIGESTS else -1)
+    except ValueError:
+        return None
+
+
+# Raised when too many hashes are already queued or one takes too long
+class AuthBusy(Exception):
+    pass
+
+
+class RateLimiter:
+    """
+    In-memory token buckets keyed by e.g. client IP or account. Each key
+    holds up to `burst` tokens and regains `rate` tokens per second; the
+    least recently used keys are forgotten beyond `maxsize`.
+    """
+
+    def __init__(self, rate, burst, maxsize=100000):
+        self.rate = rate
+        self.burst = burst
+        self.maxsize = maxsize
+        self._buckets = OrderedDict()   # key -> (tokens, updated_at)
+        self._lock = threading.Lock()
+
+    def allow(self, key):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+            return allowed
+
+    def reset(self, key):
+        with self._lock:
+            self._buckets.pop(key, None)
+
+
+class PasswordHasher:
+    """
+    Runs password hashing and verification on a dedicated, bounded pool so
+    a burst of logins cannot occupy every request thread with hashing.
+    Requests beyond `workers + queue_size` in flight fail fast with AuthBusy,
+    as do requests still waiting for their hash after `timeout` seconds.
+    `method` is a fully parameterized werkzeug method (e.g. 'scrypt:32768:8:1');
+    weaker hashes are reported by needs_rehash().
+    """
+
+    def __init__(self, method, workers=2, queue_size=32, timeout=10.0):
+        self.method = method
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hasher')
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        # Computed on the first unknown-account login rather than at startup
+        self._dummy_hash = None
+
+    def _run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            raise AuthBusy("Too many sign-in attempts in progress. Please try again shortly.")
+        try:
+            future = self._executor.submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(self.timeout)
+        except FutureTimeout:
+            # Queued behind too much hashing; dropped if it has not started, answered like a full pool
+            future.cancel()
+            raise AuthBusy("Sign-in is taking too long. Please try again shortly.") from None
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, stored_hash, password):
+        """
+        Checks `password` against `stored_hash`; a missing hash is checked
+        against a dummy one so unknown accounts take as long as known ones.
+        """
+        if stored_hash is None:
+            if self._dummy_hash is None:
+                self._dummy_hash = self._run(generate_password_hash, _DUMMY_PASSWORD, self.method)
+            self._run(check_password_hash, self._dummy_hash, password)
+            return False
+        return self._run(check_password_hash, stored_hash, password)
+
+    def needs_rehash(self, stored_hash):
+        """
+        True only for hashes weaker than `method`: stronger or unknown ones
+        are kept, so changing the setting never migrates hashes down.
+        """
+        stored = hash_strength(stored_hash.split('$', 1)[0])
+        target = hash_strength(self.method)
+        return stored is not None and target is not None and stored < target
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
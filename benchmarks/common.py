@@ -0,0 +1,54 @@
+"""
+Shared helpers for the benchmark scripts: backend selection and
+latency statistics.
+"""
+import os
+import tempfile
+
+from config import Config
+
+
+def add_backend_arguments(parser):
+    parser.add_argument('--backend', choices=('mysql', 'sqlite'), default='sqlite',
+                        help='run against the MySQL server in Config or an embedded SQLite stand-in')
+    parser.add_argument('--sqlite-path', default=os.path.join(tempfile.gettempdir(), 'scd_bench.sqlite3'),
+                        help='database file used by the sqlite backend')
+
+
+def use_backend(args):
+    """
+    Points Config's connection pool at the selected backend.
+    Must run before the app issues its first query.
+    """
+    Config.DB_BACKEND = args.backend
+    if args.backend == 'sqlite':
+        Config.SQLITE_PATH = args.sqlite_path
+    return Config.get_pool()
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(latencies, elapsed):
+    """
+    Returns count, throughput and p50/p95/p99 (in milliseconds) for a
+    list of latencies in seconds measured over `elapsed` seconds.
+    """
+    values = sorted(latencies)
+    return {
+        'count': len(values),
+        'throughput': len(values) / elapsed if elapsed else 0.0,
+        'p50': percentile(values, 0.50) * 1000,
+        'p95': percentile(values, 0.95) * 1000,
+        'p99': percentile(values, 0.99) * 1000,
+    }
+
+
+def print_summary(rows):
+    print(f"{'name':<32} {'count':>8} {'ops/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, stats in rows:
+        print(f"{name:<32} {stats['count']:>8} {stats['throughput']:>10.1f} {stats['p50']:>9.2f} {stats['p95']:>9.2f} {stats['p99']:>9.2f}")
@@ -0,0 +1,118 @@
+"""
+Seeded data generator for employees, inventory and employee_inventory.
+
+Usage: python -m benchmarks.datagen --employees 100000 [--backend mysql] [--seed 42]
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from benchmarks.common import add_backend_arguments, use_backend
+
+DEPARTMENTS = ('Engineering', 'HR', 'Sales', 'Marketing', 'Finance', 'Support', 'Operations', 'Legal')
+JOB_TITLES = ('Engineer', 'Senior Engineer', 'Manager', 'Analyst', 'Associate', 'Director', 'Specialist', 'Intern')
+QUALIFICATIONS = ('BSc', 'MSc', 'PhD', 'BBA', 'MBA', 'Diploma')
+STATUSES = ('Active', 'Active', 'Active', 'On Leave', 'Terminated')
+ITEMS = ('Laptop', 'Monitor', 'Keyboard', 'Mouse', 'Headset', 'Phone', 'Desk', 'Chair', 'Badge', 'Docking Station')
+
+BATCH_SIZE = 5000
+
+
+def employee_rows(count, seed):
+    rng = random.Random(seed)
+    first_day = date(2000, 1, 1)
+    span = (date.today() - first_day).days
+    for id in range(1, count + 1):
+        yield (id, f"Employee {id}", f"employee{id}@example.com", rng.randint(1960, 2003),
+               rng.choice(QUALIFICATIONS), round(rng.uniform(30000, 250000), 2), rng.choice(JOB_TITLES),
+               first_day + timedelta(days=rng.randrange(span)), rng.choice(DEPARTMENTS), rng.choice(STATUSES))
+
+
+def inventory_rows(count, seed):
+    rng = random.Random(seed + 1)
+    for id in range(1, count + 1):
+        yield (id, f"{rng.choice(ITEMS)} #{id}", rng.randint(1, 500), 'Generated for benchmarks')
+
+
+def assignment_rows(count, employees, items, seed):
+    rng = random.Random(seed + 2)
+    first_day = date(2015, 1, 1)
+    span = (date.today() - first_day).days
+    for _ in range(count):
+        yield (rng.randint(1, employees), rng.randint(1, items), first_day + timedelta(days=rng.randrange(span)))
+
+
+def _insert(cursor_factory, sql, rows):
+    batch = []
+    total = 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            total += cursor_factory(sql, batch)
+            batch = []
+    if batch:
+        total += cursor_factory(sql, batch)
+    return total
+
+
+def generate(pool, employees, items=None, assignments=None, seed=42):
+    """
+    Replaces the contents of the benchmark tables with seeded rows.
+    Returns the number of rows written per table.
+    """
+    items = items or max(1, employees // 10)
+    assignments = employees * 2 if assignments is None else assignments
+
+    def write(sql, batch):
+        with pool.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.executemany(sql, batch)
+            conn.commit()
+        return len(batch)
+
+    with pool.connection() as conn:
+        with conn.cursor() as cursor:
+            for table in ('employee_inventory', 'document_shares', 'documents', 'inventory', 'employees'):
+                cursor.execute(f"DELETE FROM {table}")
+        conn.commit()
+
+    counts = {
+        'employees': _insert(write, """
+            INSERT INTO employees (id, name, email, year_of_birth, qualification, salary, job_title, date_of_joining, department, status)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """, employee_rows(employees, seed)),
+        'inventory': _insert(write, """
+            INSERT INTO inventory (id, name, quantity, description) VALUES (%s, %s, %s, %s)
+        """, inventory_rows(items, seed)),
+        'employee_inventory': _insert(write, """
+            INSERT INTO employee_inventory (employee_id, inventory_id, assigned_date) VALUES (%s, %s, %s)
+        """, assignment_rows(assignments, employees, items, seed)),
+    }
+
+    # Keep the maintained stock counters consistent with the generated assignments
+    with pool.connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                UPDATE inventory
+                SET quantity = quantity + (SELECT COUNT(*) FROM employee_inventory ei WHERE ei.inventory_id = inventory.id AND ei.returned_date IS NULL),
+                    assigned_count = (SELECT COUNT(*) FROM employee_inventory ei WHERE ei.inventory_id = inventory.id AND ei.returned_date IS NULL)
+            """)
+        conn.commit()
+    return counts
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_backend_arguments(parser)
+    parser.add_argument('--employees', type=int, default=10000)
+    parser.add_argument('--items', type=int, default=None, help='defaults to employees / 10')
+    parser.add_argument('--assignments', type=int, default=None, help='defaults to employees * 2')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    started = time.monotonic()
+    counts = generate(use_backend(args), args.employees, args.items, args.assignments, args.seed)
+    for table, count in counts.items():
+        print(f"{table:<20} {count:>10} rows")
+    print(f"Generated in {time.monotonic() - started:.1f}s")
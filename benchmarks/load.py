@@ -0,0 +1,130 @@
+"""
+HTTP load driver for the main read routes.
+
+Runs concurrent clients against the app through Flask's test client or a
+local WSGI server on 127.0.0.1 and reports p50/p95/p99 latency and
+throughput per route.
+
+Usage: python -m benchmarks.load [--backend mysql] [--clients 8] [--seconds 10] [--wsgi]
+"""
+import argparse
+import threading
+import time
+import urllib.request
+from collections import defaultdict
+
+from benchmarks.common import add_backend_arguments, use_backend, summarize, print_summary
+from benchmarks.datagen import generate
+
+ROUTES = ('/', '/list_employees', '/chart', '/dashboard_data', '/employee_inventory_list')
+
+
+def _test_client_session(app):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = 1
+
+    def get(path):
+        response = client.get(path)
+        response.close()
+        return response.status_code
+    return get
+
+
+def _wsgi_session(base_url, cookie):
+    opener = urllib.request.build_opener()
+    opener.addheaders = [('Cookie', cookie)]
+
+    def get(path):
+        with opener.open(base_url + path) as response:
+            response.read()
+            return response.status
+    return get
+
+
+def _start_wsgi_server(app):
+    from werkzeug.serving import make_server
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def _session_cookie(app):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = 1
+    cookie = client.get_cookie(app.config.get('SESSION_COOKIE_NAME', 'session'))
+    return f"{cookie.key}={cookie.value}"
+
+
+def run(args):
+    pool = use_backend(args)
+    if not args.skip_generate:
+        generate(pool, args.employees, seed=args.seed)
+
+    from app import app
+
+    server = None
+    if args.wsgi:
+        server, base_url = _start_wsgi_server(app)
+        cookie = _session_cookie(app)
+        make_session = lambda: _wsgi_session(base_url, cookie)
+    else:
+        make_session = lambda: _test_client_session(app)
+
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    lock = threading.Lock()
+    deadline = time.monotonic() + args.seconds
+
+    def client_loop(index):
+        get = make_session()
+        local = defaultdict(list)
+        local_errors = defaultdict(int)
+        i = index
+        while time.monotonic() < deadline:
+            route = ROUTES[i % len(ROUTES)]
+            i += 1
+            t0 = time.perf_counter()
+            try:
+                status = get(route)
+            except Exception:
+                status = 599
+            local[route].append(time.perf_counter() - t0)
+            if status >= 400:
+                local_errors[route] += 1
+        with lock:
+            for route, values in local.items():
+                latencies[route].extend(values)
+            for route, count in local_errors.items():
+                errors[route] += count
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=client_loop, args=(i,)) for i in range(args.clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+    if server:
+        server.shutdown()
+
+    results = [(route, summarize(latencies[route], elapsed)) for route in ROUTES]
+    results.append(('total', summarize([value for values in latencies.values() for value in values], elapsed)))
+    print_summary(results)
+    for route, count in errors.items():
+        print(f"{route}: {count} error responses")
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_backend_arguments(parser)
+    parser.add_argument('--employees', type=int, default=10000)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--wsgi', action='store_true', help='serve the app on 127.0.0.1 instead of using the test client')
+    parser.add_argument('--skip-generate', action='store_true', help='reuse the data already in the database')
+    run(parser.parse_args())
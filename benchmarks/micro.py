@@ -0,0 +1,75 @@
+"""
+Micro-benchmarks for EmployeeFactory validation and each EmployeeList method.
+
+Usage: python -m benchmarks.micro [--backend mysql] [--employees 10000] [--iterations 200]
+"""
+import argparse
+import random
+import time
+
+from benchmarks.common import add_backend_arguments, use_backend, summarize, print_summary
+from benchmarks.datagen import generate
+
+
+def measure(function, iterations):
+    latencies = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        function(i)
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def run(args):
+    pool = use_backend(args)
+    if not args.skip_generate:
+        generate(pool, args.employees, seed=args.seed)
+
+    # Imported after the backend is selected so the app uses its pool
+    from services import employee_factory, employee_list
+
+    rng = random.Random(args.seed)
+    ids = [rng.randint(1, args.employees) for _ in range(args.iterations)]
+    extra_id = args.employees + 1
+
+    def create(i):
+        employee_factory.create_employee(str(i + 1), 'Bench', 'bench@example.com', 1990, 'BSc', 50000.0, 'Engineer', '2020-01-01', 'Engineering', 'Active')
+
+    def update(i):
+        employee = employee_list.get_employee_by_id(ids[i])
+        employee_list.update_employee(ids[i], employee.name, employee.email, employee.year_of_birth, employee.qualification, employee.salary,
+                                      employee.job_title, employee.date_of_joining, employee.department, employee.status)
+
+    def add_and_delete(i):
+        employee = employee_factory.create_employee(extra_id + i, 'Bench', 'bench@example.com', 1990, 'BSc', 50000.0, 'Engineer', '2020-01-01', 'Engineering', 'Active')
+        employee_list.add_employee(employee)
+        employee_list.delete_employee(extra_id + i)
+
+    cases = [
+        ('EmployeeFactory.create_employee', create, args.iterations * 50),
+        ('get_employee_by_id', lambda i: employee_list.get_employee_by_id(ids[i]), args.iterations),
+        ('fetch_employee (uncached)', lambda i: employee_list.fetch_employee(ids[i]), args.iterations),
+        ('get_employee_page', lambda i: employee_list.get_employee_page(limit=50), args.iterations),
+        ('get_employee_page (filtered)', lambda i: employee_list.get_employee_page({'department': 'Sales'}, sort='name', limit=50), args.iterations),
+        ('get_employee_count', lambda i: employee_list.get_employee_count(), args.iterations),
+        ('get_recent_hires', lambda i: employee_list.get_recent_hires(), args.iterations),
+        ('get_upcoming_anniversaries', lambda i: employee_list.get_upcoming_anniversaries(), args.iterations),
+        ('get_dashboard_summary', lambda i: employee_list.get_dashboard_summary(), args.iterations),
+        ('update_employee', update, args.iterations),
+        ('add_employee + delete_employee', add_and_delete, args.iterations),
+        ('get_all_employees', lambda i: employee_list.get_all_employees(), max(1, args.iterations // 20)),
+    ]
+    results = [(name, measure(function, iterations)) for name, function, iterations in cases]
+    print_summary(results)
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_backend_arguments(parser)
+    parser.add_argument('--employees', type=int, default=10000)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--skip-generate', action='store_true', help='reuse the data already in the database')
+    run(parser.parse_args())
@@ -0,0 +1,100 @@
+"""
+Benchmarks the vectorized workforce reports against the per-row Python
+approach (get_all_employees dicts, grouped and sorted in plain Python).
+
+Usage: python -m benchmarks.reports [--backend mysql] [--employees 100000] [--iterations 5]
+"""
+import argparse
+from collections import defaultdict
+from datetime import date
+
+from benchmarks.common import add_backend_arguments, use_backend, print_summary
+from benchmarks.datagen import generate
+from benchmarks.micro import measure
+
+
+def percentile(sorted_values, p):
+    # Linear interpolation, as numpy.percentile does by default
+    position = (len(sorted_values) - 1) * p / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def describe(values):
+    values = sorted(values)
+    if not values:
+        return {'count': 0}
+    stats = {'count': len(values), 'mean': round(sum(values) / len(values), 2),
+             'min': round(values[0], 2), 'max': round(values[-1], 2)}
+    for p in (10, 25, 50, 75, 90):
+        stats[f'p{p}'] = round(percentile(values, p), 2)
+    return stats
+
+
+def per_row_reports(rows):
+    today = date.today()
+    salaries, tenures, ages = [], [], []
+    by_department = defaultdict(lambda: ([], [], []))
+    by_job_title = defaultdict(list)
+    for row in rows:
+        department = row['department'] or 'Unassigned'
+        if row['salary'] is not None:
+            salary = float(row['salary'])
+            salaries.append(salary)
+            by_department[department][0].append(salary)
+            by_job_title[row['job_title'] or 'Unassigned'].append(salary)
+        if row['date_of_joining']:
+            joined = row['date_of_joining']
+            joined = joined if isinstance(joined, date) else date.fromisoformat(str(joined)[:10])
+            tenure = (today - joined).days / 365.25
+            tenures.append(tenure)
+            by_department[department][1].append(tenure)
+        if row['year_of_birth'] is not None:
+            age = today.year - row['year_of_birth']
+            ages.append(age)
+            by_department[department][2].append(age)
+    return {
+        'salary': (describe(salaries), {key: describe(values[0]) for key, values in by_department.items()},
+                   {key: describe(values) for key, values in by_job_title.items()}),
+        'tenure': (describe(tenures), {key: describe(values[1]) for key, values in by_department.items()}),
+        'age': (describe(ages), {key: describe(values[2]) for key, values in by_department.items()}),
+    }
+
+
+def run(args):
+    pool = use_backend(args)
+    if not args.skip_generate:
+        generate(pool, args.employees, seed=args.seed)
+
+    # Imported after the backend is selected so the app uses its pool
+    from services import employee_list
+    from reports import REPORTS, REPORT_COLUMNS, load_columns
+
+    def vectorized(i):
+        columns = load_columns(employee_list.iter_employees(REPORT_COLUMNS))
+        return {name: report(columns) for name, report in REPORTS.items()}
+
+    columns = load_columns(employee_list.iter_employees(REPORT_COLUMNS))
+
+    def vectorized_compute(i):
+        return {name: report(columns) for name, report in REPORTS.items()}
+
+    cases = [
+        ('per-row Python', lambda i: per_row_reports(employee_list.get_all_employees())),
+        ('NumPy (load + compute)', vectorized),
+        ('NumPy (compute only)', vectorized_compute),
+    ]
+    results = [(name, measure(function, args.iterations)) for name, function in cases]
+    print_summary(results)
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_backend_arguments(parser)
+    parser.add_argument('--employees', type=int, default=100000)
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--skip-generate', action='store_true', help='reuse the data already in the database')
+    run(parser.parse_args())
@@ -0,0 +1,113 @@
+"""
+Benchmark for the document permission check run on every download, and for
+bulk share/revoke.
+
+Seeds users and documents above BASE_ID, shares each document with a
+random subset of users, then times DocumentPermissions.permission() against
+a warm cache, an empty cache, and the same key right after a share change.
+
+Usage: python -m benchmarks.sharing [--backend mysql] [--users 2000] [--documents 5000] [--iterations 20000]
+"""
+import argparse
+import random
+import time
+
+from benchmarks.common import add_backend_arguments, use_backend, summarize, print_summary
+
+BASE_ID = 900000
+
+
+def _seed(run_transaction, users, documents, shares_per_document, owned, seed):
+    rng = random.Random(seed)
+    user_ids = [BASE_ID + i for i in range(users)]
+    document_ids = [BASE_ID + i for i in range(documents)]
+    shares = [(document_id, user_id, rng.choice(('view', 'edit')), '2024-01-01')
+              for document_id in document_ids
+              for user_id in rng.sample(user_ids, min(shares_per_document, users))]
+
+    def work(cursor):
+        _delete(cursor)
+        cursor.executemany("INSERT INTO users (id, name, email, password) VALUES (%s, %s, %s, 'x')",
+                           [(id, f"Bench User {id}", f"bench{id}@example.com") for id in user_ids])
+        cursor.executemany("INSERT INTO documents (id, name, doc_type, filename, sha256, size, owner_id) VALUES (%s, %s, 'Bench', 'bench.pdf', %s, 0, %s)",
+                           [(id, f"Bench Document {id}", f"{id:064x}", user_ids[0] if index < owned else rng.choice(user_ids))
+                            for index, id in enumerate(document_ids)])
+        cursor.executemany("INSERT INTO document_shares (document_id, user_id, permission, shared_at) VALUES (%s, %s, %s, %s)", shares)
+
+    run_transaction(work)
+    return user_ids, document_ids
+
+
+def _delete(cursor):
+    cursor.execute("DELETE FROM document_shares WHERE document_id >= %s OR user_id >= %s", (BASE_ID, BASE_ID))
+    cursor.execute("DELETE FROM documents WHERE id >= %s", (BASE_ID,))
+    cursor.execute("DELETE FROM users WHERE id >= %s", (BASE_ID,))
+
+
+def measure(function, iterations):
+    latencies = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        function(i)
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def run(args):
+    use_backend(args)
+
+    # Imported after the backend is selected so the app uses its pool
+    from database import run_transaction
+    from services import document_acl_cache, document_permissions
+
+    # The first user owns the first --bulk-documents documents and runs the share cases
+    user_ids, document_ids = _seed(run_transaction, args.users, args.documents, args.shares, args.bulk_documents, args.seed)
+    rng = random.Random(args.seed)
+    keys = [(rng.choice(user_ids), rng.choice(document_ids)) for _ in range(args.iterations)]
+    uncached = max(1, args.iterations // 20)
+    sharer = user_ids[0]
+    bulk_documents = document_ids[:args.bulk_documents]
+    recipients = user_ids[1:args.bulk_users + 1]
+
+    def cold(i):
+        document_acl_cache.clear()
+        document_permissions.permission(*keys[i])
+
+    def after_share(i):
+        document_permissions.share(bulk_documents[:1], recipients[:1], 'view' if i % 2 else 'edit', sharer)
+        document_permissions.permission(recipients[0], bulk_documents[0])
+
+    def share_and_revoke(i):
+        document_permissions.share(bulk_documents, recipients, 'view', sharer)
+        document_permissions.revoke(bulk_documents, recipients, sharer)
+
+    try:
+        for user_id, document_id in keys:
+            document_permissions.permission(user_id, document_id)
+        cases = [
+            ('permission (cached)', lambda i: document_permissions.permission(*keys[i]), args.iterations),
+            ('permission (uncached)', cold, uncached),
+            ('share 1 + permission', after_share, uncached),
+            (f'share {len(bulk_documents)}x{len(recipients)} (bulk)', lambda i: document_permissions.share(bulk_documents, recipients, 'view', sharer), 10),
+            (f'share + revoke {len(bulk_documents)}x{len(recipients)}', share_and_revoke, 10),
+        ]
+        results = [(name, measure(function, iterations)) for name, function, iterations in cases]
+    finally:
+        run_transaction(_delete)
+    print_summary(results)
+    print(f"cache: {document_acl_cache.stats()}")
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_backend_arguments(parser)
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--documents', type=int, default=5000)
+    parser.add_argument('--shares', type=int, default=20, help='users each document is shared with')
+    parser.add_argument('--iterations', type=int, default=20000)
+    parser.add_argument('--bulk-documents', type=int, default=50, help='documents sampled for the bulk share case')
+    parser.add_argument('--bulk-users', type=int, default=200, help='recipients of the bulk share case')
+    parser.add_argument('--seed', type=int, default=42)
+    run(parser.parse_args())
@@ -0,0 +1,121 @@
+"""
+Start-up cost of one app worker: time to import the app, serve its first
+request and build the per-process services, the memory it holds and which
+heavy modules it imported. Needs no database.
+
+Cold workers are fresh interpreters (gunicorn without --preload); forked
+workers are forked from a parent that imported the app and ran preload()
+(gunicorn --preload), so only their private memory is theirs alone.
+
+Usage: python -m benchmarks.startup [--workers 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ('flask', 'mysql.connector', 'matplotlib', 'numpy', 'pandas')
+
+
+def memory():
+    """
+    Returns (rss, private) in MB. `private` excludes pages shared with the
+    parent process; without /proc both are the peak RSS.
+    """
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            fields = {line.split(':')[0]: int(line.split()[1]) for line in f if line.rstrip().endswith(' kB')}
+        return fields['Rss'] / 1024, (fields['Private_Clean'] + fields['Private_Dirty']) / 1024
+    except OSError:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak = peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+        return peak, peak
+
+
+def measure_worker(preloaded=None):
+    result = {}
+    started = time.perf_counter()
+    if preloaded is None:
+        from app import app
+    else:
+        app = preloaded
+    result['import_ms'] = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    app.test_client().get('/login').close()
+    result['first_request_ms'] = (time.perf_counter() - started) * 1000
+
+    from services import get_services
+
+    started = time.perf_counter()
+    get_services()
+    result['services_ms'] = (time.perf_counter() - started) * 1000
+
+    result['rss_mb'], result['private_mb'] = memory()
+    result['heavy'] = [name for name in HEAVY_MODULES if name in sys.modules]
+    return result
+
+
+# Entry point of each cold worker process
+def child():
+    print(json.dumps(measure_worker()))
+
+
+def cold_workers(count):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = []
+    for _ in range(count):
+        output = subprocess.run([sys.executable, '-c', 'from benchmarks.startup import child; child()'],
+                                cwd=root, capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return results
+
+
+def forked_workers(count):
+    from app import app, preload
+
+    preload(app)
+    results = []
+    for _ in range(count):
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_end)
+            try:
+                with os.fdopen(write_end, 'w') as out:
+                    out.write(json.dumps(measure_worker(app)))
+            finally:
+                os._exit(0)
+        os.close(write_end)
+        with os.fdopen(read_end) as pipe:
+            results.append(json.loads(pipe.read()))
+        os.waitpid(pid, 0)
+    return results
+
+
+def print_results(rows):
+    print(f"{'workers':<10} {'import ms':>10} {'1st req ms':>11} {'services ms':>12} {'RSS MB':>8} {'private MB':>11}  heavy modules")
+    for name, results in rows:
+        median = {key: statistics.median(result[key] for result in results)
+                  for key in ('import_ms', 'first_request_ms', 'services_ms', 'rss_mb', 'private_mb')}
+        print(f"{name:<10} {median['import_ms']:>10.1f} {median['first_request_ms']:>11.1f} {median['services_ms']:>12.1f} "
+              f"{median['rss_mb']:>8.1f} {median['private_mb']:>11.1f}  {', '.join(results[-1]['heavy'])}")
+
+
+def run(args):
+    rows = [('cold', cold_workers(args.workers))]
+    if hasattr(os, 'fork'):
+        rows.append(('forked', forked_workers(args.workers)))
+    print_results(rows)
+    return rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=5)
+    run(parser.parse_args())
@@ -0,0 +1,53 @@
+"""
+Throughput of the compiled employee validator on generated batches:
+text records (as read from CSV), typed records (as read from JSON) and
+text records with a share of invalid rows. Needs no database.
+
+Usage: python -m benchmarks.validation [--rows 200000] [--invalid 0.1]
+"""
+import argparse
+import random
+import time
+
+from validation import EMPLOYEE_VALIDATOR
+
+
+def make_records(rows, invalid, typed, seed):
+    rng = random.Random(seed)
+    records = []
+    for i in range(1, rows + 1):
+        record = {
+            'id': i, 'name': 'Jane Doe', 'email': f'jane{i}@example.com', 'year_of_birth': rng.randint(1960, 2002),
+            'qualification': 'BSc', 'salary': round(rng.uniform(30000, 150000), 2), 'job_title': 'Engineer',
+            'date_of_joining': f'20{rng.randint(10, 23)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+            'department': 'Engineering', 'status': 'Active',
+        }
+        if rng.random() < invalid:
+            record['email'] = 'not-an-email'
+            record['salary'] = -1
+        if not typed:
+            record = {key: str(value) for key, value in record.items()}
+        records.append(record)
+    return records
+
+
+def run(args):
+    cases = [
+        ('text records', make_records(args.rows, 0.0, False, args.seed)),
+        ('typed records', make_records(args.rows, 0.0, True, args.seed)),
+        (f'text, {args.invalid:.0%} invalid', make_records(args.rows, args.invalid, False, args.seed)),
+    ]
+    print(f"{'case':<24} {'rows':>9} {'invalid':>9} {'rows/s':>12}")
+    for name, records in cases:
+        started = time.perf_counter()
+        valid, invalid = EMPLOYEE_VALIDATOR.validate_batch(records)
+        elapsed = time.perf_counter() - started
+        print(f"{name:<24} {len(records):>9} {len(invalid):>9} {len(records) / elapsed:>12.0f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--invalid', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=42)
+    run(parser.parse_args())
@@ -0,0 +1,86 @@
+"""
+Stress benchmark for concurrent EmployeeList writes.
+
+Each worker process updates its own slice of employees in a loop, so the
+only contention left is inside the database. On MySQL throughput should
+grow with the number of workers, since writes lock only their own rows;
+SQLite allows one writer at a time, so there it shows the ceiling instead.
+
+Usage: python -m benchmarks.write_concurrency [--backend mysql] [--workers 1,2,4,8] [--seconds 5]
+"""
+import argparse
+import multiprocessing
+import time
+
+from benchmarks.common import add_backend_arguments, use_backend
+
+BASE_ID = 900000
+ROWS_PER_WORKER = 50
+
+
+def _seed(max_workers):
+    from database import run_transaction
+
+    rows = [
+        (BASE_ID + i, 'Bench Employee', f"bench{i}@example.com", 1990, 'BSc', 50000, 'Engineer', '2020-01-01', 'Bench', 'Active')
+        for i in range(max_workers * ROWS_PER_WORKER)
+    ]
+
+    def work(cursor):
+        cursor.execute("DELETE FROM employees WHERE id >= %s", (BASE_ID,))
+        cursor.executemany("""
+            INSERT INTO employees (id, name, email, year_of_birth, qualification, salary, job_title, date_of_joining, department, status)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """, rows)
+
+    run_transaction(work)
+
+
+def _cleanup():
+    from database import run_transaction
+    run_transaction(lambda cursor: cursor.execute("DELETE FROM employees WHERE id >= %s", (BASE_ID,)))
+
+
+def _worker(args):
+    worker_index, seconds = args
+    from services import employee_list
+
+    first_id = BASE_ID + worker_index * ROWS_PER_WORKER
+    updates = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        id = first_id + updates % ROWS_PER_WORKER
+        employee_list.update_employee(id, 'Bench Employee', f"bench{id}@example.com", 1990, 'BSc', 50000 + updates, 'Engineer', '2020-01-01', 'Bench', 'Active')
+        updates += 1
+    return updates
+
+
+def run(worker_counts, seconds):
+    _seed(max(worker_counts))
+    results = []
+    try:
+        for workers in worker_counts:
+            with multiprocessing.Pool(workers) as pool:
+                started = time.monotonic()
+                counts = pool.map(_worker, [(i, seconds) for i in range(workers)])
+                elapsed = time.monotonic() - started
+            total = sum(counts)
+            results.append((workers, total, total / elapsed))
+    finally:
+        _cleanup()
+
+    baseline = results[0][2]
+    print(f"{'workers':>8} {'updates':>10} {'updates/s':>12} {'speedup':>8}")
+    for workers, total, rate in results:
+        print(f"{workers:>8} {total:>10} {rate:>12.1f} {rate / baseline:>7.2f}x")
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_backend_arguments(parser)
+    parser.add_argument('--workers', default='1,2,4,8', help='comma separated worker counts')
+    parser.add_argument('--seconds', type=float, default=5.0, help='duration of each run')
+    args = parser.parse_args()
+    use_backend(args)
+    run([int(n) for n in args.workers.split(',')], args.seconds)
@@ -0,0 +1,129 @@
+import csv
+import io
+import json
+
+# Rows validated and written per transaction
+IMPORT_BATCH_SIZE = 500
+# Rows fetched per round trip while exporting
+EXPORT_FETCH_SIZE = 1000
+
+EMPLOYEE_FIELDS = ('id', 'name', 'email', 'year_of_birth', 'qualification', 'salary', 'job_title', 'date_of_joining', 'department', 'status')
+
+
+# Raised when an uploaded file cannot be parsed at all
+class ImportFormatError(Exception):
+    pass
+
+
+def detect_format(filename):
+    """
+    Picks the import format from a file name: csv, jsonl (one object per
+    line) or json (a single array).
+    """
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    if extension in ('jsonl', 'ndjson'):
+        return 'jsonl'
+    if extension == 'json':
+        return 'json'
+    return 'csv'
+
+
+def iter_records(stream, fmt):
+    """
+    Yields (row_number, record) pairs from a binary stream.
+    CSV and JSON Lines are read incrementally; a JSON array has to be
+    parsed as a whole, so prefer JSON Lines for large files.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    number = 0
+    try:
+        if fmt == 'csv':
+            for number, record in enumerate(csv.DictReader(text), start=1):
+                yield number, record
+        elif fmt == 'jsonl':
+            for number, line in enumerate(text, start=1):
+                line = line.strip()
+                if line:
+                    yield number, json.loads(line)
+        else:
+            for number, record in enumerate(json.load(text), start=1):
+                yield number, record
+    except (csv.Error, ValueError) as e:
+        raise ImportFormatError(f"Could not parse file after row {number}: {e}")
+
+
+def import_employees(records, factory, write_batch, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Validates (row_number, record) pairs in batches through
+    `factory.create_employees` and hands the valid employees of each batch
+    to `write_batch`, which writes them in one transaction.
+    Invalid rows are reported rather than aborting the import. If the file
+    stops parsing part-way, the rows read before that point are still
+    written and the import ends there, with the parse error under 'error'.
+    Returns {'imported': n, 'errors': [{'row': n, 'error': message}, ...]}.
+    """
+    report = {'imported': 0, 'errors': []}
+    numbers = []
+    batch = []
+
+    def flush():
+        employees, invalid = factory.create_employees(batch)
+        report['errors'].extend({'row': numbers[index], 'error': ' '.join(errors)} for index, errors in invalid)
+        if employees:
+            try:
+                write_batch([employee for _, employee in employees])
+                report['imported'] += len(employees)
+            except Exception as e:
+                report['errors'].extend({'row': numbers[index], 'error': f"Batch write failed: {e}"} for index, _ in employees)
+        numbers.clear()
+        batch.clear()
+
+    try:
+        for number, record in records:
+            if not isinstance(record, dict):
+                report['errors'].append({'row': number, 'error': "Record must be an object."})
+                continue
+            numbers.append(number)
+            batch.append(record)
+            if len(batch) >= batch_size:
+                flush()
+    except ImportFormatError as e:
+        # Earlier batches are already committed, so report how far the import got
+        report['error'] = f"{e}. Rows read before the error were imported."
+
+    if batch:
+        flush()
+    return report
+
+
+def export_rows(cursor, fetch_size=EXPORT_FETCH_SIZE):
+    """
+    Yields rows from an executed, unbuffered cursor without materializing
+    the whole result set.
+    """
+    while True:
+        rows = cursor.fetchmany(fetch_size)
+        if not rows:
+            return
+        yield from rows
+
+
+def format_csv(rows, columns):
+    """
+    Yields CSV text chunks: the header, then one chunk per row.
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow(row)
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate(0)
+    if buf.getvalue():
+        yield buf.getvalue()
+
+
+def format_jsonl(rows, columns):
+    for row in rows:
+        yield json.dumps(dict(zip(columns, row)), default=str) + '\n'
@@ -0,0 +1,122 @@
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache with an optional per-entry TTL and
+    hit/miss/eviction statistics.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so loads that started before it are not stored
+        self._generation = 0
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0}
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self._stats['misses'] += 1
+                return default
+            value, expires_at = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._entries[key]
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return default
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return value
+
+    def set(self, key, value, generation=None):
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            expires_at = time.monotonic() + self.ttl if self.ttl else None
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def get_or_load(self, key, load):
+        """
+        Returns the cached value for `key`, calling `load()` on a miss.
+        A value loaded while the cache was cleared is returned but not kept.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        generation = self._generation
+        value = load()
+        self.set(key, value, generation)
+        return value
+
+    def invalidate(self, key):
+        with self._lock:
+            self._generation += 1
+            if self._entries.pop(key, _MISSING) is not _MISSING:
+                self._stats['invalidations'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._stats['invalidations'] += len(self._entries)
+            self._entries.clear()
+
+    # Observer hook: any change notification drops every entry
+    def update(self, event):
+        self.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+            stats['maxsize'] = self.maxsize
+        return stats
+
+
+class RecordCache(LRUCache):
+    """
+    LRU cache of single records keyed by entity id. Change events drop only
+    the changed record. When `read_version` is given, a shared version
+    counter is polled at most every `poll_seconds` and the whole cache is
+    cleared once another process has bumped it.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None, read_version=None, poll_seconds=1.0):
+        super().__init__(maxsize, ttl)
+        self._read_version = read_version
+        self._poll_seconds = poll_seconds
+        self._next_poll = 0.0
+        self._version = None
+
+    def _check_version(self):
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_poll:
+                return
+            # Only one caller polls per interval
+            self._next_poll = now + self._poll_seconds
+        version = self._read_version()
+        if version != self._version:
+            if self._version is not None:
+                self.clear()
+            self._version = version
+
+    def get_or_load(self, key, load):
+        if self._read_version is not None:
+            self._check_version()
+        return super().get_or_load(key, load)
+
+    # Observer hook: drop the record named by the change event
+    def update(self, event):
+        self.invalidate(event.entity_id)
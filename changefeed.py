@@ -0,0 +1,211 @@
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from events import to_json
+
+# Entities written to the change log
+EMPLOYEE = 'employee'
+INVENTORY = 'inventory'
+ASSIGNMENT = 'assignment'
+CHANGE_ENTITIES = (EMPLOYEE, INVENTORY, ASSIGNMENT)
+
+CHANGE_FEED_LIMIT = 500            # changes returned per request at most
+CHANGE_FEED_MAX_WAITERS = 4        # long-polls held at once per process
+CHANGE_FEED_POLL_SECONDS = 1.0     # how often waiters re-check for other workers' writes
+CHANGE_SEQUENCE_BATCH = 5000       # committed changes numbered per sequencing transaction
+
+
+# Raised when the requested version has already been pruned from the log
+class ChangeLogGone(Exception):
+    pass
+
+
+def record_changes(cursor, changes):
+    """
+    Appends (entity, entity_id, action, data) changes to the change log.
+    `data` is the row after the change (None for deletes).
+
+    Call inside the writing transaction. Rows are keyed by AUTO_INCREMENT
+    and take no shared lock; they get their feed version only after they
+    have committed, from ChangeFeed.latest(), so writers never wait on
+    each other here.
+    """
+    if not changes:
+        return
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    cursor.executemany("""
+        INSERT INTO change_log (entity, entity_id, action, data, changed_at)
+        VALUES (%s, %s, %s, %s, %s)
+    """, [(entity, entity_id, action, to_json(data) if data is not None else None, now)
+          for entity, entity_id, action, data in changes])
+
+
+def _change_dict(row):
+    return {
+        'version': row['version'],
+        'entity': row['entity'],
+        'id': row['entity_id'],
+        'action': row['action'],
+        'data': json.loads(row['data']) if row['data'] else None,
+        'changed_at': row['changed_at'].isoformat() if hasattr(row['changed_at'], 'isoformat') else row['changed_at'],
+    }
+
+
+class ChangeFeed:
+    """
+    Reads the change log for delta sync. Versions are handed out after
+    commit by sequence(): committed rows without a version are numbered in
+    one short transaction under the 'changes' counter's row lock, which
+    only sequencing takes. A version therefore never becomes visible
+    before every lower one, and readers can resume from the last version
+    they saw. A long-poll waits on a condition that this process's writes
+    notify (the feed is registered as an observer) and otherwise
+    sequences once per poll interval, shared by every waiter, so other
+    workers' writes arrive within it.
+    """
+
+    def __init__(self, run_transaction, max_waiters=CHANGE_FEED_MAX_WAITERS, poll_seconds=CHANGE_FEED_POLL_SECONDS):
+        self._run_transaction = run_transaction
+        self._max_waiters = max_waiters
+        self._poll_seconds = poll_seconds
+        self._changed = threading.Condition()
+        self._waiters = 0
+        self._sequence_lock = threading.Lock()
+        self._latest = 0
+        self._next_sequence = 0.0
+
+    # Observer hook: number the new changes on next use and wake long-polls
+    def update(self, event):
+        self._next_sequence = 0.0
+        with self._changed:
+            self._changed.notify_all()
+
+    def sequence(self):
+        """
+        Numbers committed changes that have no version yet, in id order,
+        and returns the latest version.
+        """
+        def pending(cursor):
+            cursor.execute("SELECT version FROM data_versions WHERE name = 'changes'")
+            latest = cursor.fetchone()[0]
+            cursor.execute("SELECT 1 FROM change_log WHERE version IS NULL LIMIT 1")
+            return latest, cursor.fetchone() is not None
+
+        def work(cursor):
+            # The lock comes first so the unnumbered rows are read after any
+            # other sequencer has committed, and none is numbered twice
+            cursor.execute("SELECT version FROM data_versions WHERE name = 'changes' FOR UPDATE")
+            latest = cursor.fetchone()[0]
+            cursor.execute("SELECT id FROM change_log WHERE version IS NULL ORDER BY id LIMIT %s", (CHANGE_SEQUENCE_BATCH,))
+            ids = [row[0] for row in cursor.fetchall()]
+            if ids:
+                cursor.executemany("UPDATE change_log SET version = %s WHERE id = %s",
+                                   [(latest + offset, id) for offset, id in enumerate(ids, 1)])
+                latest += len(ids)
+                cursor.execute("UPDATE data_versions SET version = %s, updated_at = %s WHERE name = 'changes'",
+                               (latest, datetime.now(timezone.utc).replace(tzinfo=None)))
+            return latest, len(ids) == CHANGE_SEQUENCE_BATCH
+
+        latest, more = self._run_transaction(pending)
+        while more:
+            latest, more = self._run_transaction(work)
+        return latest
+
+    def latest(self, max_age=0.0):
+        """
+        Returns the latest version, sequencing first unless this process
+        did so less than `max_age` seconds ago and has not written since.
+        """
+        with self._sequence_lock:
+            now = time.monotonic()
+            if now >= self._next_sequence:
+                # Cleared before sequencing so a write landing meanwhile forces another pass
+                self._next_sequence = now + max_age
+                self._latest = self.sequence()
+            return self._latest
+
+    def read(self, since, entities=None, limit=CHANGE_FEED_LIMIT):
+        """
+        Returns (changes, next_version, more) for changes after `since`,
+        oldest first. Pass next_version as `since` to continue; `more` means
+        the limit was reached. Raises ChangeLogGone when `since` predates the
+        retained log and the client has to resync from the full tables.
+        """
+        conditions = ["version > %s"]
+        params = [since]
+        if entities:
+            conditions.append(f"entity IN ({', '.join(['%s'] * len(entities))})")
+            params.extend(entities)
+
+        self.latest(self._poll_seconds)
+
+        def work(cursor):
+            # Counter and rows come from one snapshot, so next_version covers exactly what was read
+            cursor.execute("SELECT name, version FROM data_versions WHERE name IN ('changes', 'changes_pruned')")
+            counters = {row['name']: row['version'] for row in cursor.fetchall()}
+            if since < counters.get('changes_pruned', 0):
+                return counters, None
+            cursor.execute(f"""
+                SELECT version, entity, entity_id, action, data, changed_at
+                FROM change_log
+                WHERE {' AND '.join(conditions)}
+                ORDER BY version
+                LIMIT %s
+            """, tuple(params) + (limit,))
+            return counters, cursor.fetchall()
+
+        counters, rows = self._run_transaction(work, dictionary=True)
+        if rows is None:
+            raise ChangeLogGone(f"Changes up to version {counters['changes_pruned']} have been pruned; fetch the full data and resume from /changes.")
+        if len(rows) == limit:
+            return [_change_dict(row) for row in rows], rows[-1]['version'], True
+        return [_change_dict(row) for row in rows], max(since, counters.get('changes', 0)), False
+
+    def wait(self, since, timeout):
+        """
+        Blocks until the feed moves past `since` or `timeout` seconds pass,
+        and returns the latest version. Returns None without waiting when
+        the process already holds max_waiters long-polls, so they cannot
+        take every request thread.
+        """
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            if self._waiters >= self._max_waiters:
+                return None
+            self._waiters += 1
+        try:
+            while True:
+                version = self.latest(self._poll_seconds)
+                remaining = deadline - time.monotonic()
+                if version > since or remaining <= 0:
+                    return version
+                with self._changed:
+                    self._changed.wait(min(remaining, self._poll_seconds))
+        finally:
+            with self._changed:
+                self._waiters -= 1
+
+    def prune(self, days):
+        """
+        Deletes changes older than `days` days and records the pruned version
+        so clients resuming from before it are told to resync. Returns the
+        number of changes deleted.
+        """
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+
+        def work(cursor):
+            cursor.execute("SELECT MAX(version) FROM change_log WHERE changed_at < %s", (cutoff,))
+            through = cursor.fetchone()[0]
+            if through is None:
+                return 0
+            cursor.execute("DELETE FROM change_log WHERE version <= %s", (through,))
+            deleted = cursor.rowcount
+            cursor.execute("UPDATE data_versions SET version = %s WHERE name = 'changes_pruned'", (through,))
+            return deleted
+
+        return self._run_transaction(work)
+
+    def stats(self):
+        return {'waiters': self._waiters}
@@ -0,0 +1,111 @@
+import hashlib
+import io
+import json
+import threading
+import time
+
+# Seconds between re-reads of the chart data. The data comes from the
+# in-memory analytics aggregates, so re-reading is cheap; it mainly lets
+# stale aggregates start their reconciliation. Other workers' writes reach
+# the chart when that completes, i.e. within ANALYTICS_RECONCILE_SECONDS
+# (300s) plus this.
+CHART_CACHE_TTL = 60
+
+CHART_MIMETYPES = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+}
+
+
+def render_department_chart(departments, counts, fmt='png'):
+    """
+    Renders the employee-count-by-department bar chart.
+    Uses the object-oriented Figure API (no pyplot global state) so it is
+    safe to call from worker threads.
+    """
+    from matplotlib.figure import Figure
+
+    fig = Figure()
+    ax = fig.add_subplot(1, 1, 1)
+    ax.bar(departments, counts)
+    ax.set_xlabel('Department')
+    ax.set_ylabel('Count')
+    ax.set_title('Employee Count by Department')
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format=fmt)
+    return buf.getvalue()
+
+
+class DepartmentChartCache:
+    """
+    Caches department headcounts and their rendered chart images.
+    Registered as an observer of EmployeeList and WorkforceAnalytics: any
+    employee write in this process, and every reconciliation of the
+    aggregates it reads, marks the data stale. Images are keyed by a
+    fingerprint of the data so an unchanged result keeps serving the
+    already rendered image.
+    """
+
+    def __init__(self, fetch_data, executor, ttl=CHART_CACHE_TTL):
+        self._fetch_data = fetch_data
+        self._executor = executor
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._data = None
+        self._fingerprint = None
+        self._loaded_at = 0.0
+        self._stale = True
+        self._images = {}
+
+    # Observer hook called by EmployeeList after every write
+    def update(self, message):
+        self._stale = True
+
+    def data(self):
+        """
+        Returns (fingerprint, departments, counts), re-querying only when
+        the cache was invalidated or has expired.
+        """
+        with self._lock:
+            expired = time.monotonic() - self._loaded_at > self._ttl
+            if self._stale or expired or self._data is None:
+                self._stale = False
+                try:
+                    rows = self._fetch_data()
+                except Exception:
+                    self._stale = True
+                    raise
+                departments = [row['department'] or 'Unassigned' for row in rows]
+                counts = [row['count'] for row in rows]
+                fingerprint = hashlib.sha1(json.dumps([departments, counts]).encode('utf-8')).hexdigest()
+                if fingerprint != self._fingerprint:
+                    self._images = {}
+                self._data = (fingerprint, departments, counts)
+                self._fingerprint = fingerprint
+                self._loaded_at = time.monotonic()
+            return self._data
+
+    def fingerprint(self):
+        return self.data()[0]
+
+    def image(self, fmt='png'):
+        """
+        Returns (fingerprint, image bytes). Rendering happens on the executor;
+        concurrent requests for the same chart share one render.
+        """
+        if fmt not in CHART_MIMETYPES:
+            raise ValueError(f"Unsupported chart format: {fmt}")
+
+        fingerprint, departments, counts = self.data()
+        with self._lock:
+            future = self._images.get((fingerprint, fmt))
+            if future is None:
+                future = self._executor.submit(render_department_chart, departments, counts, fmt)
+                self._images[(fingerprint, fmt)] = future
+        try:
+            return fingerprint, future.result()
+        except Exception:
+            with self._lock:
+                self._images.pop((fingerprint, fmt), None)
+            raise
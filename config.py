@@ -1,31 +1,159 @@
-import mysql.connector
-from mysql.connector import Error
+import os
+import threading
+import time
+from contextlib import contextmanager
+import storage
+from db_pool import ConnectionPool
+from metrics import metrics
 
 class Config:
     # Flask secret key
     SECRET_KEY = 'SCD123!'  # You can change this to any random string
 
+    # Storage backend: 'mysql' (server below) or 'sqlite' (embedded file, no server needed)
+    DB_BACKEND = 'mysql'
+    SQLITE_PATH = 'employee_db.sqlite3'
+
     # Database configuration (match scd.sql)
     DB_HOST = 'localhost'
     DB_USER = 'appuser'                  # 👈 use the user created in scd.sql
     DB_PASSWORD = 'StrongPasswordHere!'  # 👈 same as in scd.sql
     DB_NAME = 'employee_db'              # 👈 database created in scd.sql
 
+    # Connection pool configuration
+    DB_POOL_SIZE = 10              # maximum open connections per process
+    DB_POOL_WAIT_TIMEOUT = 5.0     # seconds to wait for a free connection
+    DB_POOL_MAX_IDLE = 300         # seconds before an idle connection is closed
+    DB_POOL_MAX_LIFETIME = 3600    # seconds before a connection is recycled
+    DB_POOL_PING = True            # ping connections on checkout
+
+    # Production server (serve.py)
+    SERVER = 'waitress'                  # 'waitress' (threads) or 'gunicorn' (processes x threads)
+    SERVER_HOST = '0.0.0.0'
+    SERVER_PORT = 8000
+    SERVER_WORKERS = 2                   # gunicorn worker processes
+    SERVER_THREADS = 8                   # request threads per process; keep <= DB_POOL_SIZE
+    EXECUTOR_WORKERS = 5                 # background threads (chart rendering, jobs) per process
+    PRELOAD_MODULES = ()                 # extra modules imported once before forking, e.g. ('matplotlib.figure', 'numpy')
+
+    # Authentication
+    PASSWORD_HASH_METHOD = 'scrypt:32768:8:1'  # fully parameterized (werkzeug's scrypt default); weaker hashes are upgraded on login
+    PASSWORD_HASH_WORKERS = 2            # threads dedicated to password hashing
+    PASSWORD_HASH_QUEUE = 32             # hashes allowed to wait before logins are turned away
+    LOGIN_RATE_PER_IP = (1.0, 20)        # (tokens per second, burst) of login attempts per client IP
+    LOGIN_RATE_PER_ACCOUNT = (0.1, 5)    # (tokens per second, burst) of login attempts per email
+    USER_CACHE_TTL = 60                  # seconds a session user lookup is cached
+
+    # Background jobs (/jobs)
+    JOB_QUEUE_SIZE = 100                 # jobs allowed to wait per process before submissions are refused
+    JOB_CONCURRENCY = 2                  # executor threads jobs may occupy at once; keep < EXECUTOR_WORKERS
+    JOB_TIMEOUT = 300                    # seconds from submission until a job is timed out
+    JOB_PROCESS_WORKERS = 0              # processes for CPU-bound jobs (reports); 0 runs them on threads
+
+    # Change-data feed (/changes)
+    CHANGE_FEED_MAX_WAIT = 25            # seconds a long-poll may be held open
+    CHANGE_FEED_MAX_WAITERS = 4          # long-polls held at once per process; keep < SERVER_THREADS
+    CHANGE_LOG_RETENTION_DAYS = 30       # age at which `flask prune-changes` deletes changes
+
+    # Document storage
+    UPLOAD_FOLDER = 'uploads/'
+    MAX_UPLOAD_SIZE = 50 * 1024 * 1024   # bytes per uploaded document
+    USE_X_SENDFILE = False               # let nginx/apache send files (X-Sendfile) when deployed behind one
+    DOCUMENT_ACL_CACHE_SIZE = 100000     # (user, document) permissions cached per process
+    DOCUMENT_ACL_CACHE_TTL = 300         # seconds a cached permission may be served
+    DOCUMENT_ACL_POLL_SECONDS = 1.0      # how often other workers' share changes are checked for
+
+    # Employee change event bus
+    EVENT_WORKERS = 1                    # background dispatcher threads
+    EVENT_QUEUE_SIZE = 10000             # events buffered before back-pressure applies
+    EVENT_BATCH_SIZE = 100               # events handed to observers at once
+    EVENT_POLICY = 'block'               # 'block', 'drop' or 'spill' when the queue is full
+    EVENT_SPILL_PATH = 'events.spill'    # used by the 'spill' policy
+
+    # Employee record cache (get_employee_by_id)
+    EMPLOYEE_CACHE_SIZE = 10000          # records kept per process
+    EMPLOYEE_CACHE_TTL = 300             # seconds a record may be served from cache
+    EMPLOYEE_CACHE_SHARED_VERSION = False  # poll data_versions so other workers' writes are seen immediately
+    EMPLOYEE_CACHE_POLL_SECONDS = 1.0    # how often the shared version is polled
+
+    # HTTP caching and compression
+    COMPRESS_RESPONSES = True            # gzip (or brotli, when installed) HTML/JSON responses
+    PAGE_CACHE_ENABLED = False           # keep rendered read-only pages per user and query string
+    PAGE_CACHE_SIZE = 512                # rendered pages kept per process
+
+    # Instrumentation (/metrics)
+    METRICS_ENABLED = True
+    SLOW_QUERY_SECONDS = 0.5             # statements slower than this are logged
+
+    _storage = None
+    _pool = None
+    _pool_lock = threading.Lock()
+    _inherited_pools = []
+
+    @staticmethod
+    def get_storage():
+        if Config._storage is None:
+            Config._storage = storage.create_storage(Config)
+        return Config._storage
+
     @staticmethod
     def get_db_connection():
         """
-        Returns a MySQL database connection.
+        Returns a connection to the configured storage backend.
         Returns None if connection fails.
         """
         try:
-            conn = mysql.connector.connect(
-                host=Config.DB_HOST,
-                database=Config.DB_NAME,
-                user=Config.DB_USER,
-                password=Config.DB_PASSWORD
-            )
+            conn = Config.get_storage().connect()
             if conn.is_connected():
                 return conn
-        except Error as e:
-            print(f"Error while connecting to MySQL: {e}")
+        except storage.Error as e:
+            print(f"Error while connecting to the database: {e}")
             return None
+
+    @staticmethod
+    def get_pool():
+        """
+        Returns the process-wide connection pool, creating it on first use.
+        """
+        if Config._pool is None:
+            with Config._pool_lock:
+                if Config._pool is None:
+                    Config._pool = ConnectionPool(
+                        Config.get_db_connection,
+                        size=Config.DB_POOL_SIZE,
+                        wait_timeout=Config.DB_POOL_WAIT_TIMEOUT,
+                        max_idle=Config.DB_POOL_MAX_IDLE,
+                        max_lifetime=Config.DB_POOL_MAX_LIFETIME,
+                        ping_on_checkout=Config.DB_POOL_PING and Config.get_storage().ping_on_checkout
+                    )
+        return Config._pool
+
+    @staticmethod
+    def reset_pool_after_fork():
+        """
+        Runs in a freshly forked worker: the parent's connections and lock
+        belong to the parent, so the child opens its own pool on first use.
+        The inherited pool stays referenced so garbage collection never
+        closes sockets the parent is still using.
+        """
+        if Config._pool is not None:
+            Config._inherited_pools.append(Config._pool)
+        Config._pool = None
+        Config._pool_lock = threading.Lock()
+
+    @staticmethod
+    @contextmanager
+    def db_connection():
+        """
+        Context manager yielding a pooled connection that is returned
+        to the pool when the block exits, even on exceptions.
+        """
+        started = time.perf_counter()
+        with Config.get_pool().connection() as conn:
+            if metrics.enabled:
+                metrics.acquire_latency.observe(time.perf_counter() - started)
+            yield metrics.instrument_connection(conn)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=Config.reset_pool_after_fork)
@@ -0,0 +1,67 @@
+import calendar
+import threading
+import time
+from datetime import date
+
+# Seconds the dashboard summary is served from cache
+DASHBOARD_CACHE_TTL = 30
+
+
+def month_day(day):
+    """
+    Encodes a date as MMDD, matching the employees.joining_month_day column.
+    """
+    return day.month * 100 + day.day
+
+
+def anniversary_window(today=None):
+    """
+    Returns (start, end) MMDD bounds for anniversaries falling between today
+    and the same day next month. When the window crosses the new year,
+    start > end and callers must match `>= start OR <= end`.
+    """
+    today = today or date.today()
+    year, month = (today.year + 1, 1) if today.month == 12 else (today.year, today.month + 1)
+    day = min(today.day, calendar.monthrange(year, month)[1])
+    return month_day(today), month_day(date(year, month, day))
+
+
+def anniversary_condition(today=None):
+    """
+    Returns (sql, params) matching upcoming anniversaries through the
+    indexed joining_month_day column instead of computing a date per row.
+    """
+    start, end = anniversary_window(today)
+    if start <= end:
+        return "joining_month_day BETWEEN %s AND %s", (start, end)
+    return "(joining_month_day >= %s OR joining_month_day <= %s)", (start, end)
+
+
+class DashboardCache:
+    """
+    Short-lived cache of the dashboard summary shared by index(),
+    dashboard_data() and statistics(). Registered as an EmployeeList
+    observer so writes in this process invalidate it immediately.
+    """
+
+    def __init__(self, fetch_summary, ttl=DASHBOARD_CACHE_TTL):
+        self._fetch_summary = fetch_summary
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._summary = None
+        self._expires_at = 0.0
+
+    # Observer hook called by EmployeeList after every write
+    def update(self, message):
+        self._expires_at = 0.0
+
+    def get(self):
+        with self._lock:
+            if self._summary is None or time.monotonic() >= self._expires_at:
+                self._expires_at = time.monotonic() + self._ttl
+                try:
+                    self._summary = self._fetch_summary()
+                except Exception:
+                    self._expires_at = 0.0
+                    raise
+            return self._summary
@@ -0,0 +1,33 @@
+import random
+import time
+
+import storage
+from config import Config
+
+# MySQL error codes worth retrying: lock wait timeout and deadlock
+RETRYABLE_DB_ERRORS = {1205, 1213}
+TRANSACTION_RETRIES = 3
+# Duplicate entry on a UNIQUE key
+DUPLICATE_KEY_ERROR = 1062
+
+
+# Helper function to check out a pooled database connection
+# Usage: `with db_connection() as conn:` returns the connection to the pool on exit
+def db_connection():
+    return Config.db_connection()
+
+
+# Helper function to run `work(cursor)` in its own transaction
+# Deadlocks and lock wait timeouts are retried with a short randomized backoff
+def run_transaction(work, dictionary=False, retries=TRANSACTION_RETRIES):
+    for attempt in range(retries + 1):
+        try:
+            with db_connection() as conn:
+                with conn.cursor(dictionary=dictionary) as cursor:
+                    result = work(cursor)
+                conn.commit()
+                return result
+        except storage.Error as e:
+            if e.errno not in RETRYABLE_DB_ERRORS or attempt == retries:
+                raise
+            time.sleep(random.uniform(0, 0.05 * (2 ** attempt)))
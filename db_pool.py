@@ -0,0 +1,242 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+# Raised when no connection becomes available within the wait timeout
+class PoolTimeout(Exception):
+    pass
+
+
+class _PooledEntry:
+    __slots__ = ('conn', 'created_at', 'last_used')
+
+    def __init__(self, conn):
+        now = time.monotonic()
+        self.conn = conn
+        self.created_at = now
+        self.last_used = now
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of database connections.
+    Connections are pinged on checkout, evicted when idle for too long
+    and recycled once they exceed their maximum lifetime.
+    """
+
+    def __init__(self, connect, size=10, wait_timeout=5.0, max_idle=300, max_lifetime=3600, ping_on_checkout=True):
+        self._connect = connect
+        self.size = size
+        self.wait_timeout = wait_timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.ping_on_checkout = ping_on_checkout
+
+        self._idle = deque()
+        self._in_use = {}
+        self._reserved = 0
+        self._cond = threading.Condition()
+        self._stats = {
+            'created': 0,
+            'closed': 0,
+            'acquired': 0,
+            'released': 0,
+            'waits': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0,
+            'timeouts': 0,
+            'failed_pings': 0,
+            'evicted_idle': 0,
+            'evicted_lifetime': 0,
+        }
+
+    # Close a raw connection, ignoring errors from already-dead sockets
+    def _close(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._stats['closed'] += 1
+
+    def _expired(self, entry, now):
+        if self.max_lifetime and now - entry.created_at > self.max_lifetime:
+            self._stats['evicted_lifetime'] += 1
+            return True
+        if self.max_idle and now - entry.last_used > self.max_idle:
+            self._stats['evicted_idle'] += 1
+            return True
+        return False
+
+    def _healthy(self, conn):
+        if not self.ping_on_checkout:
+            return True
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Exception:
+            with self._cond:
+                self._stats['failed_pings'] += 1
+            return False
+
+    def _total(self):
+        return len(self._idle) + len(self._in_use) + self._reserved
+
+    def acquire(self, timeout=None):
+        """
+        Checks out a connection, waiting up to `timeout` seconds
+        (defaults to the pool wait timeout) when the pool is exhausted.
+        """
+        timeout = self.wait_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        waited = False
+
+        while True:
+            stale = []
+            entry = None
+            create = False
+            with self._cond:
+                while True:
+                    now = time.monotonic()
+                    while self._idle:
+                        candidate = self._idle.pop()
+                        if self._expired(candidate, now):
+                            stale.append(candidate.conn)
+                            continue
+                        entry = candidate
+                        break
+                    if entry is not None:
+                        break
+                    if self._total() < self.size:
+                        # Reserve the slot before connecting outside the lock
+                        create = True
+                        self._reserved += 1
+                        break
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolTimeout(f"No database connection available after {timeout:.1f}s (pool size {self.size})")
+                    waited = True
+                    self._cond.wait(remaining)
+
+            for conn in stale:
+                self._close(conn)
+
+            if create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._reserved -= 1
+                        self._cond.notify()
+                    raise
+                if conn is None:
+                    with self._cond:
+                        self._reserved -= 1
+                        self._cond.notify()
+                    raise ConnectionError("Could not open a database connection.")
+                entry = _PooledEntry(conn)
+                with self._cond:
+                    self._reserved -= 1
+                    self._stats['created'] += 1
+            elif not self._healthy(entry.conn):
+                self._close(entry.conn)
+                continue
+
+            with self._cond:
+                self._in_use[id(entry.conn)] = entry
+                self._stats['acquired'] += 1
+                if waited:
+                    wait_time = time.monotonic() - started
+                    self._stats['waits'] += 1
+                    self._stats['wait_time_total'] += wait_time
+                    self._stats['wait_time_max'] = max(self._stats['wait_time_max'], wait_time)
+            return entry.conn
+
+    def release(self, conn, discard=False):
+        """
+        Returns a connection to the pool. Any open transaction is rolled
+        back; broken connections (or `discard=True`) are closed instead.
+        """
+        with self._cond:
+            entry = self._in_use.pop(id(conn), None)
+        if entry is None:
+            return
+
+        if not discard:
+            try:
+                if getattr(conn, 'in_transaction', False):
+                    conn.rollback()
+            except Exception:
+                discard = True
+
+        if discard:
+            self._close(conn)
+        else:
+            entry.last_used = time.monotonic()
+        with self._cond:
+            self._stats['released'] += 1
+            if not discard:
+                self._idle.append(entry)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """
+        Context manager that checks a connection out and always returns it,
+        even when the body raises or returns early.
+        """
+        conn = self.acquire(timeout)
+        discard = False
+        try:
+            yield conn
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                discard = True
+            raise
+        except BaseException:
+            # e.g. GeneratorExit from an abandoned streaming response:
+            # the connection may still have unread results
+            discard = True
+            raise
+        finally:
+            self.release(conn, discard=discard)
+
+    def evict_idle(self):
+        """
+        Closes idle connections past their idle timeout or lifetime.
+        Returns the number of connections closed.
+        """
+        with self._cond:
+            now = time.monotonic()
+            keep = deque()
+            stale = []
+            for entry in self._idle:
+                if self._expired(entry, now):
+                    stale.append(entry.conn)
+                else:
+                    keep.append(entry)
+            self._idle = keep
+        for conn in stale:
+            self._close(conn)
+        return len(stale)
+
+    def close_all(self):
+        with self._cond:
+            idle = [entry.conn for entry in self._idle]
+            self._idle.clear()
+        for conn in idle:
+            self._close(conn)
+
+    def stats(self):
+        with self._cond:
+            stats = dict(self._stats)
+            stats['size'] = self.size
+            stats['idle'] = len(self._idle)
+            stats['in_use'] = len(self._in_use)
+        return stats
@@ -0,0 +1,124 @@
+import hashlib
+import os
+import tempfile
+
+# Bytes read from the upload stream per write
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+# Raised when an upload exceeds the configured maximum size
+class DocumentTooLarge(Exception):
+    pass
+
+
+class PendingDocument:
+    """
+    An upload being written into the store's tmp directory. Bytes are
+    hashed and counted as they are written, so the multipart parser can
+    write a file part straight into it (see views.UploadRequest);
+    DocumentStore.commit() then moves the file into place without reading
+    it again.
+    """
+
+    def __init__(self, tmp_dir, max_size):
+        fd, self.path = tempfile.mkstemp(dir=tmp_dir)
+        self._file = os.fdopen(fd, 'w+b')
+        self._digest = hashlib.sha256()
+        self._max_size = max_size
+        self.size = 0
+
+    def write(self, data):
+        self.size += len(data)
+        if self.size > self._max_size:
+            raise DocumentTooLarge(f"File exceeds the maximum size of {self._max_size} bytes.")
+        self._digest.update(data)
+        return self._file.write(data)
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        return self._file.seek(offset, whence)
+
+    def read(self, size=-1):
+        return self._file.read(size)
+
+    def tell(self):
+        return self._file.tell()
+
+    def close(self):
+        self._file.close()
+
+    def sha256(self):
+        return self._digest.hexdigest()
+
+    # Deletes the temporary file unless it was committed
+    def discard(self):
+        self._file.close()
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+
+
+class DocumentStore:
+    """
+    Content-addressed file store. Files are written in chunks while their
+    SHA-256 is computed and are stored once per distinct content under
+    <root>/<aa>/<bb>/<sha256>, so identical uploads share one file and
+    same-named uploads never overwrite each other.
+    """
+
+    def __init__(self, root, max_size, chunk_size=UPLOAD_CHUNK_SIZE):
+        self.root = root
+        self.max_size = max_size
+        self.chunk_size = chunk_size
+
+    def path_for(self, sha256):
+        return os.path.join(self.root, sha256[:2], sha256[2:4], sha256)
+
+    def open_upload(self):
+        """
+        Returns a PendingDocument to write an upload into. Pass it to
+        commit() when complete, or call its discard().
+        """
+        tmp_dir = os.path.join(self.root, 'tmp')
+        os.makedirs(tmp_dir, exist_ok=True)
+        return PendingDocument(tmp_dir, self.max_size)
+
+    def commit(self, upload):
+        """
+        Moves a completely written PendingDocument into the store.
+        Returns (sha256, size).
+        """
+        try:
+            upload.close()
+            sha256 = upload.sha256()
+            final_path = self.path_for(sha256)
+            if os.path.exists(final_path):
+                # Same content already stored: keep the existing copy
+                upload.discard()
+            else:
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                os.replace(upload.path, final_path)
+                upload.path = None
+            return sha256, upload.size
+        except BaseException:
+            upload.discard()
+            raise
+
+    def save_stream(self, stream):
+        """
+        Copies `stream` into the store. Returns (sha256, size).
+        Raises DocumentTooLarge once more than max_size bytes have been read.
+        """
+        upload = self.open_upload()
+        try:
+            while True:
+                chunk = stream.read(self.chunk_size)
+                if not chunk:
+                    break
+                upload.write(chunk)
+        except BaseException:
+            upload.discard()
+            raise
+        return self.commit(upload)
@@ -0,0 +1,352 @@
+from flask import session, has_request_context
+
+import storage
+from bulk import export_rows, EMPLOYEE_FIELDS
+from changefeed import EMPLOYEE, record_changes
+from dashboard import anniversary_condition
+from database import db_connection, run_transaction
+from events import EmployeeEvent
+from pagination import encode_cursor, keyset_condition, order_by
+from validation import EMPLOYEE_VALIDATOR
+from versions import bump_data_version
+
+# Custom exception for employee operations
+class EmployeeException(Exception):
+    pass
+
+# Helper function returning the logged in user recorded on change events
+def current_actor():
+    return session.get('user_id') if has_request_context() else None
+
+# Subject/Observer pattern implementation
+# Synchronous observers run inline and must be cheap (e.g. cache invalidation);
+# asynchronous observers receive events in batches from the event bus workers
+class Subject:
+    def __init__(self, event_bus=None):
+        self._observers = []
+        self._event_bus = event_bus
+
+    def register_observer(self, observer, asynchronous=False):
+        if asynchronous:
+            self._event_bus.subscribe(observer)
+        else:
+            self._observers.append(observer)
+
+    def notify_observers(self, event):
+        for observer in self._observers:
+            observer.update(event)
+        if self._event_bus is not None:
+            self._event_bus.publish(event)
+
+class Observer:
+    def update(self, message):
+        raise NotImplementedError
+
+# Logger class as Observer
+class EmployeeLogger(Observer):
+    def update(self, message):
+        print(f"Log: {message}")
+
+# Factory pattern to create Employee instances
+class EmployeeFactory:
+    def create_employee(self, id, name, email, year_of_birth, qualification, salary, job_title, date_of_joining, department, status):
+        values, errors = EMPLOYEE_VALIDATOR.validate({
+            'id': id, 'name': name, 'email': email, 'year_of_birth': year_of_birth, 'qualification': qualification, 'salary': salary,
+            'job_title': job_title, 'date_of_joining': date_of_joining, 'department': department, 'status': status})
+        if errors:
+            raise EmployeeException(' '.join(errors))
+        return Employee(**values)
+
+    def create_employees(self, records):
+        """
+        Validates a batch of record dicts without raising. Returns
+        (employees, invalid): (index, Employee) pairs for valid records and
+        (index, errors) pairs for the rest.
+        """
+        valid, invalid = EMPLOYEE_VALIDATOR.validate_batch(records)
+        return [(index, Employee(**values)) for index, values in valid], invalid
+
+# Employee model class
+# Slotted so cached records carry no per-instance __dict__
+class Employee:
+    __slots__ = EMPLOYEE_FIELDS + ('version',)
+
+    def __init__(self, id, name, email, year_of_birth, qualification, salary, job_title, date_of_joining, department, status, version=0):
+        self.id = id
+        self.name = name
+        self.email = email
+        self.year_of_birth = year_of_birth
+        self.qualification = qualification
+        self.salary = salary
+        self.job_title = job_title
+        self.date_of_joining = date_of_joining
+        self.department = department
+        self.status = status
+        self.version = version
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(*(row[field] for field in EMPLOYEE_FIELDS), version=row.get('version', 0))
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in EMPLOYEE_FIELDS}
+
+    def __str__(self):
+        return f"ID: {self.id}, Name: {self.name}, Email: {self.email}, Year: {self.year_of_birth}, Department: {self.department}, Status: {self.status}"
+
+# EmployeeList with observer pattern support
+class EmployeeList(Subject):
+    def __init__(self, event_bus=None, cache=None):
+        super().__init__(event_bus)
+        self._cache = cache
+        if cache is not None:
+            self.register_observer(cache)
+
+    # Every write appends to the change log inside its transaction (see
+    # changefeed.record_changes) and, once committed, bumps the shared
+    # 'employees' version so caches and ETags in other workers notice
+    def _bump_version(self):
+        bump_data_version(run_transaction, 'employees')
+
+    def add_employee(self, employee):
+        def work(cursor):
+            cursor.execute(""" 
+                INSERT INTO employees (id, name, email, year_of_birth, qualification, salary, job_title, date_of_joining, department, status)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """, (employee.id, employee.name, employee.email, employee.year_of_birth, employee.qualification, employee.salary, employee.job_title, employee.date_of_joining, employee.department, employee.status))
+            record_changes(cursor, [(EMPLOYEE, employee.id, 'added', employee.to_dict())])
+
+        run_transaction(work)
+        self._bump_version()
+        self.notify_observers(EmployeeEvent('added', employee.id, new=employee.to_dict(), actor=current_actor()))
+
+    def add_employees(self, employees):
+        """
+        Inserts or updates a batch of employees in one transaction using a
+        multi-row INSERT ... ON DUPLICATE KEY UPDATE.
+        """
+        rows = [(employee.id, employee.name, employee.email, employee.year_of_birth, employee.qualification, employee.salary, employee.job_title, employee.date_of_joining, employee.department, employee.status) for employee in employees]
+
+        def work(cursor):
+            cursor.executemany("""
+                INSERT INTO employees (id, name, email, year_of_birth, qualification, salary, job_title, date_of_joining, department, status)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    name = VALUES(name), email = VALUES(email), year_of_birth = VALUES(year_of_birth), qualification = VALUES(qualification),
+                    salary = VALUES(salary), job_title = VALUES(job_title), date_of_joining = VALUES(date_of_joining),
+                    department = VALUES(department), status = VALUES(status), version = version + 1
+            """, rows)
+            record_changes(cursor, [(EMPLOYEE, employee.id, 'imported', employee.to_dict()) for employee in employees])
+
+        run_transaction(work)
+        self._bump_version()
+        actor = current_actor()
+        for employee in employees:
+            self.notify_observers(EmployeeEvent('imported', employee.id, new=employee.to_dict(), actor=actor))
+
+    def iter_employees(self, columns=EMPLOYEE_FIELDS):
+        """
+        Yields employee rows as tuples through an unbuffered cursor,
+        so exports never hold the whole table in memory.
+        """
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(f"SELECT {', '.join(columns)} FROM employees ORDER BY id")
+                yield from export_rows(cursor)
+            finally:
+                try:
+                    cursor.close()
+                except storage.Error:
+                    pass
+
+    # Optimistic concurrency: when `version` is given the row is only updated
+    # if nobody else changed it since it was read
+    def update_employee(self, id, name, email, year_of_birth, qualification, salary, job_title, date_of_joining, department, status, version=None):
+        new, errors = EMPLOYEE_VALIDATOR.validate({
+            'id': id, 'name': name, 'email': email, 'year_of_birth': year_of_birth, 'qualification': qualification, 'salary': salary,
+            'job_title': job_title, 'date_of_joining': date_of_joining, 'department': department, 'status': status})
+        if errors:
+            raise EmployeeException(' '.join(errors))
+        params = [new[field] for field in EMPLOYEE_FIELDS[1:]] + [new['id']]
+        condition = "id = %s"
+        if version is not None:
+            condition += " AND version = %s"
+            params.append(version)
+
+        def work(cursor):
+            # Lock the row and keep its previous values for the change event
+            cursor.execute("SELECT * FROM employees WHERE id = %s FOR UPDATE", (id,))
+            old = cursor.fetchone()
+            if not old:
+                return 'missing', None
+            cursor.execute(f""" 
+                UPDATE employees
+                SET name = %s, email = %s, year_of_birth = %s, qualification = %s, salary = %s, job_title = %s, date_of_joining = %s, department = %s, status = %s,
+                    version = version + 1
+                WHERE {condition}
+            """, tuple(params))
+            if not cursor.rowcount:
+                return 'conflict', old
+            record_changes(cursor, [(EMPLOYEE, id, 'updated', new)])
+            return 'updated', old
+
+        outcome, old = run_transaction(work, dictionary=True)
+        if outcome == 'missing':
+            raise EmployeeException("Employee not found.")
+        if outcome == 'conflict':
+            raise EmployeeException("Employee was modified by someone else. Please reload and try again.")
+        self._bump_version()
+        self.notify_observers(EmployeeEvent('updated', id, old=old, new=new, actor=current_actor()))
+
+    def delete_employee(self, id):
+        def work(cursor):
+            cursor.execute("SELECT * FROM employees WHERE id = %s FOR UPDATE", (id,))
+            old = cursor.fetchone()
+            if old:
+                cursor.execute("DELETE FROM employees WHERE id = %s", (id,))
+                record_changes(cursor, [(EMPLOYEE, id, 'deleted', None)])
+            return old
+
+        old = run_transaction(work, dictionary=True)
+        if not old:
+            raise EmployeeException("Employee not found.")
+        self._bump_version()
+        self.notify_observers(EmployeeEvent('deleted', id, old=old, actor=current_actor()))
+
+    # Id and name of every employee, for select boxes
+    def get_employee_names(self):
+        with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+            cursor.execute("SELECT id, name FROM employees ORDER BY name")
+            return cursor.fetchall()
+
+    def get_all_employees(self):
+        with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+            cursor.execute("SELECT * FROM employees")
+            return cursor.fetchall()
+
+    # Columns the employee list can be sorted and filtered by
+    SORTABLE_COLUMNS = ('id', 'name', 'department', 'job_title', 'status')
+    FILTER_COLUMNS = ('department', 'status', 'job_title')
+
+    def get_employee_page(self, filters=None, sort='id', descending=False, after=None, limit=50):
+        """
+        Returns (employees, next_cursor) for one keyset-paginated page.
+        `after` is a decoded cursor from the previous page; next_cursor is
+        None on the last page.
+        """
+        if sort not in self.SORTABLE_COLUMNS:
+            sort = 'id'
+
+        conditions = []
+        params = []
+        for column in self.FILTER_COLUMNS:
+            value = (filters or {}).get(column)
+            if value:
+                conditions.append(f"{column} = %s")
+                params.append(value)
+
+        seek, seek_params = keyset_condition(sort, descending, after)
+        if seek:
+            conditions.append(seek)
+            params.extend(seek_params)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+            cursor.execute(f"""
+                SELECT id, name, email, job_title, department, status
+                FROM employees
+                {where}
+                {order_by(sort, descending)}
+                LIMIT %s
+            """, tuple(params) + (limit + 1,))
+            employees = cursor.fetchall()
+
+        next_cursor = None
+        if len(employees) > limit:
+            employees = employees[:limit]
+            last = employees[-1]
+            next_cursor = encode_cursor([last[sort], last['id']])
+        return employees, next_cursor
+
+    def get_employee_by_id(self, id):
+        """
+        Returns the Employee with this id, or None. Served from the record
+        cache when one is configured; misses (including unknown ids) are
+        loaded and cached until the next write to that employee.
+        """
+        if self._cache is None:
+            return self.fetch_employee(id)
+        return self._cache.get_or_load(id, lambda: self.fetch_employee(id))
+
+    FETCH_EMPLOYEE_SQL = f"SELECT {', '.join(EMPLOYEE_FIELDS)}, version FROM employees WHERE id = %s"
+
+    def fetch_employee(self, id):
+        with db_connection() as conn, conn.cursor(dictionary=True, prepared=True) as cursor:
+            cursor.execute(self.FETCH_EMPLOYEE_SQL, (id,))
+            row = cursor.fetchone()
+            return Employee.from_row(row) if row else None
+
+    def get_employee_count(self):
+        with db_connection() as conn, conn.cursor(prepared=True) as cursor:
+            cursor.execute("SELECT COUNT(*) FROM employees")
+            return cursor.fetchone()[0]
+
+    def get_recent_hires(self):
+        with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+            cursor.execute(""" 
+                SELECT name, date_of_joining
+                FROM employees
+                ORDER BY date_of_joining DESC
+                LIMIT 5
+            """)
+            return cursor.fetchall()
+
+    def get_upcoming_anniversaries(self):
+        condition, params = anniversary_condition()
+        with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+            cursor.execute(f""" 
+                SELECT name, DATE_FORMAT(date_of_joining, '%Y-%m-%d') AS joining_date
+                FROM employees
+                WHERE {condition}
+            """, params)
+            return cursor.fetchall()
+
+    def get_dashboard_summary(self):
+        """
+        Fetches the employee count, recent hires and upcoming anniversaries
+        in a single round trip.
+        """
+        condition, params = anniversary_condition()
+        with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+            cursor.execute(f"""
+                (SELECT 'count' AS kind, NULL AS name, NULL AS date_of_joining, COUNT(*) AS total
+                 FROM employees)
+                UNION ALL
+                (SELECT 'recent', name, date_of_joining, NULL
+                 FROM employees
+                 ORDER BY date_of_joining DESC
+                 LIMIT 5)
+                UNION ALL
+                (SELECT 'anniversary', name, date_of_joining, NULL
+                 FROM employees
+                 WHERE {condition})
+            """, params)
+            rows = cursor.fetchall()
+
+        summary = {'employee_count': 0, 'recent_hires': [], 'upcoming_anniversaries': []}
+        for row in rows:
+            if row['kind'] == 'count':
+                summary['employee_count'] = row['total']
+            elif row['kind'] == 'recent':
+                summary['recent_hires'].append({'name': row['name'], 'date_of_joining': row['date_of_joining']})
+            else:
+                summary['upcoming_anniversaries'].append({'name': row['name'], 'joining_date': str(row['date_of_joining'])})
+        return summary
+
+# Shared 'employees' counter polled by the record cache
+def read_employee_version():
+    with db_connection() as conn, conn.cursor(prepared=True) as cursor:
+        cursor.execute("SELECT version FROM data_versions WHERE name = 'employees'")
+        row = cursor.fetchone()
+        return row[0] if row else None
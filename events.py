@@ -0,0 +1,223 @@
+import json
+import os
+import queue
+import threading
+import time
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+# Back-pressure policies applied when the event queue is full
+BLOCK = 'block'    # wait for room (bounded by put_timeout, then drop)
+DROP = 'drop'      # discard the event and count it
+SPILL = 'spill'    # append the event to a spill file, replayed when the queue drains
+
+EVENT_QUEUE_SIZE = 10000
+EVENT_BATCH_SIZE = 100
+EVENT_BATCH_WAIT = 0.2   # seconds a worker waits to fill a batch
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def to_json(value):
+    return json.dumps(value, default=_json_default)
+
+
+class EmployeeEvent:
+    """
+    Structured change notification published by EmployeeList.
+    `old` and `new` are row dicts (None for inserts/deletes respectively).
+    """
+    __slots__ = ('action', 'entity', 'entity_id', 'old', 'new', 'actor', 'timestamp')
+
+    def __init__(self, action, entity_id, old=None, new=None, actor=None, entity='employee', timestamp=None):
+        self.action = action
+        self.entity = entity
+        self.entity_id = entity_id
+        self.old = old
+        self.new = new
+        self.actor = actor
+        self.timestamp = timestamp or time.time()
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def __str__(self):
+        return f"{self.action.capitalize()} {self.entity} with ID: {self.entity_id}"
+
+
+class EventBus:
+    """
+    Bounded queue of events dispatched to subscribers by background worker
+    threads in batches. Subscribers implement update_batch(events) or, failing
+    that, update(event). Publishing never runs subscriber code inline.
+    Workers start with the first published event, so creating a bus in a
+    process that later forks leaves no threads behind in the children.
+    """
+
+    def __init__(self, workers=1, maxsize=EVENT_QUEUE_SIZE, batch_size=EVENT_BATCH_SIZE,
+                 policy=BLOCK, put_timeout=1.0, spill_path=None):
+        if policy == SPILL and not spill_path:
+            raise ValueError("The spill policy needs a spill_path.")
+        self._queue = queue.Queue(maxsize)
+        self._subscribers = []
+        self._batch_size = batch_size
+        self._policy = policy
+        self._put_timeout = put_timeout
+        self._spill_path = spill_path
+        self._spill_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._stats = {'published': 0, 'dispatched': 0, 'dropped': 0, 'spilled': 0, 'errors': 0}
+        self._stats_lock = threading.Lock()
+        self._worker_count = workers
+        self._workers = []
+        self._start_lock = threading.Lock()
+
+    def _start(self):
+        with self._start_lock:
+            if self._workers or self._stopping.is_set():
+                return
+            self._workers = [
+                threading.Thread(target=self._run, name=f"event-bus-{i}", daemon=True)
+                for i in range(self._worker_count)
+            ]
+            for worker in self._workers:
+                worker.start()
+
+    def subscribe(self, subscriber):
+        self._subscribers.append(subscriber)
+
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def publish(self, event):
+        if not self._workers:
+            self._start()
+        self._count('published')
+        try:
+            if self._policy == BLOCK:
+                self._queue.put(event, timeout=self._put_timeout)
+            else:
+                self._queue.put_nowait(event)
+        except queue.Full:
+            if self._policy == SPILL:
+                self._spill(event)
+            else:
+                self._count('dropped')
+
+    def _spill(self, event):
+        with self._spill_lock:
+            with open(self._spill_path, 'a', encoding='utf-8') as spill:
+                spill.write(to_json(event.to_dict()) + '\n')
+        self._count('spilled')
+
+    # Moves spilled events back into the queue once it has drained
+    def _replay_spill(self):
+        if not self._spill_path or not os.path.exists(self._spill_path):
+            return
+        with self._spill_lock:
+            replay_path = self._spill_path + '.replay'
+            try:
+                os.replace(self._spill_path, replay_path)
+            except FileNotFoundError:
+                return
+        with open(replay_path, encoding='utf-8') as spill:
+            events = [EmployeeEvent.from_dict(json.loads(line)) for line in spill if line.strip()]
+        os.remove(replay_path)
+        for start in range(0, len(events), self._batch_size):
+            self._dispatch(events[start:start + self._batch_size])
+
+    def _next_batch(self):
+        try:
+            batch = [self._queue.get(timeout=EVENT_BATCH_WAIT)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + EVENT_BATCH_WAIT
+        while len(batch) < self._batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _dispatch(self, batch):
+        for subscriber in self._subscribers:
+            try:
+                if hasattr(subscriber, 'update_batch'):
+                    subscriber.update_batch(batch)
+                else:
+                    for event in batch:
+                        subscriber.update(event)
+            except Exception as e:
+                self._count('errors')
+                print(f"Event subscriber {type(subscriber).__name__} failed: {e}")
+        self._count('dispatched', len(batch))
+
+    def _run(self):
+        while not (self._stopping.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if batch:
+                try:
+                    self._dispatch(batch)
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+            elif self._policy == SPILL:
+                self._replay_spill()
+
+    def flush(self):
+        """
+        Blocks until every queued event has been dispatched.
+        """
+        self._queue.join()
+
+    def close(self, timeout=5.0):
+        self._stopping.set()
+        for worker in self._workers:
+            worker.join(timeout)
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['queued'] = self._queue.qsize()
+        return stats
+
+
+class AuditLogSink:
+    """
+    Event subscriber that persists each batch of events into the
+    audit_logs table with a single multi-row INSERT.
+    """
+
+    def __init__(self, run_transaction):
+        self._run_transaction = run_transaction
+
+    def update_batch(self, events):
+        rows = [
+            (event.entity, event.entity_id, event.action, event.actor,
+             to_json(event.old) if event.old is not None else None,
+             to_json(event.new) if event.new is not None else None,
+             datetime.fromtimestamp(event.timestamp, timezone.utc).replace(tzinfo=None))
+            for event in events
+        ]
+
+        def work(cursor):
+            cursor.executemany("""
+                INSERT INTO audit_logs (entity_type, entity_id, action, actor_id, old_data, new_data, created_at)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """, rows)
+
+        self._run_transaction(work)
@@ -0,0 +1,144 @@
+import gzip
+import hashlib
+import os
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+
+from flask import request, make_response
+
+# Responses smaller than this are sent uncompressed
+COMPRESS_MIN_SIZE = 500
+COMPRESS_LEVEL = 6
+
+COMPRESSIBLE_MIMETYPES = {
+    'text/html', 'text/plain', 'text/csv', 'text/css', 'application/json',
+    'application/javascript', 'text/javascript', 'image/svg+xml',
+}
+
+# Seconds fingerprinted static assets may be cached by browsers and proxies
+STATIC_MAX_AGE = 365 * 24 * 3600
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def page_etag(*parts):
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()[:32]
+
+
+# HTTP dates have whole seconds, so a Last-Modified is only a safe validator
+# once its second is over: until then another write can land in that second
+def last_modified_settled(last_modified):
+    second = last_modified.replace(microsecond=0)
+    return datetime.now(timezone.utc).replace(tzinfo=None) >= second + timedelta(seconds=1)
+
+
+def conditional_page(versions, *names, page_cache=None, user_key=None):
+    """
+    Decorates a read-only view so its ETag and Last-Modified derive from
+    the data version counters `names` plus the route, user and query
+    string. Matching conditional requests get a 304 without running the
+    view; with `page_cache`, rendered bodies are reused across requests.
+    If-None-Match takes precedence; Last-Modified is only sent and honoured
+    once the second it names has passed.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(*args, **kwargs)
+            numbers, last_modified = versions.get(*names)
+            if last_modified and not last_modified_settled(last_modified):
+                # Validated by the version ETag alone until the second has passed
+                last_modified = None
+            user = user_key() if user_key else None
+            etag = page_etag(request.endpoint, kwargs, user, request.query_string, numbers)
+
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains_weak(etag)
+            else:
+                since = request.if_modified_since
+                not_modified = bool(since and last_modified and since.replace(tzinfo=None) >= last_modified.replace(microsecond=0))
+            if not_modified:
+                response = make_response('', 304)
+            else:
+                cached = page_cache.get(etag) if page_cache is not None else None
+                if cached is None:
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200:
+                        # Redirects and errors carry no validators
+                        return response
+                    if page_cache is not None and not response.is_streamed:
+                        page_cache.set(etag, (response.get_data(), response.mimetype))
+                else:
+                    body, mimetype = cached
+                    response = make_response(body)
+                    response.mimetype = mimetype
+
+            response.set_etag(etag, weak=True)
+            if last_modified:
+                response.last_modified = last_modified
+            # Per-user pages: browsers keep them but must revalidate each time
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
+
+
+def compress_response(response, accept_encoding, min_size=COMPRESS_MIN_SIZE, level=COMPRESS_LEVEL):
+    """
+    Compresses a buffered text/JSON response with brotli (when installed)
+    or gzip, as the client accepts. Streamed and file responses pass
+    through untouched.
+    """
+    if (response.direct_passthrough or response.is_streamed or response.status_code < 200
+            or response.status_code in (204, 304) or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    if len(body) < min_size:
+        return response
+
+    if brotli is not None and 'br' in accept_encoding:
+        body, encoding = brotli.compress(body, quality=min(level, 11)), 'br'
+    elif 'gzip' in accept_encoding:
+        body, encoding = gzip.compress(body, compresslevel=level), 'gzip'
+    else:
+        return response
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    # The encoded bytes differ from the identity representation
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+class StaticFingerprints:
+    """
+    Content hashes of files under the static folder, recomputed only when
+    a file's modification time changes. Appended to static URLs as ?v= so
+    those URLs can be cached for a year.
+    """
+
+    def __init__(self, static_folder):
+        self._static_folder = static_folder
+        self._hashes = {}
+
+    def get(self, filename):
+        path = os.path.join(self._static_folder, filename)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        cached = self._hashes.get(filename)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:12]
+        self._hashes[filename] = (mtime, digest)
+        return digest
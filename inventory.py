@@ -0,0 +1,218 @@
+from collections import Counter
+
+from changefeed import INVENTORY, ASSIGNMENT, record_changes
+from pagination import keyset_condition, order_by, encode_cursor
+from versions import bump_data_version
+
+
+# Custom exception for inventory operations
+class InventoryException(Exception):
+    pass
+
+
+class InventoryStock:
+    """
+    Stock accounting for inventory items. Each item keeps a maintained
+    assigned_count next to its quantity, so availability is read from the
+    row itself instead of aggregating employee_inventory. Assignments
+    reserve stock with a conditional UPDATE, which cannot over-allocate
+    no matter how many requests race for the last unit.
+    """
+
+    def __init__(self, run_transaction):
+        self._run_transaction = run_transaction
+        self._observers = []
+
+    # Observers are notified after every committed stock or assignment change
+    def register_observer(self, observer):
+        self._observers.append(observer)
+
+    def _notify(self, message):
+        for observer in self._observers:
+            observer.update(message)
+
+    @staticmethod
+    def _reserve(cursor, inventory_id, count):
+        cursor.execute("""
+            UPDATE inventory
+            SET assigned_count = assigned_count + %s
+            WHERE id = %s AND quantity - assigned_count >= %s
+        """, (count, inventory_id, count))
+        if cursor.rowcount:
+            return
+        cursor.execute("SELECT name, quantity - assigned_count AS available FROM inventory WHERE id = %s", (inventory_id,))
+        item = cursor.fetchone()
+        if not item:
+            raise InventoryException(f"Inventory item {inventory_id} not found.")
+        raise InventoryException(f"Not enough '{item[0]}' in stock: {item[1]} available, {count} requested.")
+
+    # Change log entries for items whose stock just changed, read back inside the writing transaction
+    @staticmethod
+    def _item_changes(cursor, inventory_ids):
+        cursor.execute(f"SELECT id, name, quantity, assigned_count, description FROM inventory WHERE id IN ({', '.join(['%s'] * len(inventory_ids))}) ORDER BY id",
+                       tuple(inventory_ids))
+        columns = ('id', 'name', 'quantity', 'assigned_count', 'description')
+        return [(INVENTORY, row[0], 'updated', dict(zip(columns, row))) for row in cursor.fetchall()]
+
+    def add_item(self, name, quantity, description=''):
+        if quantity < 0:
+            raise InventoryException("Quantity cannot be negative.")
+
+        def work(cursor):
+            cursor.execute("INSERT INTO inventory (name, quantity, description) VALUES (%s, %s, %s)",
+                           (name, quantity, description))
+            id = cursor.lastrowid
+            record_changes(cursor, [(INVENTORY, id, 'added', {'id': id, 'name': name, 'quantity': quantity, 'assigned_count': 0, 'description': description})])
+            return id
+
+        id = self._run_transaction(work)
+        bump_data_version(self._run_transaction, 'inventory')
+        self._notify(f"Added inventory item: {name}")
+        return id
+
+    def assign(self, employee_id, inventory_id, assigned_date):
+        """
+        Assigns one unit of an item to an employee. Returns the assignment id.
+        """
+        return self.assign_bulk([employee_id], [inventory_id], assigned_date)[0]
+
+    def assign_bulk(self, employee_ids, inventory_ids, assigned_date):
+        """
+        Assigns every item in `inventory_ids` to every employee in
+        `employee_ids` in a single transaction. Either all assignments are
+        made or, if any item is short, none are. Returns the assignment ids.
+        """
+        pairs = [(employee_id, inventory_id) for employee_id in employee_ids for inventory_id in inventory_ids]
+        if not pairs:
+            raise InventoryException("Select at least one employee and one item.")
+        needed = Counter(inventory_id for _, inventory_id in pairs)
+
+        def work(cursor):
+            # Reserve in id order so concurrent bulk assignments lock rows consistently
+            for inventory_id in sorted(needed):
+                self._reserve(cursor, inventory_id, needed[inventory_id])
+            ids = []
+            for employee_id, inventory_id in pairs:
+                cursor.execute("INSERT INTO employee_inventory (employee_id, inventory_id, assigned_date) VALUES (%s, %s, %s)",
+                               (employee_id, inventory_id, assigned_date))
+                ids.append(cursor.lastrowid)
+            changes = self._item_changes(cursor, sorted(needed))
+            changes.extend((ASSIGNMENT, id, 'assigned', {'id': id, 'employee_id': employee_id, 'inventory_id': inventory_id,
+                                                         'assigned_date': assigned_date, 'returned_date': None})
+                           for id, (employee_id, inventory_id) in zip(ids, pairs))
+            record_changes(cursor, changes)
+            return ids
+
+        ids = self._run_transaction(work)
+        bump_data_version(self._run_transaction, 'inventory')
+        self._notify(f"Assigned {len(ids)} inventory items")
+        return ids
+
+    def return_assignment(self, assignment_id, returned_date):
+        """
+        Marks an assignment as returned and puts the unit back in stock.
+        Returns the inventory id of the returned item.
+        """
+        def work(cursor):
+            cursor.execute("SELECT inventory_id, employee_id, assigned_date FROM employee_inventory WHERE id = %s AND returned_date IS NULL FOR UPDATE", (assignment_id,))
+            row = cursor.fetchone()
+            if not row:
+                raise InventoryException("Assignment not found or already returned.")
+            cursor.execute("UPDATE employee_inventory SET returned_date = %s WHERE id = %s", (returned_date, assignment_id))
+            cursor.execute("UPDATE inventory SET assigned_count = assigned_count - 1 WHERE id = %s", (row[0],))
+            changes = self._item_changes(cursor, [row[0]])
+            changes.append((ASSIGNMENT, assignment_id, 'returned', {'id': assignment_id, 'employee_id': row[1], 'inventory_id': row[0],
+                                                                     'assigned_date': row[2], 'returned_date': returned_date}))
+            record_changes(cursor, changes)
+            return row[0]
+
+        inventory_id = self._run_transaction(work)
+        bump_data_version(self._run_transaction, 'inventory')
+        self._notify(f"Returned assignment with ID: {assignment_id}")
+        return inventory_id
+
+    def list_items(self):
+        """
+        Returns every inventory item with its stock figures.
+        """
+        def work(cursor):
+            cursor.execute("""
+                SELECT id, name, quantity, assigned_count, quantity - assigned_count AS available, description
+                FROM inventory
+                ORDER BY id
+            """)
+            return cursor.fetchall()
+
+        return self._run_transaction(work, dictionary=True)
+
+    def availability(self, inventory_id):
+        def work(cursor):
+            cursor.execute("SELECT quantity, assigned_count, quantity - assigned_count AS available FROM inventory WHERE id = %s", (inventory_id,))
+            return cursor.fetchone()
+
+        item = self._run_transaction(work, dictionary=True)
+        if not item:
+            raise InventoryException(f"Inventory item {inventory_id} not found.")
+        return item
+
+    def get_assignment_page(self, employee_id=None, inventory_id=None, date_from=None, date_to=None, after=None, limit=50):
+        """
+        Returns (assignments, next_cursor), newest first, for one keyset page.
+        Filtering by employee or item range-scans the (employee_id, assigned_date)
+        and (inventory_id, assigned_date) indexes.
+        """
+        conditions = []
+        params = []
+        for column, value in (('ei.employee_id', employee_id), ('ei.inventory_id', inventory_id)):
+            if value:
+                conditions.append(f"{column} = %s")
+                params.append(value)
+        if date_from:
+            conditions.append("ei.assigned_date >= %s")
+            params.append(date_from)
+        if date_to:
+            conditions.append("ei.assigned_date <= %s")
+            params.append(date_to)
+
+        seek, seek_params = keyset_condition('ei.assigned_date', True, after, id_column='ei.id')
+        if seek:
+            conditions.append(seek)
+            params.extend(seek_params)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        def work(cursor):
+            cursor.execute(f"""
+                SELECT ei.id, ei.employee_id, ei.inventory_id, e.name AS employee_name, i.name AS inventory_name,
+                       ei.assigned_date, ei.returned_date
+                FROM employee_inventory ei
+                JOIN employees e ON ei.employee_id = e.id
+                JOIN inventory i ON ei.inventory_id = i.id
+                {where}
+                {order_by('ei.assigned_date', True, id_column='ei.id')}
+                LIMIT %s
+            """, tuple(params) + (limit + 1,))
+            return cursor.fetchall()
+
+        assignments = self._run_transaction(work, dictionary=True)
+        next_cursor = None
+        if len(assignments) > limit:
+            assignments = assignments[:limit]
+            last = assignments[-1]
+            next_cursor = encode_cursor([last['assigned_date'], last['id']])
+        return assignments, next_cursor
+
+    def get_employee_items(self, employee_id):
+        """
+        Returns the items currently assigned to one employee.
+        """
+        def work(cursor):
+            cursor.execute("""
+                SELECT ei.id, ei.inventory_id, i.name AS inventory_name, ei.assigned_date
+                FROM employee_inventory ei
+                JOIN inventory i ON ei.inventory_id = i.id
+                WHERE ei.employee_id = %s AND ei.returned_date IS NULL
+                ORDER BY ei.assigned_date DESC, ei.id DESC
+            """, (employee_id,))
+            return cursor.fetchall()
+
+        return self._run_transaction(work, dictionary=True)
@@ -0,0 +1,401 @@
+import heapq
+import itertools
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import TimeoutError as FutureTimeout
+from datetime import datetime, timezone
+
+from events import to_json
+from metrics import metrics
+
+# Job states
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+TIMED_OUT = 'timed_out'
+FINISHED = (SUCCEEDED, FAILED, CANCELLED, TIMED_OUT)
+
+# Priorities: lower numbers run first
+HIGH = 0
+NORMAL = 5
+LOW = 9
+
+# Where a job kind runs
+THREAD = 'thread'      # on the shared ThreadPoolExecutor
+PROCESS = 'process'    # on a process pool, for CPU-bound work
+
+JOB_QUEUE_SIZE = 100       # jobs allowed to wait per process
+JOB_CONCURRENCY = 2        # executor threads jobs may occupy at once
+JOB_TIMEOUT = 300          # seconds from submission until a job is timed out
+
+
+# Raised when the bounded job queue is full
+class JobQueueFull(Exception):
+    pass
+
+
+# Raised for job kinds that were never registered
+class UnknownJobKind(Exception):
+    pass
+
+
+def _utc(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None) if timestamp else None
+
+
+def _timestamp(value):
+    return value.replace(tzinfo=timezone.utc).timestamp() if value else None
+
+
+class Job:
+    __slots__ = ('id', 'kind', 'params', 'priority', 'owner', 'status', 'result', 'error',
+                 'created_at', 'started_at', 'finished_at', 'deadline', 'cancel_requested')
+
+    def __init__(self, id, kind, params, priority, owner, status, created_at, deadline,
+                 started_at=None, finished_at=None, result=None, error=None, cancel_requested=False):
+        self.id = id
+        self.kind = kind
+        self.params = params
+        self.priority = priority
+        self.owner = owner
+        self.status = status
+        self.result = result
+        self.error = error
+        self.created_at = created_at
+        self.started_at = started_at
+        self.finished_at = finished_at
+        self.deadline = deadline
+        self.cancel_requested = cancel_requested
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(row['id'], row['kind'], json.loads(row['params'] or '{}'), row['priority'], row['owner_id'], row['status'],
+                   _timestamp(row['created_at']), _timestamp(row['deadline']), _timestamp(row['started_at']),
+                   _timestamp(row['finished_at']), json.loads(row['result']) if row['result'] else None, row['error'],
+                   bool(row['cancel_requested']))
+
+    def timings(self):
+        """
+        Returns (wait_ms, run_ms): time spent queued and running so far.
+        """
+        now = time.time()
+        wait_end = self.started_at or self.finished_at or now
+        wait_ms = (wait_end - self.created_at) * 1000
+        run_ms = ((self.finished_at or now) - self.started_at) * 1000 if self.started_at else None
+        return wait_ms, run_ms
+
+    def to_dict(self):
+        wait_ms, run_ms = self.timings()
+        return {
+            'id': self.id, 'kind': self.kind, 'status': self.status, 'priority': self.priority,
+            'created_at': _utc(self.created_at), 'started_at': _utc(self.started_at), 'finished_at': _utc(self.finished_at),
+            'wait_ms': round(wait_ms, 1), 'run_ms': round(run_ms, 1) if run_ms is not None else None,
+            'result': self.result, 'error': self.error,
+            'cancel_requested': self.cancel_requested and self.status not in FINISHED,
+        }
+
+
+class _JobKind:
+    __slots__ = ('function', 'backend', 'timeout', 'public', 'cleanup')
+
+    def __init__(self, function, backend, timeout, public, cleanup):
+        self.function = function
+        self.backend = backend
+        self.timeout = timeout
+        self.public = public
+        self.cleanup = cleanup
+
+
+class JobQueue:
+    """
+    Submit-and-poll background jobs. Jobs wait in a bounded priority queue
+    and at most `concurrency` of them run at once on the shared executor;
+    kinds registered with backend=PROCESS run on a process pool when
+    `process_workers` is set. Every state change is written to the jobs
+    table, so status and results can be read from any worker and survive
+    a restart.
+
+    Timeouts count from submission. Running work cannot be interrupted:
+    a cancelled or timed-out job is marked at once and whatever it returns
+    later is discarded. A job running in another worker is cancelled by
+    flagging its row; that worker discards the result when the job ends.
+    """
+
+    def __init__(self, run_transaction, executor, maxsize=JOB_QUEUE_SIZE, concurrency=JOB_CONCURRENCY, process_workers=0):
+        self._run_transaction = run_transaction
+        self._executor = executor
+        self.maxsize = maxsize
+        self.concurrency = concurrency
+        self._process_workers = process_workers
+        self._process_pool = None
+        self._kinds = {}
+        self._lock = threading.Lock()
+        self._heap = []                 # (priority, sequence, job)
+        self._sequence = itertools.count()
+        self._queued = 0                # heap entries that are still QUEUED
+        self._runners = 0
+        self._jobs = {}                 # unfinished jobs of this process by id
+        self._stats = {'submitted': 0, 'rejected': 0, 'succeeded': 0, 'failed': 0, 'cancelled': 0, 'timed_out': 0}
+
+    def register(self, kind, function, backend=THREAD, timeout=JOB_TIMEOUT, public=True, cleanup=None):
+        """
+        Registers `function(**params)` under `kind`. PROCESS functions must be
+        importable module-level functions. Non-public kinds can only be
+        submitted by the app itself, not through the /jobs endpoint.
+        `cleanup(**params)` runs once the job reaches any final state in this
+        process, e.g. to delete an input file.
+        """
+        self._kinds[kind] = _JobKind(function, backend, timeout, public, cleanup)
+
+    def is_public(self, kind):
+        return kind in self._kinds and self._kinds[kind].public
+
+    def public_kinds(self):
+        return [kind for kind, spec in self._kinds.items() if spec.public]
+
+    def _save(self, job, insert=False):
+        wait_ms, run_ms = job.timings()
+
+        def work(cursor):
+            if insert:
+                cursor.execute("""
+                    INSERT INTO jobs (id, kind, status, priority, owner_id, params, created_at, deadline)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                """, (job.id, job.kind, job.status, job.priority, job.owner, to_json(job.params),
+                      _utc(job.created_at), _utc(job.deadline)))
+            else:
+                cursor.execute("""
+                    UPDATE jobs
+                    SET status = %s, started_at = %s, finished_at = %s, wait_ms = %s, run_ms = %s, result = %s, error = %s
+                    WHERE id = %s
+                """, (job.status, _utc(job.started_at), _utc(job.finished_at), wait_ms, run_ms,
+                      to_json(job.result) if job.result is not None else None, job.error, job.id))
+
+        self._run_transaction(work)
+
+    def submit(self, kind, params=None, priority=NORMAL, owner=None):
+        """
+        Queues a job and returns it. Raises UnknownJobKind, or JobQueueFull
+        when `maxsize` jobs are already waiting.
+        """
+        spec = self._kinds.get(kind)
+        if spec is None:
+            raise UnknownJobKind(f"Unknown job kind {kind!r}.")
+        with self._lock:
+            if self._queued >= self.maxsize:
+                self._stats['rejected'] += 1
+                raise JobQueueFull("Too many jobs are waiting. Please try again shortly.")
+            self._queued += 1
+
+        now = time.time()
+        job = Job(uuid.uuid4().hex, kind, params or {}, priority, owner, QUEUED, now, now + spec.timeout)
+        try:
+            self._save(job, insert=True)
+        except BaseException:
+            with self._lock:
+                self._queued -= 1
+            raise
+
+        with self._lock:
+            self._jobs[job.id] = job
+            heapq.heappush(self._heap, (priority, next(self._sequence), job))
+            self._stats['submitted'] += 1
+            start_runner = self._runners < self.concurrency
+            if start_runner:
+                self._runners += 1
+        if start_runner:
+            self._executor.submit(self._run_jobs)
+        return job
+
+    def _next_job(self):
+        with self._lock:
+            while self._heap:
+                _, _, job = heapq.heappop(self._heap)
+                if job.status == QUEUED:
+                    self._queued -= 1
+                    job.status = RUNNING
+                    job.started_at = time.time()
+                    return job
+            self._runners -= 1
+            return None
+
+    # Runner loop submitted to the executor; exits once the queue is empty
+    def _run_jobs(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            if job.started_at >= job.deadline:
+                self._finish(job, TIMED_OUT, error="Timed out while queued.", expected=RUNNING)
+                continue
+            try:
+                claimed = self._claim(job)
+            except Exception as e:
+                print(f"Could not record start of job {job.id}: {e}")
+                claimed = True
+            if not claimed:
+                # Cancelled through another worker while it waited
+                self._finish(job, CANCELLED, error="Cancelled.", expected=RUNNING, save=False)
+                continue
+            self._execute(job)
+
+    def _claim(self, job):
+        def work(cursor):
+            cursor.execute("UPDATE jobs SET status = %s, started_at = %s WHERE id = %s AND status = %s AND NOT cancel_requested",
+                           (RUNNING, _utc(job.started_at), job.id, QUEUED))
+            return cursor.rowcount
+
+        return self._run_transaction(work) == 1
+
+    def _processes(self):
+        if self._process_pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            # Spawned, not forked: this process has threads and open connections
+            self._process_pool = ProcessPoolExecutor(self._process_workers, mp_context=multiprocessing.get_context('spawn'))
+        return self._process_pool
+
+    def _execute(self, job):
+        spec = self._kinds[job.kind]
+        try:
+            if spec.backend == PROCESS and self._process_workers:
+                future = self._processes().submit(spec.function, **job.params)
+                try:
+                    result = future.result(timeout=max(0.0, job.deadline - time.time()))
+                except FutureTimeout:
+                    future.cancel()
+                    self._finish(job, TIMED_OUT, error=f"Timed out after {spec.timeout}s.")
+                    return
+            else:
+                result = spec.function(**job.params)
+        except Exception as e:
+            self._finish(job, FAILED, error=str(e) or type(e).__name__)
+            return
+        if time.time() > job.deadline:
+            self._finish(job, TIMED_OUT, error=f"Timed out after {spec.timeout}s.")
+        elif self._cancel_requested(job):
+            self._finish(job, CANCELLED, error="Cancelled.")
+        else:
+            self._finish(job, SUCCEEDED, result=result)
+
+    # Whether another worker asked to cancel this running job
+    def _cancel_requested(self, job):
+        def work(cursor):
+            cursor.execute("SELECT cancel_requested FROM jobs WHERE id = %s", (job.id,))
+            row = cursor.fetchone()
+            return bool(row and row[0])
+
+        try:
+            return self._run_transaction(work)
+        except Exception as e:
+            print(f"Could not check cancellation of job {job.id}: {e}")
+            return False
+
+    def _finish(self, job, status, result=None, error=None, expected=None, save=True):
+        """
+        Moves `job` to a final state unless it already reached one
+        (e.g. it was cancelled while running).
+        """
+        with self._lock:
+            if job.status in FINISHED or (expected and job.status != expected):
+                return False
+            if job.status == QUEUED:
+                self._queued -= 1
+            job.status = status
+            job.result = result
+            job.error = error
+            job.finished_at = time.time()
+            self._stats[status] += 1
+            self._jobs.pop(job.id, None)
+        self._cleanup(job)
+        wait_ms, run_ms = job.timings()
+        metrics.job_wait.observe(wait_ms / 1000, job.kind)
+        if run_ms is not None:
+            metrics.job_duration.observe(run_ms / 1000, job.kind, status)
+        if save:
+            try:
+                self._save(job)
+            except Exception as e:
+                print(f"Could not record result of job {job.id}: {e}")
+        return True
+
+    def _cleanup(self, job):
+        spec = self._kinds.get(job.kind)
+        if spec is None or spec.cleanup is None:
+            return
+        try:
+            spec.cleanup(**job.params)
+        except Exception as e:
+            print(f"Could not clean up after job {job.id}: {e}")
+
+    def get(self, job_id):
+        """
+        Returns the Job with this id from memory or the jobs table, or None.
+        Unfinished jobs past their deadline (including ones orphaned by a
+        worker restart) are reported as timed out.
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            def work(cursor):
+                cursor.execute("""
+                    SELECT id, kind, status, priority, owner_id, params, result, error, created_at, started_at, finished_at, deadline,
+                           cancel_requested
+                    FROM jobs WHERE id = %s
+                """, (job_id,))
+                return cursor.fetchone()
+
+            row = self._run_transaction(work, dictionary=True)
+            if row is None:
+                return None
+            job = Job.from_row(row)
+            if job.status not in FINISHED and time.time() > job.deadline:
+                job.status, job.error, job.finished_at = TIMED_OUT, "Timed out (no worker finished it).", time.time()
+                self._run_transaction(lambda cursor: cursor.execute(
+                    "UPDATE jobs SET status = %s, error = %s, finished_at = %s WHERE id = %s AND status IN (%s, %s)",
+                    (job.status, job.error, _utc(job.finished_at), job.id, QUEUED, RUNNING)))
+            return job
+        if time.time() > job.deadline:
+            self._finish(job, TIMED_OUT, error=f"Timed out after {self._kinds[job.kind].timeout}s.")
+        return job
+
+    def cancel(self, job_id):
+        """
+        Cancels a job. Returns True if it was queued or running, False if it
+        already finished. Jobs queued by other workers are cancelled through
+        the jobs table and skipped when they come up; jobs running in other
+        workers are flagged there, and end as cancelled once their worker
+        sees the flag when the work returns.
+        """
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return self._finish(job, CANCELLED, error="Cancelled.")
+
+        # status is assigned last: MySQL evaluates SET assignments left to right
+        def work(cursor):
+            cursor.execute("""
+                UPDATE jobs
+                SET cancel_requested = TRUE,
+                    error = CASE WHEN status = %s THEN %s ELSE error END,
+                    finished_at = CASE WHEN status = %s THEN %s ELSE finished_at END,
+                    status = CASE WHEN status = %s THEN %s ELSE status END
+                WHERE id = %s AND status IN (%s, %s)
+            """, (QUEUED, "Cancelled.", QUEUED, _utc(time.time()), QUEUED, CANCELLED, job_id, QUEUED, RUNNING))
+            return cursor.rowcount
+
+        return self._run_transaction(work) == 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['queued'] = self._queued
+            stats['running'] = len(self._jobs) - self._queued
+        return stats
+
+    def shutdown(self):
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,219 @@
+import re
+import threading
+import time
+from bisect import bisect_left
+
+# Latency buckets in seconds shared by every histogram
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Longest normalized statement kept as a metric label
+MAX_FINGERPRINT_LENGTH = 160
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_VALUES_LIST = re.compile(r"(\(\?\))(?:\s*,\s*\(\?\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint_query(sql):
+    """
+    Normalizes a statement so that executions differing only in literal
+    values or parameter counts share one fingerprint.
+    """
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = _WHITESPACE.sub(' ', sql).strip()
+    sql = _PLACEHOLDER_LIST.sub('(?)', sql)
+    sql = _VALUES_LIST.sub(r'\1', sql)
+    return sql[:MAX_FINGERPRINT_LENGTH]
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names, values):
+    if not names:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + '}'
+
+
+class Counter:
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.label_names, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self.buckets = buckets
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                # per-bucket counts (+Inf last), then sum
+                series = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = sorted((labels, list(series)) for labels, series in self._values.items())
+        for labels, series in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), series[:-1]):
+                cumulative += count
+                bucket_labels = _labels(self.label_names + ('le',), labels + (bound,))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {series[-1]}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+
+class Gauges:
+    """
+    Values sampled at scrape time from callbacks, e.g. pool or queue sizes.
+    Each callback returns {metric_name: value}.
+    """
+
+    def __init__(self):
+        self._callbacks = []
+
+    def register(self, callback):
+        self._callbacks.append(callback)
+
+    def render(self):
+        lines = []
+        for callback in self._callbacks:
+            try:
+                values = callback()
+            except Exception:
+                continue
+            for name, value in values.items():
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {value}")
+        return lines
+
+
+class Metrics:
+    """
+    Process-wide instrumentation registry. When disabled every hook
+    returns immediately and connections are not wrapped.
+    """
+
+    def __init__(self, enabled=True, slow_query_seconds=0.5):
+        self.enabled = enabled
+        self.slow_query_seconds = slow_query_seconds
+        self.request_latency = Histogram('http_request_duration_seconds', 'HTTP request latency by endpoint.', ('endpoint', 'method', 'status'))
+        self.query_latency = Histogram('db_query_duration_seconds', 'Database statement latency by query fingerprint.', ('query',))
+        self.query_errors = Counter('db_query_errors_total', 'Database statements that raised.', ('query',))
+        self.slow_queries = Counter('db_slow_queries_total', 'Statements slower than the slow query threshold.', ('query',))
+        self.acquire_latency = Histogram('db_connection_acquire_seconds', 'Time spent checking a connection out of the pool.')
+        self.job_wait = Histogram('job_wait_seconds', 'Time background jobs spent queued, by kind.', ('kind',))
+        self.job_duration = Histogram('job_duration_seconds', 'Background job run time by kind and final status.', ('kind', 'status'))
+        self.gauges = Gauges()
+
+    def observe_query(self, sql, elapsed, failed=False):
+        query = fingerprint_query(sql)
+        self.query_latency.observe(elapsed, query)
+        if failed:
+            self.query_errors.inc(query)
+        if elapsed >= self.slow_query_seconds:
+            self.slow_queries.inc(query)
+            print(f"Slow query ({elapsed * 1000:.1f} ms): {query}")
+
+    def instrument_connection(self, conn):
+        if not self.enabled:
+            return conn
+        return InstrumentedConnection(conn, self)
+
+    def render(self):
+        lines = []
+        for metric in (self.request_latency, self.query_latency, self.query_errors, self.slow_queries, self.acquire_latency,
+                       self.job_wait, self.job_duration):
+            lines.extend(metric.render())
+        lines.extend(self.gauges.render())
+        return '\n'.join(lines) + '\n'
+
+
+class InstrumentedCursor:
+    """
+    Cursor proxy timing execute/executemany; everything else is delegated.
+    """
+
+    def __init__(self, cursor, metrics):
+        self._cursor = cursor
+        self._metrics = metrics
+
+    def _timed(self, method, operation, *args, **kwargs):
+        started = time.perf_counter()
+        failed = False
+        try:
+            return method(operation, *args, **kwargs)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._metrics.observe_query(operation, time.perf_counter() - started, failed)
+
+    def execute(self, operation, *args, **kwargs):
+        return self._timed(self._cursor.execute, operation, *args, **kwargs)
+
+    def executemany(self, operation, *args, **kwargs):
+        return self._timed(self._cursor.executemany, operation, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._cursor.close()
+
+
+class InstrumentedConnection:
+    """
+    Connection proxy whose cursors are instrumented.
+    """
+
+    def __init__(self, conn, metrics):
+        self._conn = conn
+        self._metrics = metrics
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._conn.cursor(*args, **kwargs), self._metrics)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+# Shared registry used by Config and app
+metrics = Metrics()
@@ -0,0 +1,79 @@
+import base64
+import json
+
+# Default and maximum number of rows returned per page
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(values):
+    """
+    Encodes the sort key of the last row on a page into an opaque,
+    URL-safe cursor string.
+    """
+    raw = json.dumps(values, separators=(',', ':'), default=str).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decodes a cursor produced by encode_cursor.
+    Returns None for a missing or malformed cursor.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(values, list) or len(values) != 2:
+        return None
+    return values
+
+
+def page_size(value):
+    """
+    Parses a requested page size, clamped to [1, MAX_PAGE_SIZE].
+    """
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return PAGE_SIZE
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def keyset_condition(sort_column, descending, after, id_column='id'):
+    """
+    Builds the WHERE fragment that seeks past the row identified by
+    `after` ([sort_value, id]) when ordering by (sort_column, id_column).
+    The fragment only uses comparisons on the ordered columns, so MySQL can
+    range-scan an index on (sort_column, id) instead of skipping OFFSET rows.
+    Returns (sql, params); sql is None when there is nothing to seek past.
+    """
+    if after is None:
+        return None, []
+
+    value, last_id = after
+    op = '<' if descending else '>'
+
+    if sort_column == id_column:
+        return f"{id_column} {op} %s", [last_id]
+
+    # MySQL sorts NULLs first ascending and last descending
+    if value is None:
+        if descending:
+            return f"({sort_column} IS NULL AND {id_column} < %s)", [last_id]
+        return f"(({sort_column} IS NULL AND {id_column} > %s) OR {sort_column} IS NOT NULL)", [last_id]
+
+    sql = f"({sort_column} {op} %s OR ({sort_column} = %s AND {id_column} {op} %s))"
+    if descending:
+        sql = f"({sql} OR {sort_column} IS NULL)"
+    return sql, [value, value, last_id]
+
+
+def order_by(sort_column, descending, id_column='id'):
+    direction = 'DESC' if descending else 'ASC'
+    if sort_column == id_column:
+        return f"ORDER BY {id_column} {direction}"
+    return f"ORDER BY {sort_column} {direction}, {id_column} {direction}"
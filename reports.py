@@ -0,0 +1,152 @@
+import io
+from datetime import date
+from functools import lru_cache
+from importlib.util import find_spec
+
+# Seconds a computed report is served from cache
+REPORT_CACHE_TTL = 300
+
+# Employee columns pulled for reporting
+REPORT_COLUMNS = ('department', 'job_title', 'salary', 'date_of_joining', 'year_of_birth')
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+REPORT_DOWNLOAD_MIMETYPES = {
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+# pandas writes Parquet through one of these optional packages
+PARQUET_ENGINES = ('pyarrow', 'fastparquet')
+
+
+def load_columns(rows, columns=REPORT_COLUMNS):
+    """
+    Converts an iterable of row tuples into one NumPy array per column,
+    filling the column lists as rows stream in instead of keeping rows.
+    """
+    import numpy as np
+
+    values = [[] for _ in columns]
+    appenders = [column.append for column in values]
+    for row in rows:
+        for append, value in zip(appenders, row):
+            append(value)
+
+    arrays = {}
+    for name, column in zip(columns, values):
+        if name in ('salary', 'year_of_birth'):
+            arrays[name] = np.array([np.nan if value is None else float(value) for value in column], dtype=np.float64)
+        elif name == 'date_of_joining':
+            arrays[name] = np.array([str(value)[:10] if value else 'NaT' for value in column], dtype='datetime64[D]')
+        else:
+            arrays[name] = np.array([value or 'Unassigned' for value in column], dtype=object)
+    return arrays
+
+
+def _describe(values):
+    """
+    Count, mean, min, max and percentiles of one numeric array, NaNs ignored.
+    """
+    import numpy as np
+
+    values = values[~np.isnan(values)]
+    if not values.size:
+        return {'count': 0}
+    stats = {'count': int(values.size), 'mean': round(float(values.mean()), 2),
+             'min': round(float(values.min()), 2), 'max': round(float(values.max()), 2)}
+    for p, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        stats[f'p{p}'] = round(float(value), 2)
+    return stats
+
+
+def _by_group(groups, values, label):
+    """
+    _describe() per distinct group. Sorting once by group lets each group be
+    described from a contiguous slice.
+    """
+    import numpy as np
+
+    if not groups.size:
+        return []
+    order = np.argsort(groups, kind='stable')
+    groups, values = groups[order], values[order]
+    keys, starts = np.unique(groups, return_index=True)
+    ends = np.append(starts[1:], groups.size)
+    return [dict({label: key}, **_describe(values[start:end])) for key, start, end in zip(keys, starts, ends)]
+
+
+def salary_report(columns):
+    return {
+        'overall': _describe(columns['salary']),
+        'by_department': _by_group(columns['department'], columns['salary'], 'department'),
+        'by_job_title': _by_group(columns['job_title'], columns['salary'], 'job_title'),
+    }
+
+
+def tenure_report(columns, today=None):
+    import numpy as np
+
+    today = np.datetime64(today or date.today(), 'D')
+    joined = columns['date_of_joining']
+    years = np.where(np.isnat(joined), np.nan, (today - joined).astype(np.float64) / 365.25)
+    return {
+        'overall': _describe(years),
+        'by_department': _by_group(columns['department'], years, 'department'),
+    }
+
+
+def age_report(columns, today=None):
+    ages = (today or date.today()).year - columns['year_of_birth']
+    return {
+        'overall': _describe(ages),
+        'by_department': _by_group(columns['department'], ages, 'department'),
+    }
+
+
+REPORTS = {
+    'salary': salary_report,
+    'tenure': tenure_report,
+    'age': age_report,
+}
+
+
+def report_table(report):
+    """
+    Flattens a report into rows for download: one per group, with the
+    overall figures first.
+    """
+    rows = [dict({'group': 'overall', 'key': 'all'}, **report['overall'])]
+    for group in ('by_department', 'by_job_title'):
+        for entry in report.get(group, ()):
+            entry = dict(entry)
+            key = entry.pop(group[len('by_'):])
+            rows.append(dict({'group': group[len('by_'):], 'key': key}, **entry))
+    return rows
+
+
+def table_to_csv(rows):
+    import csv
+
+    fields = []
+    for row in rows:
+        fields.extend(field for field in row if field not in fields)
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=fields)
+    writer.writeheader()
+    writer.writerows(rows)
+    return buf.getvalue().encode('utf-8')
+
+
+# Checked without importing anything, once per process
+@lru_cache(maxsize=None)
+def parquet_available():
+    return find_spec('pandas') is not None and any(find_spec(engine) is not None for engine in PARQUET_ENGINES)
+
+
+def table_to_parquet(rows):
+    import pandas as pd
+
+    buf = io.BytesIO()
+    pd.DataFrame(rows).to_parquet(buf, index=False)
+    return buf.getvalue()
@@ -26,14 +26,28 @@ CREATE TABLE employees (
   job_title VARCHAR(150),
   date_of_joining DATE,
   department VARCHAR(150),
-  status VARCHAR(50)
+  status VARCHAR(50),
+  version INT NOT NULL DEFAULT 0,   -- bumped on every update (optimistic concurrency)
+  joining_month_day SMALLINT AS (MONTH(date_of_joining) * 100 + DAYOFMONTH(date_of_joining)) STORED  -- MMDD, for anniversary lookups
 );
 
+-- keyset pagination / filtering for the employee list
+CREATE INDEX idx_employees_name ON employees (name, id);
+CREATE INDEX idx_employees_department ON employees (department, id);
+CREATE INDEX idx_employees_status ON employees (status, id);
+CREATE INDEX idx_employees_job_title ON employees (job_title, id);
+
+-- dashboard: recent hires and upcoming anniversaries
+CREATE INDEX idx_employees_date_of_joining ON employees (date_of_joining);
+CREATE INDEX idx_employees_joining_month_day ON employees (joining_month_day);
+
 CREATE TABLE inventory (
   id INT AUTO_INCREMENT PRIMARY KEY,
   name VARCHAR(150) NOT NULL,
-  quantity INT NOT NULL,
-  description TEXT
+  quantity INT NOT NULL,            -- total stock
+  assigned_count INT NOT NULL DEFAULT 0,  -- units currently assigned (maintained by the app)
+  description TEXT,
+  CHECK (assigned_count >= 0 AND assigned_count <= quantity)
 );
 
 CREATE TABLE employee_inventory (
@@ -41,6 +55,102 @@ CREATE TABLE employee_inventory (
   employee_id INT,
   inventory_id INT,
   assigned_date DATE,
+  returned_date DATE,               -- NULL while the item is still assigned
   FOREIGN KEY (employee_id) REFERENCES employees(id),
-  FOREIGN KEY (inventory_id) REFERENCES inventory(id)
-);
\ No newline at end of file
+  FOREIGN KEY (inventory_id) REFERENCES inventory(id),
+  INDEX idx_employee_inventory_employee (employee_id, assigned_date),
+  INDEX idx_employee_inventory_inventory (inventory_id, assigned_date),
+  INDEX idx_employee_inventory_assigned_date (assigned_date, id)
+);
+
+CREATE TABLE documents (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  employee_id INT,
+  name VARCHAR(255) NOT NULL,
+  doc_type VARCHAR(50),
+  filename VARCHAR(255),
+  content_type VARCHAR(100),
+  sha256 CHAR(64) NOT NULL,         -- content address: uploads/<aa>/<bb>/<sha256>
+  size BIGINT NOT NULL,
+  uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  owner_id INT,                     -- uploader; NULL for documents uploaded before sharing
+  INDEX idx_documents_employee_id (employee_id),
+  INDEX idx_documents_sha256 (sha256),
+  INDEX idx_documents_owner (owner_id, id),
+  FOREIGN KEY (employee_id) REFERENCES employees(id),
+  FOREIGN KEY (owner_id) REFERENCES users(id)
+);
+
+-- Document ACL (sharing.py). The primary key answers the per-download
+-- permission check; the user index serves "shared with me"
+CREATE TABLE document_shares (
+  document_id INT NOT NULL,
+  user_id INT NOT NULL,
+  permission VARCHAR(10) NOT NULL,  -- 'view' or 'edit'
+  shared_by INT,
+  shared_at DATETIME(6) NOT NULL,
+  PRIMARY KEY (document_id, user_id),
+  INDEX idx_document_shares_user (user_id, document_id),
+  FOREIGN KEY (document_id) REFERENCES documents(id) ON DELETE CASCADE,
+  FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+CREATE TABLE audit_logs (
+  id BIGINT AUTO_INCREMENT PRIMARY KEY,
+  entity_type VARCHAR(50) NOT NULL,
+  entity_id INT,
+  action VARCHAR(50) NOT NULL,
+  actor_id INT,
+  old_data JSON,
+  new_data JSON,
+  created_at DATETIME(6) NOT NULL,
+  INDEX idx_audit_logs_entity (entity_type, entity_id, created_at),
+  INDEX idx_audit_logs_created_at (created_at)
+);
+
+-- Change counters bumped by every write; per-process caches poll them to
+-- notice other workers' writes and HTTP ETags/Last-Modified derive from them
+CREATE TABLE data_versions (
+  name VARCHAR(50) PRIMARY KEY,
+  version BIGINT NOT NULL DEFAULT 0,
+  updated_at DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6)
+);
+INSERT INTO data_versions (name, version) VALUES ('employees', 0), ('inventory', 0), ('changes', 0), ('changes_pruned', 0), ('document_shares', 0);
+
+-- Change-data feed (changefeed.py): every employee, inventory and assignment
+-- write for /changes. Writers only insert; `version` is filled in after
+-- commit, without gaps, under the 'changes' counter
+CREATE TABLE change_log (
+  id BIGINT AUTO_INCREMENT PRIMARY KEY,
+  version BIGINT,
+  entity VARCHAR(20) NOT NULL,
+  entity_id INT NOT NULL,
+  action VARCHAR(20) NOT NULL,
+  data JSON,
+  changed_at DATETIME(6) NOT NULL,
+  UNIQUE KEY uq_change_log_version (version),
+  INDEX idx_change_log_entity (entity, version),
+  INDEX idx_change_log_changed_at (changed_at)
+);
+
+-- Background jobs (jobs.py): state, timings and results of submitted jobs,
+-- readable from any worker and kept across restarts
+CREATE TABLE jobs (
+  id CHAR(32) PRIMARY KEY,
+  kind VARCHAR(50) NOT NULL,
+  status VARCHAR(20) NOT NULL,
+  priority TINYINT NOT NULL DEFAULT 5,
+  owner_id INT,
+  params JSON,
+  result JSON,
+  error TEXT,
+  created_at DATETIME(6) NOT NULL,
+  deadline DATETIME(6) NOT NULL,
+  started_at DATETIME(6),
+  finished_at DATETIME(6),
+  wait_ms DOUBLE,
+  run_ms DOUBLE,
+  cancel_requested BOOLEAN NOT NULL DEFAULT FALSE,   -- set by DELETE /jobs/<id> from another worker
+  INDEX idx_jobs_owner (owner_id, created_at),
+  INDEX idx_jobs_status (status, deadline)
+);
@@ -0,0 +1,209 @@
+import heapq
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import defaultdict
+from itertools import islice
+
+# Seconds between full rebuilds, picking up writes made by other worker processes
+SEARCH_REBUILD_SECONDS = 300
+# Maximum index terms a single prefix may expand to
+MAX_PREFIX_EXPANSION = 200
+
+EMPLOYEE_FIELD_WEIGHTS = {'name': 3.0, 'email': 2.0, 'job_title': 1.5, 'department': 1.0, 'qualification': 1.0}
+DOCUMENT_FIELD_WEIGHTS = {'name': 3.0, 'filename': 2.0, 'doc_type': 1.0}
+
+_TOKEN = re.compile(r"[0-9a-z]+")
+
+
+def tokenize(text):
+    return _TOKEN.findall(str(text).lower()) if text else []
+
+
+class SearchIndex:
+    """
+    In-process inverted index over employees and document metadata with
+    prefix (typeahead) matching. Postings map each term to the documents
+    containing it and their field weight; a sorted term list answers
+    prefix lookups with a binary search. With an `executor`, periodic
+    rebuilds run in the background while searches use the current index.
+    """
+
+    def __init__(self, load_employees, load_documents, executor=None, rebuild_seconds=SEARCH_REBUILD_SECONDS):
+        self._load_employees = load_employees
+        self._load_documents = load_documents
+        self._executor = executor
+        self._rebuild_seconds = rebuild_seconds
+        self._lock = threading.RLock()
+        self._rebuild_lock = threading.Lock()
+        self._built_at = None
+        # Changes made while a rebuild is loading, replayed onto its result
+        self._pending = None
+        self._reset()
+
+    def _reset(self):
+        self._postings = defaultdict(dict)   # term -> {key: weight}
+        self._terms = []                     # sorted terms
+        self._doc_terms = {}                 # key -> terms, for removal
+        self._records = {}                   # key -> display fields
+
+    def _add(self, key, record, weights):
+        self._remove(key)
+        scores = defaultdict(float)
+        for field, weight in weights.items():
+            for term in tokenize(record.get(field)):
+                scores[term] = max(scores[term], weight)
+        for term, weight in scores.items():
+            postings = self._postings[term]
+            if not postings:
+                insort(self._terms, term)
+            postings[key] = weight
+        self._doc_terms[key] = list(scores)
+        self._records[key] = dict({field: record.get(field) for field in weights}, id=key[1])
+
+    def _remove(self, key):
+        for term in self._doc_terms.pop(key, ()):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(key, None)
+            if not postings:
+                del self._postings[term]
+                index = bisect_left(self._terms, term)
+                if index < len(self._terms) and self._terms[index] == term:
+                    del self._terms[index]
+        self._records.pop(key, None)
+
+    def _change(self, key, record, weights):
+        if record is None:
+            self._remove(key)
+        else:
+            self._add(key, record, weights)
+
+    def _write(self, key, record=None, weights=None):
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((key, record, weights))
+            self._change(key, record, weights)
+
+    def rebuild(self):
+        """
+        Rebuilds the whole index from the database, then swaps it in.
+        """
+        with self._rebuild_lock:
+            self._rebuild()
+
+    def _rebuild(self):
+        # Caller holds _rebuild_lock
+        with self._lock:
+            self._pending = []
+        try:
+            fresh = SearchIndex(self._load_employees, self._load_documents)
+            for row in self._load_employees():
+                fresh._add(('employee', row['id']), row, EMPLOYEE_FIELD_WEIGHTS)
+            for row in self._load_documents():
+                fresh._add(('document', row['id']), row, DOCUMENT_FIELD_WEIGHTS)
+        finally:
+            with self._lock:
+                pending, self._pending = self._pending, None
+        with self._lock:
+            for key, record, weights in pending:
+                fresh._change(key, record, weights)
+            self._postings, self._terms = fresh._postings, fresh._terms
+            self._doc_terms, self._records = fresh._doc_terms, fresh._records
+            self._built_at = time.monotonic()
+
+    def _rebuild_and_release(self):
+        try:
+            self._rebuild()
+        except Exception as e:
+            print(f"Search index rebuild failed: {e}")
+        finally:
+            self._rebuild_lock.release()
+
+    def _ensure_fresh(self):
+        if self._built_at is None:
+            # First search builds in the foreground, once; the others wait for it
+            with self._rebuild_lock:
+                if self._built_at is None:
+                    self._rebuild()
+        elif time.monotonic() - self._built_at > self._rebuild_seconds and self._rebuild_lock.acquire(blocking=False):
+            # The lock passes to the rebuild, so only one runs at a time
+            if self._executor is None:
+                self._rebuild_and_release()
+                return
+            try:
+                self._executor.submit(self._rebuild_and_release)
+            except RuntimeError:
+                self._rebuild_lock.release()
+                raise
+
+    def add_employee(self, row):
+        self._write(('employee', row['id']), row, EMPLOYEE_FIELD_WEIGHTS)
+
+    def add_document(self, row):
+        self._write(('document', row['id']), row, DOCUMENT_FIELD_WEIGHTS)
+
+    def remove(self, kind, id):
+        self._write((kind, id))
+
+    # Observer hook: keeps employees current from EmployeeList change events
+    def update(self, event):
+        if getattr(event, 'entity', None) != 'employee':
+            return
+        if event.action == 'deleted':
+            self.remove('employee', event.entity_id)
+        elif event.new is not None:
+            self.add_employee(event.new)
+
+    def _matches(self, token, prefix=True):
+        """
+        Returns {key: score} for one query token: exact term matches score
+        their full weight, prefix matches (when `prefix`) half of it.
+        """
+        if not prefix:
+            return dict(self._postings.get(token, {}))
+        matches = {}
+        start = bisect_left(self._terms, token)
+        for term in self._terms[start:start + MAX_PREFIX_EXPANSION]:
+            if not term.startswith(token):
+                break
+            factor = 1.0 if term == token else 0.5
+            for key, weight in self._postings[term].items():
+                score = weight * factor
+                if score > matches.get(key, 0.0):
+                    matches[key] = score
+        return matches
+
+    def search(self, query, kind=None, limit=20, include=None):
+        """
+        Returns up to `limit` (score, kind, record) results containing every
+        query token (the last may be a prefix), best matches first.
+        `include(kind, id)`, if given, drops results the caller may not see
+        before the limit is applied; it runs outside the index lock.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        self._ensure_fresh()
+
+        with self._lock:
+            scores = None
+            # Earlier tokens are complete words; only the one being typed is a prefix
+            for index, token in enumerate(tokens):
+                matches = self._matches(token, prefix=index == len(tokens) - 1)
+                if scores is None:
+                    scores = matches
+                else:
+                    scores = {key: score + matches[key] for key, score in scores.items() if key in matches}
+                if not scores:
+                    return []
+            if kind:
+                scores = {key: score for key, score in scores.items() if key[0] == kind}
+            order = lambda item: (-item[1], item[0])
+            ranked = heapq.nsmallest(limit, scores.items(), key=order) if include is None else sorted(scores.items(), key=order)
+            results = [(round(score, 3), key[0], self._records[key]) for key, score in ranked]
+        if include is not None:
+            results = list(islice((result for result in results if include(result[1], result[2]['id'])), limit))
+        return results
@@ -0,0 +1,70 @@
+"""
+Production entry point. Serves the app with a multi-threaded, optionally
+multi-process server instead of Flask's development server.
+
+    python serve.py                                   # waitress, SERVER_THREADS threads
+    python serve.py --server gunicorn --workers 4     # gunicorn, 4 processes x SERVER_THREADS threads
+    uvicorn serve:asgi_application --workers 4        # any ASGI server
+
+`application` is the WSGI callable for external servers
+(e.g. `gunicorn -w 4 --threads 8 serve:application`). With gunicorn,
+serve.py preloads the app in the master so workers fork from it.
+"""
+import argparse
+
+from config import Config
+from app import app, preload
+
+application = app
+
+
+def __getattr__(name):
+    # Built on first use so WSGI deployments do not need asgiref installed
+    if name == 'asgi_application':
+        from asgiref.wsgi import WsgiToAsgi
+        return WsgiToAsgi(app)
+    raise AttributeError(name)
+
+
+def serve_waitress(host, port, threads):
+    from waitress import serve
+
+    serve(app, host=host, port=port, threads=threads)
+
+
+def serve_gunicorn(host, port, workers, threads):
+    from gunicorn.app.base import BaseApplication
+
+    class StandaloneApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', f"{host}:{port}")
+            self.cfg.set('workers', workers)
+            self.cfg.set('threads', threads)
+            self.cfg.set('worker_class', 'gthread')
+            # Import and compile once in the master; services are still built per worker
+            self.cfg.set('preload_app', True)
+
+        def load(self):
+            preload(app)
+            return app
+
+    StandaloneApplication().run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--server', choices=('waitress', 'gunicorn'), default=Config.SERVER)
+    parser.add_argument('--host', default=Config.SERVER_HOST)
+    parser.add_argument('--port', type=int, default=Config.SERVER_PORT)
+    parser.add_argument('--workers', type=int, default=Config.SERVER_WORKERS, help='processes (gunicorn only)')
+    parser.add_argument('--threads', type=int, default=Config.SERVER_THREADS, help='request threads per process')
+    args = parser.parse_args()
+
+    if args.server == 'gunicorn':
+        serve_gunicorn(args.host, args.port, args.workers, args.threads)
+    else:
+        serve_waitress(args.host, args.port, args.threads)
+
+
+if __name__ == '__main__':
+    main()
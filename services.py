@@ -0,0 +1,302 @@
+"""
+Shared application state: repositories, caches, indexes, the event bus and
+the background executor.
+
+Everything here is built on first use in each process by get_services()
+and rebuilt after a fork, so a master process that preloads the app (e.g.
+gunicorn --preload) never hands threads, locks or connections to its
+workers. Views use the module-level proxies (employee_list,
+dashboard_cache, ...), which resolve to the current process's instance.
+"""
+import atexit
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.local import LocalProxy
+
+from analytics import WorkforceAnalytics
+from auth import RateLimiter, PasswordHasher
+from bulk import import_employees, iter_records
+from cache import LRUCache, RecordCache
+from changefeed import ChangeFeed
+from charts import DepartmentChartCache
+from config import Config
+from dashboard import DashboardCache
+from database import db_connection, run_transaction
+from documents import DocumentStore
+from employees import EmployeeFactory, EmployeeList, EmployeeLogger, read_employee_version
+from events import EventBus, AuditLogSink
+from inventory import InventoryStock
+from jobs import JobQueue, PROCESS
+from metrics import metrics
+from reports import REPORTS, REPORT_COLUMNS, REPORT_CACHE_TTL, load_columns
+from search import SearchIndex
+from sharing import DocumentPermissions
+from versions import DataVersions
+
+
+# Data version counters behind the ETag/Last-Modified of read-only pages
+def read_data_versions():
+    with db_connection() as conn, conn.cursor(prepared=True) as cursor:
+        cursor.execute("SELECT name, version, updated_at FROM data_versions")
+        return cursor.fetchall()
+
+
+# Materialized HR aggregates, maintained from employee events
+def load_analytics_rows():
+    with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+        cursor.execute("SELECT id, department, status, date_of_joining, salary FROM employees")
+        return cursor.fetchall()
+
+
+# Full-text search over employees and document metadata. Employee writes
+# reach the index through EmployeeList notifications; other workers' writes
+# are picked up by the periodic rebuild.
+def load_search_employees():
+    with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+        cursor.execute("SELECT id, name, email, job_title, department, qualification FROM employees")
+        return cursor.fetchall()
+
+
+def load_search_documents():
+    with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+        cursor.execute("SELECT id, name, doc_type, filename FROM documents")
+        return cursor.fetchall()
+
+
+# Workforce report by name; the columns and each computed report are cached
+# until the next employee write. Also the 'report' job.
+def get_report(name):
+    if name not in REPORTS:
+        raise ValueError(f"Unknown report {name!r}.")
+    services = get_services()
+    columns = services.report_cache.get_or_load('columns', lambda: load_columns(services.employee_list.iter_employees(REPORT_COLUMNS)))
+    return services.report_cache.get_or_load(('report', name), lambda: REPORTS[name](columns))
+
+
+# Background job kinds. Module-level so a process pool can import them.
+def chart_job(fmt='png'):
+    fingerprint, _ = get_services().department_chart.image(fmt)
+    return {'format': fmt, 'fingerprint': fingerprint}
+
+
+def import_employees_job(path, format):
+    services = get_services()
+    with open(path, 'rb') as stream:
+        return import_employees(iter_records(stream, format), services.employee_factory, services.employee_list.add_employees)
+
+
+# Uploads spooled for import_employees jobs, deleted when the job ends however it ends
+IMPORT_SPOOL_PREFIX = 'import-'
+
+
+def remove_spooled_upload(path, format=None):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def sweep_spooled_uploads(max_age):
+    """
+    Deletes spooled uploads older than `max_age` seconds. Their jobs have
+    timed out by then, so these were left behind by a worker that stopped
+    before the job ended. Run at start-up.
+    """
+    spool_dir = tempfile.gettempdir()
+    cutoff = time.time() - max_age
+    removed = 0
+    for entry in os.scandir(spool_dir):
+        if entry.name.startswith(IMPORT_SPOOL_PREFIX) and entry.is_file():
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+            except FileNotFoundError:
+                pass
+    if removed:
+        print(f"Removed {removed} abandoned import uploads from {spool_dir}")
+    return removed
+
+
+class Services:
+    """
+    The per-process object graph. Constructing it opens no connections and
+    starts no threads; those happen on first use.
+    """
+
+    def __init__(self, config=Config):
+        self.pid = os.getpid()
+
+        # Thread pool executor for multithreading
+        self.executor = ThreadPoolExecutor(max_workers=config.EXECUTOR_WORKERS)
+
+        self.data_versions = DataVersions(read_data_versions)
+
+        # Optional server-side cache of rendered pages, keyed by their ETag
+        self.page_cache = LRUCache(maxsize=config.PAGE_CACHE_SIZE) if config.PAGE_CACHE_ENABLED else None
+
+        # Event bus delivering employee change events to slow observers off the request path
+        self.event_bus = EventBus(workers=config.EVENT_WORKERS,
+                                  maxsize=config.EVENT_QUEUE_SIZE,
+                                  batch_size=config.EVENT_BATCH_SIZE,
+                                  policy=config.EVENT_POLICY,
+                                  spill_path=config.EVENT_SPILL_PATH)
+
+        # Employee records by id; other workers' writes are seen after the TTL,
+        # or within a poll interval when the shared version counter is enabled
+        self.employee_cache = RecordCache(config.EMPLOYEE_CACHE_SIZE, ttl=config.EMPLOYEE_CACHE_TTL,
+                                          read_version=read_employee_version if config.EMPLOYEE_CACHE_SHARED_VERSION else None,
+                                          poll_seconds=config.EMPLOYEE_CACHE_POLL_SECONDS)
+        self.employee_list = EmployeeList(self.event_bus, self.employee_cache)
+        self.employee_list.register_observer(self.data_versions)
+        self.employee_factory = EmployeeFactory()
+        self.employee_list.register_observer(EmployeeLogger(), asynchronous=True)
+        self.employee_list.register_observer(AuditLogSink(run_transaction), asynchronous=True)
+
+        self.workforce_analytics = WorkforceAnalytics(load_analytics_rows, self.executor)
+        self.employee_list.register_observer(self.workforce_analytics)
+
+        # Department headcount chart, invalidated by employee writes and analytics reconciliations
+        self.department_chart = DepartmentChartCache(lambda: self.workforce_analytics.view('department_headcount'), self.executor)
+        self.employee_list.register_observer(self.department_chart)
+        self.workforce_analytics.register_observer(self.department_chart)
+
+        # Dashboard summary shared by the home page, /dashboard_data and /statistics
+        self.dashboard_cache = DashboardCache(self.employee_list.get_dashboard_summary)
+        self.employee_list.register_observer(self.dashboard_cache)
+
+        # Workforce reports computed with NumPy over column arrays (see get_report)
+        self.report_cache = LRUCache(maxsize=16, ttl=REPORT_CACHE_TTL)
+        self.employee_list.register_observer(self.report_cache)
+
+        # Authentication: hashing runs on its own bounded pool and login attempts
+        # are rate limited per client IP and per account
+        self.password_hasher = PasswordHasher(config.PASSWORD_HASH_METHOD, config.PASSWORD_HASH_WORKERS, config.PASSWORD_HASH_QUEUE)
+        self.login_ip_limiter = RateLimiter(*config.LOGIN_RATE_PER_IP)
+        self.login_account_limiter = RateLimiter(*config.LOGIN_RATE_PER_ACCOUNT)
+
+        # Logged in users by id, for templates and handlers that need more than the id
+        self.user_cache = LRUCache(maxsize=1024, ttl=config.USER_CACHE_TTL)
+
+        # Stock accounting for inventory assignments
+        self.inventory_stock = InventoryStock(run_transaction)
+
+        # Assignment list pages, dropped whenever assignments or employees change
+        self.assignment_cache = LRUCache(maxsize=256, ttl=60)
+        self.inventory_stock.register_observer(self.assignment_cache)
+        self.inventory_stock.register_observer(self.data_versions)
+        self.employee_list.register_observer(self.assignment_cache)
+
+        # Content-addressed document store rooted in the upload folder
+        self.document_store = DocumentStore(config.UPLOAD_FOLDER, config.MAX_UPLOAD_SIZE)
+
+        # Document ACL checked on every download, cached per (user, document);
+        # cleared when the shared 'document_shares' version moves
+        self.document_acl_cache = RecordCache(config.DOCUMENT_ACL_CACHE_SIZE, ttl=config.DOCUMENT_ACL_CACHE_TTL,
+                                              read_version=lambda: self.data_versions.get('document_shares')[0][0],
+                                              poll_seconds=config.DOCUMENT_ACL_POLL_SECONDS)
+        self.document_permissions = DocumentPermissions(run_transaction, self.document_acl_cache)
+        self.document_permissions.register_observer(self.data_versions)
+
+        self.search_index = SearchIndex(load_search_employees, load_search_documents, executor=self.executor)
+        self.employee_list.register_observer(self.search_index)
+
+        # Slow operations submitted and polled through /jobs
+        self.jobs = JobQueue(run_transaction, self.executor, maxsize=config.JOB_QUEUE_SIZE,
+                             concurrency=config.JOB_CONCURRENCY, process_workers=config.JOB_PROCESS_WORKERS)
+        self.jobs.register('report', get_report, backend=PROCESS, timeout=config.JOB_TIMEOUT)
+        self.jobs.register('chart', chart_job, timeout=config.JOB_TIMEOUT)
+        self.jobs.register('import_employees', import_employees_job, timeout=config.JOB_TIMEOUT, public=False,
+                           cleanup=remove_spooled_upload)
+
+        # Delta sync for mirrors; long-polls wake on local writes and share one
+        # sequencing pass per interval for other workers'
+        self.change_feed = ChangeFeed(run_transaction, max_waiters=config.CHANGE_FEED_MAX_WAITERS)
+        self.employee_list.register_observer(self.change_feed)
+        self.inventory_stock.register_observer(self.change_feed)
+
+    def close(self):
+        self.event_bus.close()
+        self.password_hasher.shutdown()
+        self.jobs.shutdown()
+        self.executor.shutdown(wait=False)
+
+
+_services = None
+_services_lock = threading.Lock()
+
+
+def get_services():
+    """
+    Returns this process's Services, building it on first use.
+    """
+    services = _services
+    if services is None:
+        services = _build_services()
+    return services
+
+
+def _build_services():
+    global _services
+    with _services_lock:
+        if _services is None:
+            _services = Services()
+        return _services
+
+
+def _reset_after_fork():
+    # The parent's instance (if it built one) is left alone: its threads do
+    # not exist in the child and its locks may be held
+    global _services, _services_lock
+    _services = None
+    _services_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+@atexit.register
+def _close_services():
+    if _services is not None and _services.pid == os.getpid():
+        _services.close()
+
+
+metrics.gauges.register(lambda: {f"db_pool_{key}": value for key, value in Config.get_pool().stats().items()})
+metrics.gauges.register(lambda: {'executor_queue_depth': get_services().executor._work_queue.qsize()})
+metrics.gauges.register(lambda: {f"event_bus_{key}": value for key, value in get_services().event_bus.stats().items()})
+metrics.gauges.register(lambda: {f"employee_cache_{key}": value for key, value in get_services().employee_cache.stats().items()})
+metrics.gauges.register(lambda: {f"jobs_{key}": value for key, value in get_services().jobs.stats().items()})
+metrics.gauges.register(lambda: {f"document_acl_cache_{key}": value for key, value in get_services().document_acl_cache.stats().items()})
+metrics.gauges.register(lambda: {f"change_feed_{key}": value for key, value in get_services().change_feed.stats().items()})
+
+
+def _proxy(name):
+    return LocalProxy(lambda: getattr(get_services(), name))
+
+
+executor = _proxy('executor')
+data_versions = _proxy('data_versions')
+page_cache = _proxy('page_cache')
+employee_list = _proxy('employee_list')
+employee_factory = _proxy('employee_factory')
+workforce_analytics = _proxy('workforce_analytics')
+department_chart = _proxy('department_chart')
+dashboard_cache = _proxy('dashboard_cache')
+report_cache = _proxy('report_cache')
+password_hasher = _proxy('password_hasher')
+login_ip_limiter = _proxy('login_ip_limiter')
+login_account_limiter = _proxy('login_account_limiter')
+user_cache = _proxy('user_cache')
+inventory_stock = _proxy('inventory_stock')
+assignment_cache = _proxy('assignment_cache')
+document_store = _proxy('document_store')
+document_acl_cache = _proxy('document_acl_cache')
+document_permissions = _proxy('document_permissions')
+search_index = _proxy('search_index')
+jobs = _proxy('jobs')
+change_feed = _proxy('change_feed')
@@ -0,0 +1,235 @@
+from datetime import datetime, timezone
+
+from events import to_json
+from versions import bump_data_version
+
+# Permission levels, weakest first. Owners (the uploader) hold every right;
+# documents uploaded before sharing existed have no owner and stay editable
+# by every signed-in user.
+VIEW = 'view'
+EDIT = 'edit'
+OWNER = 'owner'
+SHARE_PERMISSIONS = (VIEW, EDIT)
+_RANK = {VIEW: 1, EDIT: 2, OWNER: 3}
+
+
+# Custom exception for sharing operations
+class SharingException(Exception):
+    pass
+
+
+# Raised when a document does not exist; never cached, so new uploads are seen at once
+class DocumentNotFound(SharingException):
+    pass
+
+
+def allows(permission, required):
+    return permission is not None and _RANK[permission] >= _RANK[required]
+
+
+class DocumentPermissions:
+    """
+    Document ACLs backed by document_shares. permission() runs on every
+    download, so answers (including "no access") are cached per
+    (user, document). Share changes drop the affected entries in this
+    process and, after commit, bump the 'document_shares' version, which
+    the cache polls to clear itself after other workers' changes.
+    """
+
+    def __init__(self, run_transaction, cache):
+        self._run_transaction = run_transaction
+        self._cache = cache
+        self._observers = []
+
+    # Observers are notified after every committed share change
+    def register_observer(self, observer):
+        self._observers.append(observer)
+
+    def _notify(self, message):
+        for observer in self._observers:
+            observer.update(message)
+
+    def permission(self, user_id, document_id):
+        """
+        Returns OWNER, EDIT, VIEW or None for a user on a document.
+        Raises DocumentNotFound for unknown documents.
+        """
+        return self._cache.get_or_load((user_id, document_id), lambda: self._load(user_id, document_id))
+
+    def _load(self, user_id, document_id):
+        # One primary key lookup on each table
+        def work(cursor):
+            cursor.execute("""
+                SELECT d.owner_id, s.permission
+                FROM documents d
+                LEFT JOIN document_shares s ON s.document_id = d.id AND s.user_id = %s
+                WHERE d.id = %s
+            """, (user_id, document_id))
+            return cursor.fetchone()
+
+        row = self._run_transaction(work)
+        if not row:
+            raise DocumentNotFound(f"Document {document_id} not found.")
+        owner_id, permission = row
+        if owner_id is None:
+            return EDIT
+        if owner_id == user_id:
+            return OWNER
+        return permission
+
+    def can(self, user_id, document_id, required):
+        return allows(self.permission(user_id, document_id), required)
+
+    # Every sharer needs EDIT on every document, checked against the locked rows
+    @staticmethod
+    def _check_sharer(cursor, document_ids, actor):
+        cursor.execute(f"""
+            SELECT d.id, d.owner_id, s.permission
+            FROM documents d
+            LEFT JOIN document_shares s ON s.document_id = d.id AND s.user_id = %s
+            WHERE d.id IN ({', '.join(['%s'] * len(document_ids))})
+            ORDER BY d.id
+            FOR UPDATE
+        """, (actor,) + tuple(document_ids))
+        rows = cursor.fetchall()
+        found = {row[0] for row in rows}
+        missing = [id for id in document_ids if id not in found]
+        if missing:
+            raise DocumentNotFound(f"Document {missing[0]} not found.")
+        for id, owner_id, permission in rows:
+            if owner_id is not None and owner_id != actor and permission != EDIT:
+                raise SharingException(f"You cannot change sharing of document {id}.")
+
+    @staticmethod
+    def _audit(cursor, action, document_ids, user_ids, actor, permission=None):
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        data = to_json({'user_ids': user_ids, 'permission': permission} if permission else {'user_ids': user_ids})
+        cursor.executemany("""
+            INSERT INTO audit_logs (entity_type, entity_id, action, actor_id, old_data, new_data, created_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """, [('document', document_id, action, actor, None, data, now) for document_id in document_ids])
+
+    def _invalidate(self, document_ids, user_ids):
+        for document_id in document_ids:
+            for user_id in user_ids:
+                self._cache.invalidate((user_id, document_id))
+
+    def share(self, document_ids, user_ids, permission, actor):
+        """
+        Grants `permission` on every document to every user in a single
+        transaction, replacing any permission they had. Either every share
+        is made or, if the actor may not share one of the documents, none.
+        Returns the number of shares written.
+        """
+        if permission not in SHARE_PERMISSIONS:
+            raise SharingException(f"Permission must be one of: {', '.join(SHARE_PERMISSIONS)}.")
+        document_ids = sorted(set(document_ids))
+        user_ids = sorted(set(user_ids) - {actor})
+        if not document_ids or not user_ids:
+            raise SharingException("Select at least one document and one recipient.")
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        rows = [(document_id, user_id, permission, actor, now) for document_id in document_ids for user_id in user_ids]
+
+        def work(cursor):
+            # Documents are locked in id order so concurrent bulk changes cannot deadlock
+            self._check_sharer(cursor, document_ids, actor)
+            cursor.executemany("""
+                INSERT INTO document_shares (document_id, user_id, permission, shared_by, shared_at)
+                VALUES (%s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE permission = VALUES(permission), shared_by = VALUES(shared_by), shared_at = VALUES(shared_at)
+            """, rows)
+            self._audit(cursor, 'shared', document_ids, user_ids, actor, permission)
+
+        self._run_transaction(work)
+        bump_data_version(self._run_transaction, 'document_shares')
+        self._invalidate(document_ids, user_ids)
+        self._notify(f"Shared {len(document_ids)} documents with {len(user_ids)} users")
+        return len(rows)
+
+    def revoke(self, document_ids, user_ids, actor):
+        """
+        Removes every listed user's share of every listed document in a
+        single transaction. Returns the number of shares removed.
+        """
+        document_ids = sorted(set(document_ids))
+        user_ids = sorted(set(user_ids))
+        if not document_ids or not user_ids:
+            raise SharingException("Select at least one document and one recipient.")
+
+        def work(cursor):
+            self._check_sharer(cursor, document_ids, actor)
+            cursor.execute(f"""
+                DELETE FROM document_shares
+                WHERE document_id IN ({', '.join(['%s'] * len(document_ids))})
+                  AND user_id IN ({', '.join(['%s'] * len(user_ids))})
+            """, tuple(document_ids) + tuple(user_ids))
+            removed = cursor.rowcount
+            if removed:
+                self._audit(cursor, 'revoked', document_ids, user_ids, actor)
+            return removed
+
+        removed = self._run_transaction(work)
+        if removed:
+            bump_data_version(self._run_transaction, 'document_shares')
+            self._invalidate(document_ids, user_ids)
+            self._notify(f"Revoked {removed} document shares")
+        return removed
+
+    def shareable_documents(self, user_id):
+        """
+        Returns id and name of the documents the user may share.
+        """
+        def work(cursor):
+            cursor.execute("""
+                SELECT d.id, d.name
+                FROM documents d
+                LEFT JOIN document_shares s ON s.document_id = d.id AND s.user_id = %s
+                WHERE d.owner_id = %s OR d.owner_id IS NULL OR s.permission = %s
+                ORDER BY d.id DESC
+            """, (user_id, user_id, EDIT))
+            return cursor.fetchall()
+
+        return self._run_transaction(work, dictionary=True)
+
+    def list_shares(self, user_id, limit=200):
+        """
+        Returns (granted, received): shares on the user's own documents and
+        shares other users granted to them, newest first.
+        """
+        columns = """
+            SELECT s.document_id, d.name AS document_name, s.user_id, u.name AS user_name,
+                   s.permission, s.shared_by, s.shared_at
+            FROM document_shares s
+            JOIN documents d ON d.id = s.document_id
+            JOIN users u ON u.id = s.user_id
+        """
+
+        def work(cursor):
+            cursor.execute(f"{columns} WHERE d.owner_id = %s ORDER BY s.shared_at DESC LIMIT %s", (user_id, limit))
+            granted = cursor.fetchall()
+            cursor.execute(f"{columns} WHERE s.user_id = %s ORDER BY s.shared_at DESC LIMIT %s", (user_id, limit))
+            return granted, cursor.fetchall()
+
+        return self._run_transaction(work, dictionary=True)
+
+    def overview(self, limit=100):
+        """
+        Per-document sharing summary for the compliance page: owner, how many
+        users can view or edit it and when it was last shared.
+        """
+        def work(cursor):
+            cursor.execute("""
+                SELECT d.id, d.name, d.doc_type, u.name AS owner_name,
+                       COUNT(s.user_id) AS shared_with,
+                       COALESCE(SUM(CASE WHEN s.permission = %s THEN 1 ELSE 0 END), 0) AS editors,
+                       MAX(s.shared_at) AS last_shared_at
+                FROM documents d
+                LEFT JOIN users u ON u.id = d.owner_id
+                LEFT JOIN document_shares s ON s.document_id = d.id
+                GROUP BY d.id, d.name, d.doc_type, u.name
+                ORDER BY d.id DESC
+                LIMIT %s
+            """, (EDIT, limit))
+            return cursor.fetchall()
+
+        return self._run_transaction(work, dictionary=True)
@@ -0,0 +1,340 @@
+"""
+Embedded SQLite storage backend (WAL mode), for small sites and test or
+benchmark environments without a database server. Connections mimic the
+subset of the mysql.connector API the app uses, statements are translated
+from the MySQL dialect the app writes (%s placeholders, FOR UPDATE, ON
+DUPLICATE KEY UPDATE, parenthesized UNION members, DATE_FORMAT/CURDATE/...)
+and SQLite errors are raised as storage errors with the matching MySQL
+error numbers, so retry and duplicate-key handling work unchanged.
+"""
+import re
+import sqlite3
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+
+import storage
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  name TEXT NOT NULL,
+  email TEXT NOT NULL UNIQUE,
+  password TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS employees (
+  id INTEGER PRIMARY KEY,
+  name TEXT NOT NULL,
+  email TEXT NOT NULL,
+  year_of_birth INTEGER,
+  qualification TEXT,
+  salary REAL,
+  job_title TEXT,
+  date_of_joining DATE,
+  department TEXT,
+  status TEXT,
+  version INTEGER NOT NULL DEFAULT 0,
+  joining_month_day INTEGER AS (CAST(strftime('%m', date_of_joining) AS INTEGER) * 100 + CAST(strftime('%d', date_of_joining) AS INTEGER)) STORED
+);
+CREATE INDEX IF NOT EXISTS idx_employees_name ON employees (name, id);
+CREATE INDEX IF NOT EXISTS idx_employees_department ON employees (department, id);
+CREATE INDEX IF NOT EXISTS idx_employees_status ON employees (status, id);
+CREATE INDEX IF NOT EXISTS idx_employees_job_title ON employees (job_title, id);
+CREATE INDEX IF NOT EXISTS idx_employees_date_of_joining ON employees (date_of_joining);
+CREATE INDEX IF NOT EXISTS idx_employees_joining_month_day ON employees (joining_month_day);
+CREATE TABLE IF NOT EXISTS inventory (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  name TEXT NOT NULL,
+  quantity INTEGER NOT NULL,
+  assigned_count INTEGER NOT NULL DEFAULT 0,
+  description TEXT
+);
+CREATE TABLE IF NOT EXISTS employee_inventory (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  employee_id INTEGER REFERENCES employees(id),
+  inventory_id INTEGER REFERENCES inventory(id),
+  assigned_date DATE,
+  returned_date DATE
+);
+CREATE INDEX IF NOT EXISTS idx_employee_inventory_employee ON employee_inventory (employee_id, assigned_date);
+CREATE INDEX IF NOT EXISTS idx_employee_inventory_inventory ON employee_inventory (inventory_id, assigned_date);
+CREATE INDEX IF NOT EXISTS idx_employee_inventory_assigned_date ON employee_inventory (assigned_date, id);
+CREATE TABLE IF NOT EXISTS documents (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  employee_id INTEGER REFERENCES employees(id),
+  name TEXT NOT NULL,
+  doc_type TEXT,
+  filename TEXT,
+  content_type TEXT,
+  sha256 TEXT NOT NULL,
+  size INTEGER NOT NULL,
+  uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  owner_id INTEGER REFERENCES users(id)
+);
+CREATE INDEX IF NOT EXISTS idx_documents_employee_id ON documents (employee_id);
+CREATE INDEX IF NOT EXISTS idx_documents_sha256 ON documents (sha256);
+CREATE INDEX IF NOT EXISTS idx_documents_owner ON documents (owner_id, id);
+CREATE TABLE IF NOT EXISTS document_shares (
+  document_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+  user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  permission TEXT NOT NULL,
+  shared_by INTEGER,
+  shared_at TIMESTAMP NOT NULL,
+  PRIMARY KEY (document_id, user_id)
+);
+CREATE INDEX IF NOT EXISTS idx_document_shares_user ON document_shares (user_id, document_id);
+CREATE TABLE IF NOT EXISTS audit_logs (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  entity_type TEXT NOT NULL,
+  entity_id INTEGER,
+  action TEXT NOT NULL,
+  actor_id INTEGER,
+  old_data TEXT,
+  new_data TEXT,
+  created_at TIMESTAMP NOT NULL
+);
+CREATE TABLE IF NOT EXISTS data_versions (
+  name TEXT PRIMARY KEY,
+  version INTEGER NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+INSERT OR IGNORE INTO data_versions (name, version) VALUES ('employees', 0), ('inventory', 0), ('changes', 0), ('changes_pruned', 0), ('document_shares', 0);
+CREATE TABLE IF NOT EXISTS change_log (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  version INTEGER UNIQUE,
+  entity TEXT NOT NULL,
+  entity_id INTEGER NOT NULL,
+  action TEXT NOT NULL,
+  data TEXT,
+  changed_at TIMESTAMP NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_change_log_entity ON change_log (entity, version);
+CREATE INDEX IF NOT EXISTS idx_change_log_changed_at ON change_log (changed_at);
+CREATE TABLE IF NOT EXISTS jobs (
+  id TEXT PRIMARY KEY,
+  kind TEXT NOT NULL,
+  status TEXT NOT NULL,
+  priority INTEGER NOT NULL DEFAULT 5,
+  owner_id INTEGER,
+  params TEXT,
+  result TEXT,
+  error TEXT,
+  created_at TIMESTAMP NOT NULL,
+  deadline TIMESTAMP NOT NULL,
+  started_at TIMESTAMP,
+  finished_at TIMESTAMP,
+  wait_ms REAL,
+  run_ms REAL,
+  cancel_requested INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_owner ON jobs (owner_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, deadline);
+"""
+
+_MYSQL_DATE_FORMATS = {'%Y': '%Y', '%m': '%m', '%d': '%d', '%H': '%H', '%i': '%M', '%s': '%S'}
+
+_UNION_MEMBER = re.compile(r"(^|UNION ALL)\s*\(\s*SELECT", re.IGNORECASE)
+_FOR_UPDATE = re.compile(r"\s+FOR\s+UPDATE\b", re.IGNORECASE)
+_ON_DUPLICATE = re.compile(r"ON\s+DUPLICATE\s+KEY\s+UPDATE", re.IGNORECASE)
+_VALUES_REF = re.compile(r"VALUES\((\w+)\)", re.IGNORECASE)
+_INSERT_TABLE = re.compile(r"INSERT\s+INTO\s+(\w+)", re.IGNORECASE)
+
+# ON DUPLICATE KEY targets for tables whose primary key is not `id`
+_CONFLICT_TARGETS = {'document_shares': 'document_id, user_id'}
+
+
+@lru_cache(maxsize=512)
+def translate(sql):
+    """
+    Rewrites a MySQL statement into the SQLite dialect.
+    """
+    sql = sql.strip()
+    sql = _FOR_UPDATE.sub('', sql)
+    if sql.startswith('('):
+        sql = _UNION_MEMBER.sub(r"\1 SELECT * FROM (SELECT", sql)
+    match = _ON_DUPLICATE.search(sql)
+    if match:
+        head, tail = sql[:match.start()], sql[match.end():]
+        table = _INSERT_TABLE.search(head)
+        target = _CONFLICT_TARGETS.get(table.group(1), 'id') if table else 'id'
+        sql = head + f"ON CONFLICT({target}) DO UPDATE SET" + _VALUES_REF.sub(r"excluded.\1", tail)
+    # '%s' placeholders; DATE_FORMAT patterns use other letters
+    return sql.replace('%s', '?')
+
+
+@lru_cache(maxsize=512)
+def takes_lock(sql):
+    """
+    True for a locking read (SELECT ... FOR UPDATE).
+    """
+    return _FOR_UPDATE.search(sql) is not None
+
+
+def _date_format(value, fmt):
+    if value is None:
+        return None
+    for mysql_code, sqlite_code in _MYSQL_DATE_FORMATS.items():
+        fmt = fmt.replace(mysql_code, sqlite_code)
+    parsed = value if isinstance(value, (date, datetime)) else datetime.fromisoformat(str(value))
+    return parsed.strftime(fmt)
+
+
+def _date_part(index):
+    def part(value):
+        if value is None:
+            return None
+        return int(str(value)[:10].split('-')[index])
+    return part
+
+
+# MySQL error numbers reported for SQLite failures
+_ER_DUP_ENTRY = 1062
+_ER_NO_REFERENCED_ROW = 1452
+_ER_LOCK_WAIT_TIMEOUT = 1205
+_ER_LOCK_DEADLOCK = 1213
+
+
+def _storage_error(e):
+    message = str(e)
+    if isinstance(e, sqlite3.IntegrityError):
+        errno = _ER_NO_REFERENCED_ROW if 'FOREIGN KEY' in message else _ER_DUP_ENTRY
+        return storage.IntegrityError(message, errno=errno)
+    if isinstance(e, sqlite3.OperationalError):
+        errno = None
+        if 'locked' in message or 'busy' in message:
+            # A deferred transaction that cannot upgrade to a write lock must restart, like a deadlock
+            errno = _ER_LOCK_DEADLOCK if 'snapshot' in message else _ER_LOCK_WAIT_TIMEOUT
+        return storage.OperationalError(message, errno=errno)
+    return storage.Error(message)
+
+
+def _adapt(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+class CompatCursor:
+    def __init__(self, conn, dictionary=False):
+        self._cursor = conn.cursor()
+        self._dictionary = dictionary
+
+    def _params(self, params):
+        return tuple(_adapt(value) for value in params or ())
+
+    def execute(self, operation, params=None):
+        try:
+            # SQLite has no row locks: a locking read outside a transaction
+            # takes the database write lock instead, held until commit
+            if takes_lock(operation) and not self._cursor.connection.in_transaction:
+                self._cursor.execute("BEGIN IMMEDIATE")
+            self._cursor.execute(translate(operation), self._params(params))
+        except sqlite3.Error as e:
+            raise _storage_error(e) from e
+
+    def executemany(self, operation, seq_params):
+        try:
+            self._cursor.executemany(translate(operation), [self._params(params) for params in seq_params])
+        except sqlite3.Error as e:
+            raise _storage_error(e) from e
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return dict(zip([column[0] for column in self._cursor.description], row))
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size=1):
+        return [self._row(row) for row in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    # Steps through the result lazily, so streaming readers (exports, loaders) stay streaming
+    def __iter__(self):
+        columns = [column[0] for column in self._cursor.description] if self._dictionary and self._cursor.description else None
+        try:
+            for row in self._cursor:
+                yield dict(zip(columns, row)) if columns else row
+        except sqlite3.Error as e:
+            raise _storage_error(e) from e
+
+    def close(self):
+        self._cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CompatConnection:
+    def __init__(self, path, timeout=30.0):
+        # sqlite3 keeps compiled statements per connection, so repeated queries are not reparsed
+        self._conn = sqlite3.connect(path, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False,
+                                     timeout=timeout, cached_statements=256)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.create_function('DATE_FORMAT', 2, _date_format, deterministic=True)
+        self._conn.create_function('CURDATE', 0, lambda: date.today().isoformat())
+        self._conn.create_function('NOW', 0, lambda: datetime.now().isoformat(' '))
+        self._conn.create_function('YEAR', 1, _date_part(0), deterministic=True)
+        self._conn.create_function('MONTH', 1, _date_part(1), deterministic=True)
+        self._conn.create_function('DAYOFMONTH', 1, _date_part(2), deterministic=True)
+
+    # `prepared` is accepted for API compatibility; every statement is cached
+    def cursor(self, dictionary=False, prepared=False, **kwargs):
+        return CompatCursor(self._conn, dictionary)
+
+    @property
+    def in_transaction(self):
+        return self._conn.in_transaction
+
+    def commit(self):
+        try:
+            self._conn.commit()
+        except sqlite3.Error as e:
+            raise _storage_error(e) from e
+
+    def rollback(self):
+        try:
+            self._conn.rollback()
+        except sqlite3.Error as e:
+            raise _storage_error(e) from e
+
+    def ping(self, reconnect=False):
+        pass
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        self._conn.close()
+
+
+def create_schema(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.close()
+
+
+def connect(path, timeout=30.0):
+    try:
+        return CompatConnection(path, timeout)
+    except sqlite3.Error as e:
+        raise _storage_error(e) from e
@@ -0,0 +1,249 @@
+"""
+Storage backends. Each one opens connections that speak the subset of the
+mysql.connector API the app uses (cursor(dictionary=..., prepared=...),
+commit, rollback, ping), so EmployeeList, InventoryStock and the routes
+run unchanged on either:
+
+- MySQLStorage: a MySQL server through mysql.connector. Cursors opened
+  with prepared=True reuse one server-side prepared statement per SQL
+  text for the lifetime of the pooled connection.
+- SQLiteStorage: an embedded SQLite database file in WAL mode
+  (see sqlite_backend.py).
+
+Drivers are imported on first connect. Both backends raise the errors
+defined here (storage.Error and its subclasses, carrying MySQL error
+numbers), so `except storage.Error` never needs a driver installed.
+"""
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# Prepared statements kept open per MySQL connection
+STATEMENT_CACHE_SIZE = 64
+
+
+# Backend-neutral database errors. `errno` uses MySQL's error numbers
+# (1062 duplicate key, 1205 lock wait timeout, 1213 deadlock, ...) whichever
+# backend raised it; None when the backend has no equivalent.
+class Error(Exception):
+    def __init__(self, msg=None, errno=None):
+        super().__init__(msg)
+        self.msg = msg
+        self.errno = errno
+
+
+# Constraint violations: duplicate keys, missing foreign key rows
+class IntegrityError(Error):
+    pass
+
+
+# Connection, lock and other server-side failures
+class OperationalError(Error):
+    pass
+
+
+def _from_mysql(e):
+    from mysql.connector import errors
+
+    if isinstance(e, errors.IntegrityError):
+        cls = IntegrityError
+    elif isinstance(e, (errors.OperationalError, errors.InterfaceError)) or e.errno in (1205, 1213):
+        cls = OperationalError
+    else:
+        cls = Error
+    return cls(e.msg, errno=e.errno)
+
+
+@contextmanager
+def _mysql_errors():
+    from mysql.connector import Error as MySQLError
+
+    try:
+        yield
+    except MySQLError as e:
+        raise _from_mysql(e) from e
+
+
+class MySQLCursor:
+    """
+    mysql.connector cursor proxy that raises storage errors.
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, operation, params=()):
+        with _mysql_errors():
+            return self._cursor.execute(operation, params)
+
+    def executemany(self, operation, seq_params):
+        with _mysql_errors():
+            return self._cursor.executemany(operation, seq_params)
+
+    def fetchone(self):
+        with _mysql_errors():
+            return self._cursor.fetchone()
+
+    def fetchmany(self, size=1):
+        with _mysql_errors():
+            return self._cursor.fetchmany(size)
+
+    def fetchall(self):
+        with _mysql_errors():
+            return self._cursor.fetchall()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        with _mysql_errors():
+            yield from self._cursor
+
+    def close(self):
+        with _mysql_errors():
+            self._cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class PreparedCursor:
+    """
+    Cursor handed out for prepared=True. Each SQL text executes on its own
+    cached prepared cursor, so the statement is parsed by the server once
+    per connection; closing only drains unread rows.
+    """
+
+    def __init__(self, connection, dictionary):
+        self._connection = connection
+        self._dictionary = dictionary
+        self._cursor = None
+
+    def execute(self, operation, params=()):
+        self._cursor = MySQLCursor(self._connection.statement(operation, self._dictionary))
+        self._cursor.execute(operation, params)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def close(self):
+        if self._cursor is not None and self._cursor.with_rows:
+            try:
+                self._cursor.fetchall()
+            except Exception:
+                pass
+        self._cursor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class StatementCachingConnection:
+    """
+    mysql.connector connection proxy that keeps a bounded LRU of prepared
+    cursors keyed by SQL text. Everything else is delegated.
+    """
+
+    def __init__(self, conn, cache_size=STATEMENT_CACHE_SIZE):
+        self._conn = conn
+        self._cache_size = cache_size
+        self._statements = OrderedDict()
+
+    def statement(self, sql, dictionary=False):
+        key = (sql, dictionary)
+        cursor = self._statements.get(key)
+        if cursor is None:
+            cursor = self._conn.cursor(prepared=True, dictionary=dictionary)
+            self._statements[key] = cursor
+            if len(self._statements) > self._cache_size:
+                _, evicted = self._statements.popitem(last=False)
+                try:
+                    evicted.close()
+                except Exception:
+                    pass
+        else:
+            self._statements.move_to_end(key)
+        return cursor
+
+    def cursor(self, *args, prepared=False, dictionary=False, **kwargs):
+        if prepared:
+            return PreparedCursor(self, dictionary)
+        with _mysql_errors():
+            return MySQLCursor(self._conn.cursor(*args, dictionary=dictionary, **kwargs))
+
+    def commit(self):
+        with _mysql_errors():
+            self._conn.commit()
+
+    def rollback(self):
+        with _mysql_errors():
+            self._conn.rollback()
+
+    def ping(self, *args, **kwargs):
+        with _mysql_errors():
+            self._conn.ping(*args, **kwargs)
+
+    def close(self):
+        self._statements.clear()
+        self._conn.close()
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+class MySQLStorage:
+    name = 'mysql'
+    driver = 'mysql.connector'
+    # Pooled MySQL connections can be dropped by the server while idle
+    ping_on_checkout = True
+
+    def __init__(self, host, user, password, database):
+        self._params = {'host': host, 'user': user, 'password': password, 'database': database}
+
+    def connect(self):
+        import mysql.connector
+
+        with _mysql_errors():
+            return StatementCachingConnection(mysql.connector.connect(**self._params))
+
+
+class SQLiteStorage:
+    name = 'sqlite'
+    driver = 'sqlite_backend'
+    ping_on_checkout = False
+
+    def __init__(self, path):
+        self.path = path
+        self._schema_ready = False
+
+    def create_schema(self):
+        import sqlite_backend
+
+        sqlite_backend.create_schema(self.path)
+        self._schema_ready = True
+
+    def connect(self):
+        import sqlite_backend
+
+        if not self._schema_ready:
+            self.create_schema()
+        return sqlite_backend.connect(self.path)
+
+
+def create_storage(config):
+    """
+    Returns the backend selected by config.DB_BACKEND ('mysql' or 'sqlite').
+    """
+    if config.DB_BACKEND == 'sqlite':
+        return SQLiteStorage(config.SQLITE_PATH)
+    if config.DB_BACKEND == 'mysql':
+        return MySQLStorage(config.DB_HOST, config.DB_USER, config.DB_PASSWORD, config.DB_NAME)
+    raise ValueError(f"Unknown DB_BACKEND {config.DB_BACKEND!r}; use 'mysql' or 'sqlite'.")
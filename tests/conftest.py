@@ -0,0 +1,17 @@
+import pytest
+
+from config import Config
+
+
+@pytest.fixture
+def sqlite_db(tmp_path, monkeypatch):
+    """
+    Points Config at a fresh SQLite database file for one test.
+    """
+    monkeypatch.setattr(Config, 'DB_BACKEND', 'sqlite')
+    monkeypatch.setattr(Config, 'SQLITE_PATH', str(tmp_path / 'scd.sqlite3'))
+    monkeypatch.setattr(Config, '_storage', None)
+    monkeypatch.setattr(Config, '_pool', None)
+    yield Config.get_pool()
+    if Config._pool is not None:
+        Config._pool.close_all()
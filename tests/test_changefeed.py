@@ -0,0 +1,73 @@
+import threading
+from datetime import datetime
+
+from changefeed import EMPLOYEE, ChangeFeed, record_changes
+from database import run_transaction
+
+
+def _versions():
+    def work(cursor):
+        cursor.execute("SELECT version FROM change_log ORDER BY id")
+        return [row[0] for row in cursor.fetchall()]
+    return run_transaction(work)
+
+
+def _commit_change(id, entity_id):
+    # Inserts with an explicit id, standing in for a MySQL writer whose
+    # AUTO_INCREMENT value was taken before another writer committed
+    def work(cursor):
+        cursor.execute("""
+            INSERT INTO change_log (id, entity, entity_id, action, data, changed_at)
+            VALUES (%s, %s, %s, 'updated', NULL, %s)
+        """, (id, EMPLOYEE, entity_id, datetime.now()))
+    run_transaction(work)
+
+
+def test_out_of_order_commits_are_numbered_gapless_in_commit_order(sqlite_db):
+    feed = ChangeFeed(run_transaction, poll_seconds=0)
+
+    # The writer holding id 2 commits while the one holding id 1 is still open
+    _commit_change(2, 'late-id')
+    assert feed.sequence() == 1
+    changes, next_version, _ = feed.read(0)
+    assert [change['id'] for change in changes] == ['late-id']
+    assert next_version == 1
+
+    _commit_change(1, 'early-id')
+    assert feed.sequence() == 2
+    # A reader resuming from the version it saw still receives the earlier id
+    changes, next_version, more = feed.read(next_version)
+    assert [(change['version'], change['id']) for change in changes] == [(2, 'early-id')]
+    assert (next_version, more) == (2, False)
+
+    assert sorted(_versions()) == [1, 2]
+
+
+def test_concurrent_writers_and_sequencers_number_every_change_once(sqlite_db):
+    feed = ChangeFeed(run_transaction, poll_seconds=0)
+    writers, changes_per_writer = 4, 25
+    start = threading.Barrier(writers)
+    errors = []
+
+    def write(writer):
+        try:
+            start.wait()
+            for index in range(changes_per_writer):
+                run_transaction(lambda cursor: record_changes(cursor, [(EMPLOYEE, f"{writer}-{index}", 'updated', None)]))
+                feed.sequence()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(writer,)) for writer in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    total = writers * changes_per_writer
+    assert feed.sequence() == total
+    versions = _versions()
+    assert sorted(versions) == list(range(1, total + 1))
+    # Rows are numbered in the order they committed, which on SQLite is id order
+    assert versions == sorted(versions)
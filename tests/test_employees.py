@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+
+from database import run_transaction
+from employees import Employee, EmployeeException, EmployeeList
+
+
+def _employee_row(id):
+    def work(cursor):
+        cursor.execute("SELECT salary, version FROM employees WHERE id = %s", (id,))
+        return cursor.fetchone()
+    return run_transaction(work, dictionary=True)
+
+
+def test_edits_from_the_same_version_give_one_success_and_one_conflict(sqlite_db):
+    employee_list = EmployeeList()
+    employee_list.add_employee(Employee(1, "Ada Lovelace", "ada@example.com", 1990, "MSc", 5000.0,
+                                        "Engineer", None, "Engineering", "Active"))
+    version = _employee_row(1)['version']
+    start = threading.Barrier(2)
+    outcomes = []
+
+    def edit(salary):
+        start.wait()
+        try:
+            employee_list.update_employee(1, "Ada Lovelace", "ada@example.com", 1990, "MSc", salary,
+                                          "Engineer", None, "Engineering", "Active", version=version)
+            outcomes.append(('updated', salary))
+        except EmployeeException as e:
+            outcomes.append(('conflict', str(e)))
+
+    threads = [threading.Thread(target=edit, args=(salary,)) for salary in (6000.0, 7000.0)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(outcome for outcome, _ in outcomes) == ['conflict', 'updated']
+    conflict = next(detail for outcome, detail in outcomes if outcome == 'conflict')
+    assert 'modified by someone else' in conflict
+    winner = next(detail for outcome, detail in outcomes if outcome == 'updated')
+    assert _employee_row(1) == {'salary': winner, 'version': version + 1}
+
+
+def test_edit_with_a_stale_version_is_rejected(sqlite_db):
+    employee_list = EmployeeList()
+    employee_list.add_employee(Employee(1, "Ada Lovelace", "ada@example.com", 1990, "MSc", 5000.0,
+                                        "Engineer", None, "Engineering", "Active"))
+    employee_list.update_employee(1, "Ada Lovelace", "ada@example.com", 1990, "MSc", 6000.0,
+                                  "Engineer", None, "Engineering", "Active", version=0)
+
+    with pytest.raises(EmployeeException, match="modified by someone else"):
+        employee_list.update_employee(1, "Ada Lovelace", "ada@example.com", 1990, "MSc", 7000.0,
+                                      "Engineer", None, "Engineering", "Active", version=0)
+    assert _employee_row(1) == {'salary': 6000.0, 'version': 1}
@@ -0,0 +1,187 @@
+import math
+import re
+from datetime import date
+
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_DIGIT = re.compile(r"\d")
+
+MAX_INT = 2147483647        # largest INT column value
+MAX_SALARY = 99999999.99    # largest DECIMAL(10,2) value
+
+
+class Field:
+    """
+    Declarative rule set for one record field. `kind` is int, float, str or
+    date; `checks` are extra (predicate, message) pairs run on the coerced
+    value. Text is stripped and empty text counts as missing.
+    """
+
+    def __init__(self, name, kind=str, required=False, min=None, max=None, checks=(), message=None):
+        self.name = name
+        self.kind = kind
+        self.required = required
+        self.min = min
+        self.max = max
+        self.checks = tuple(checks)
+        self.message = message or f"Invalid {name.replace('_', ' ')}."
+
+
+def _coercer(kind):
+    # Each returns the coerced value or raises ValueError/TypeError
+    if kind is int:
+        def coerce(value):
+            if isinstance(value, bool):
+                raise TypeError
+            if isinstance(value, float) and not value.is_integer():
+                raise ValueError
+            return int(value)
+    elif kind is float:
+        def coerce(value):
+            if isinstance(value, bool):
+                raise TypeError
+            value = float(value)
+            if not math.isfinite(value):
+                raise ValueError
+            return value
+    elif kind is date:
+        def coerce(value):
+            if isinstance(value, date):
+                return value.isoformat()
+            if not _ISO_DATE.match(value):
+                raise ValueError
+            date.fromisoformat(value)
+            return value
+    else:
+        coerce = str
+    return coerce
+
+
+def _field_source(index, field, env):
+    """
+    Returns the source lines checking one field inside the compiled
+    validator. Constants and helpers are passed through `env`.
+    """
+    value = f"v{index}"
+    env[f"coerce{index}"] = _coercer(field.kind)
+    env[f"message{index}"] = field.message
+    env[f"missing{index}"] = f"{field.name.replace('_', ' ').capitalize()} is required."
+    lines = [
+        f"{value} = get({field.name!r})",
+        f"if {value}.__class__ is str:",
+        f"    {value} = {value}.strip() or None",
+        f"if {value} is None:",
+        f"    append(missing{index})" if field.required else "    pass",
+    ]
+    # Common input types are converted inline; anything else goes through coerce
+    if field.kind is int:
+        fast = [f"if {value}.__class__ is str: {value} = int({value})",
+                f"elif {value}.__class__ is not int: {value} = coerce{index}({value})"]
+    elif field.kind is float:
+        # 'inf' and 'nan' parse as floats; the comparison rejects both
+        fast = [f"if {value}.__class__ is str or {value}.__class__ is int: {value} = float({value})",
+                f"elif {value}.__class__ is not float: {value} = coerce{index}({value})",
+                f"if not -inf < {value} < inf: raise ValueError"]
+        env['inf'] = math.inf
+    elif field.kind is date:
+        fast = [f"if {value}.__class__ is str and len({value}) == 10 and {value}[4] == '-' and {value}[7] == '-': fromisoformat({value})",
+                f"else: {value} = coerce{index}({value})"]
+        env['fromisoformat'] = date.fromisoformat
+    else:
+        fast = None
+    if fast:
+        lines += ["else:", "    try:"]
+        lines += [f"        {line}" for line in fast]
+        lines += ["    except (TypeError, ValueError):",
+                  f"        append(message{index})",
+                  f"        {value} = None"]
+    else:
+        lines += [f"elif {value}.__class__ is not str:", f"    {value} = str({value})"]
+    bounds = []
+    if field.min is not None:
+        env[f"low{index}"] = field.min
+        # Negated so NaN fails the bound
+        bounds.append(f"not {value} >= low{index}")
+    if field.max is not None:
+        env[f"high{index}"] = field.max
+        bounds.append(f"not {value} <= high{index}")
+    if bounds:
+        lines += [f"if {value} is not None and ({' or '.join(bounds)}):", f"    append(message{index})"]
+    for number, (predicate, message) in enumerate(field.checks):
+        env[f"predicate{index}_{number}"] = predicate
+        env[f"check_message{index}_{number}"] = message
+        lines += [f"if {value} is not None and not predicate{index}_{number}({value}):",
+                  f"    append(check_message{index}_{number})"]
+    return lines
+
+
+def _compile(fields):
+    """
+    Compiles a schema into one straight-line function
+    `check(record, append) -> values` so validating a record costs no
+    per-field calls or rule lookups.
+    """
+    env = {}
+    body = []
+    for index, field in enumerate(fields):
+        body.extend(_field_source(index, field, env))
+    result = ', '.join(f"{field.name!r}: v{index}" for index, field in enumerate(fields))
+    source = "def check(record, append):\n    get = record.get\n"
+    source += ''.join(f"    {line}\n" for line in body)
+    source += f"    return {{{result}}}\n"
+    exec(compile(source, '<validator>', 'exec'), env)
+    return env['check']
+
+
+class Validator:
+    """
+    A schema compiled once into a single check function. validate() and
+    validate_batch() collect every error of a record rather than stopping
+    at the first, and never raise for bad input.
+    """
+
+    def __init__(self, fields):
+        self.fields = tuple(field.name for field in fields)
+        self._check = _compile(fields)
+
+    def validate(self, record):
+        """
+        Returns (values, errors): the coerced values keyed by field name and
+        a list of error messages, empty when the record is valid.
+        """
+        errors = []
+        values = self._check(record, errors.append)
+        return values, errors
+
+    def validate_batch(self, records):
+        """
+        Returns (valid, invalid): lists of (index, values) and
+        (index, errors) for the records in `records`.
+        """
+        valid = []
+        invalid = []
+        check = self._check
+        for index, record in enumerate(records):
+            errors = []
+            values = check(record, errors.append)
+            if errors:
+                invalid.append((index, errors))
+            else:
+                valid.append((index, values))
+        return valid, invalid
+
+
+EMPLOYEE_SCHEMA = (
+    Field('id', int, required=True, min=1, max=MAX_INT, message="Invalid ID. ID must be a positive integer."),
+    Field('name', required=True, checks=[(lambda value: not _DIGIT.search(value), "Name cannot contain numbers.")]),
+    Field('email', required=True, checks=[(lambda value: '@' in value, "Invalid email address.")], message="Invalid email address."),
+    Field('year_of_birth', int, required=True, min=1900, max=2100, message="Invalid year of birth."),
+    Field('qualification'),
+    Field('salary', float, required=True, min=0, max=MAX_SALARY, message=f"Salary must be a number between 0 and {MAX_SALARY:,.2f}."),
+    Field('job_title'),
+    Field('date_of_joining', date, message="Date of joining must be a date (YYYY-MM-DD)."),
+    Field('department'),
+    Field('status'),
+)
+
+# Shared by EmployeeFactory, the import path and update_employee
+EMPLOYEE_VALIDATOR = Validator(EMPLOYEE_SCHEMA)
@@ -0,0 +1,70 @@
+import threading
+import time
+from datetime import datetime, timezone
+
+import storage
+
+# Seconds a read of the version counters is trusted before polling again
+DATA_VERSION_POLL_SECONDS = 1.0
+
+
+def bump_data_version(run_transaction, name):
+    """
+    Marks `name` ('employees', 'inventory', ...) as changed. Call after the
+    write has committed: the bump is its own short transaction, because
+    holding the counter row's lock for the whole write would make every
+    writer in every worker wait on it. A reader that sees the old version
+    after the commit is caught by the bump an instant later. A failed bump
+    is logged, not raised, since the write itself has succeeded; caches
+    then catch up through their TTLs.
+    """
+    def work(cursor):
+        cursor.execute("UPDATE data_versions SET version = version + 1, updated_at = %s WHERE name = %s",
+                       (datetime.now(timezone.utc).replace(tzinfo=None), name))
+
+    try:
+        run_transaction(work)
+    except storage.Error as e:
+        print(f"Could not bump data version {name!r}: {e}")
+
+
+class DataVersions:
+    """
+    Process-local view of the data_versions table. Values are re-read at
+    most every `poll_seconds`, and immediately after a write in this
+    process (it is registered as an observer), so other workers' writes
+    show up within one poll interval.
+    """
+
+    def __init__(self, read_all, poll_seconds=DATA_VERSION_POLL_SECONDS):
+        self._read_all = read_all
+        self._poll_seconds = poll_seconds
+        self._lock = threading.Lock()
+        self._versions = {}
+        self._next_poll = 0.0
+        self._dirty = True
+
+    # Observer hook: this process just wrote, so re-read on next use
+    def update(self, event):
+        self._dirty = True
+
+    def get(self, *names):
+        """
+        Returns ([version, ...], last_modified) for `names`; last_modified is
+        the most recent UTC change time among them.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._dirty or now >= self._next_poll:
+                # Cleared before reading so a write landing mid-read forces another read
+                self._dirty = False
+                try:
+                    self._versions = {name: (version, updated_at) for name, version, updated_at in self._read_all()}
+                except Exception:
+                    self._dirty = True
+                    raise
+                self._next_poll = now + self._poll_seconds
+            versions = self._versions
+        entries = [versions.get(name, (0, None)) for name in names]
+        modified = [updated_at for _, updated_at in entries if updated_at is not None]
+        return [version for version, _ in entries], max(modified) if modified else None
@@ -0,0 +1,42 @@
+"""
+Blueprints for the web UI and JSON endpoints. Each module registers its
+routes on import; register_blueprints() attaches them to an app.
+"""
+from flask import Request, session
+
+from config import Config
+from employees import current_actor
+from httpcache import conditional_page
+import services
+
+
+# Helper function to check if user is logged in
+def is_logged_in():
+    return 'user_id' in session
+
+
+def cached_page(*names):
+    return conditional_page(services.data_versions, *names,
+                            page_cache=services.page_cache if Config.PAGE_CACHE_ENABLED else None,
+                            user_key=current_actor)
+
+
+class UploadRequest(Request):
+    """
+    Request whose multipart file parts are written through
+    `upload_stream_factory()` when a view sets it before reading the form,
+    instead of into Werkzeug's own temporary files first.
+    """
+    upload_stream_factory = None
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if self.upload_stream_factory is not None:
+            return self.upload_stream_factory()
+        return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+
+
+def register_blueprints(app):
+    from views import auth, changes, dashboard, documents, employees, inventory, jobs
+
+    for module in (auth, dashboard, employees, inventory, documents, jobs, changes):
+        app.register_blueprint(module.blueprint)
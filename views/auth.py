@@ -0,0 +1,106 @@
+from flask import Blueprint, request, render_template, redirect, url_for, session, flash
+
+import storage
+from auth import AuthBusy
+from database import db_connection, run_transaction, DUPLICATE_KEY_ERROR
+from services import password_hasher, login_ip_limiter, login_account_limiter, user_cache
+
+blueprint = Blueprint('auth', __name__)
+
+
+def load_user(id):
+    with db_connection() as conn, conn.cursor(dictionary=True, prepared=True) as cursor:
+        cursor.execute("SELECT id, name, email FROM users WHERE id = %s", (id,))
+        return cursor.fetchone()
+
+def current_user():
+    user_id = session.get('user_id')
+    if user_id is None:
+        return None
+    return user_cache.get_or_load(user_id, lambda: load_user(user_id))
+
+@blueprint.app_context_processor
+def inject_current_user():
+    return {'current_user': current_user}
+
+# User Registration Route (Sign Up)
+@blueprint.route('/signup', methods=['GET', 'POST'])
+def signup():
+    if request.method == 'POST':
+        name = request.form.get('name')
+        email = request.form.get('email')
+        password = request.form.get('password')
+
+        if not name or not email or not password:
+            flash('Please fill all fields.', 'error')
+            return redirect(url_for('auth.signup'))
+
+        try:
+            hashed_password = password_hasher.hash(password)
+        except AuthBusy as e:
+            flash(str(e), 'error')
+            return redirect(url_for('auth.signup'))
+
+        # A single INSERT; UNIQUE(email) rejects existing users atomically
+        def work(cursor):
+            cursor.execute("INSERT INTO users (name, email, password) VALUES (%s, %s, %s)", (name, email, hashed_password))
+
+        try:
+            run_transaction(work)
+        except storage.Error as e:
+            if e.errno != DUPLICATE_KEY_ERROR:
+                raise
+            flash('User already exists. Please log in.', 'error')
+            return redirect(url_for('auth.login'))
+
+        flash('Registration successful! Please log in.', 'success')
+        return redirect(url_for('auth.login'))
+
+    return render_template('signup.html')
+
+# User Login Route
+@blueprint.route('/login', methods=['GET', 'POST'])
+def login():
+    if request.method == 'POST':
+        email = request.form.get('email') or ''
+        password = request.form.get('password') or ''
+
+        if not login_ip_limiter.allow(request.remote_addr) or not login_account_limiter.allow(email.lower()):
+            flash('Too many login attempts. Please wait a moment and try again.', 'error')
+            return redirect(url_for('auth.login'))
+
+        with db_connection() as conn, conn.cursor(prepared=True) as cursor:
+            cursor.execute("SELECT id, password FROM users WHERE email = %s", (email,))
+            user = cursor.fetchone()
+
+        try:
+            valid = password_hasher.verify(user[1] if user else None, password)
+        except AuthBusy as e:
+            flash(str(e), 'error')
+            return redirect(url_for('auth.login'))
+
+        if valid:
+            user_id, stored_hash = user
+            # Upgrade hashes made with older parameters while the password is at hand
+            if password_hasher.needs_rehash(stored_hash):
+                try:
+                    new_hash = password_hasher.hash(password)
+                    run_transaction(lambda cursor: cursor.execute("UPDATE users SET password = %s WHERE id = %s", (new_hash, user_id)))
+                except AuthBusy:
+                    pass
+            login_account_limiter.reset(email.lower())
+            session['user_id'] = user_id
+            flash('Login successful!', 'success')
+            return redirect(url_for('dashboard.index'))
+
+        flash('Invalid credentials. Please try again.', 'error')
+        return redirect(url_for('auth.login'))
+
+    return render_template('login.html')
+
+# Logout Route
+@blueprint.route('/logout')
+def logout():
+    user_cache.invalidate(session.pop('user_id', None))
+    flash('You have been logged out.', 'success')
+    return redirect(url_for('auth.login'))
@@ -0,0 +1,65 @@
+import time
+
+import click
+from flask import Blueprint, request, jsonify
+
+from changefeed import CHANGE_ENTITIES, CHANGE_FEED_LIMIT, ChangeLogGone
+from config import Config
+from services import change_feed
+from views import is_logged_in
+
+blueprint = Blueprint('changes', __name__, cli_group=None)
+
+
+def no_store(response, status=200):
+    response.status_code = status
+    response.cache_control.no_store = True
+    return response
+
+# Delta sync: /changes?since=42&entity=employee,inventory&limit=500&wait=25
+# Without `since` it only returns the current version to start from after a full fetch.
+@blueprint.route('/changes')
+def changes():
+    if not is_logged_in():
+        return jsonify({'error': 'User not logged in'}), 401
+
+    if 'since' not in request.args:
+        return no_store(jsonify({'changes': [], 'next': change_feed.latest(), 'more': False}))
+    try:
+        since = int(request.args['since'])
+        limit = int(request.args.get('limit', CHANGE_FEED_LIMIT))
+        wait = float(request.args.get('wait', 0))
+    except ValueError:
+        return jsonify({'error': 'since, limit and wait must be numbers'}), 400
+    if since < 0:
+        return jsonify({'error': 'since cannot be negative'}), 400
+    limit = max(1, min(limit, CHANGE_FEED_LIMIT))
+    wait = max(0.0, min(wait, Config.CHANGE_FEED_MAX_WAIT))
+    entities = [entity for entity in request.args.get('entity', '').split(',') if entity]
+    unknown = set(entities) - set(CHANGE_ENTITIES)
+    if unknown:
+        return jsonify({'error': f"Unknown entity. Choose from: {', '.join(CHANGE_ENTITIES)}"}), 400
+
+    # Long-poll: hold the request until something newer than `since` commits or `wait`
+    # runs out; when too many polls are already held, answer at once instead
+    deadline = time.monotonic() + wait
+    try:
+        while True:
+            rows, next_version, more = change_feed.read(since, entities, limit)
+            remaining = deadline - time.monotonic()
+            if rows or remaining <= 0:
+                break
+            since = next_version
+            if change_feed.wait(since, remaining) is None:
+                break
+    except ChangeLogGone as e:
+        return no_store(jsonify({'error': str(e), 'next': change_feed.latest()}), 410)
+    return no_store(jsonify({'changes': rows, 'next': next_version, 'more': more}))
+
+
+# CLI: flask --app app prune-changes --days 30
+@blueprint.cli.command('prune-changes')
+@click.option('--days', type=int, default=Config.CHANGE_LOG_RETENTION_DAYS, show_default=True,
+              help='Delete changes older than this many days.')
+def prune_changes_command(days):
+    click.echo(f"Pruned {change_feed.prune(days)} changes older than {days} days")
@@ -0,0 +1,146 @@
+import time
+
+from flask import Blueprint, request, render_template, redirect, url_for, jsonify, Response, abort, current_app, session
+
+from analytics import ANALYTICS_VIEWS
+from charts import CHART_MIMETYPES
+from pagination import page_size
+from reports import REPORTS, REPORT_DOWNLOAD_MIMETYPES, parquet_available, report_table, table_to_csv, table_to_parquet
+from services import dashboard_cache, department_chart, workforce_analytics, search_index, document_permissions, get_report
+from sharing import VIEW, DocumentNotFound
+from views import is_logged_in
+
+blueprint = Blueprint('dashboard', __name__)
+
+
+# Home Page (Only accessible if logged in)
+@blueprint.route('/')
+def index():
+    if not is_logged_in():
+        return redirect(url_for('auth.login'))
+
+    summary = dashboard_cache.get()
+
+    return render_template('index.html',
+                           employee_count=summary['employee_count'],
+                           recent_hires=summary['recent_hires'],
+                           upcoming_anniversaries=summary['upcoming_anniversaries'])
+
+@blueprint.route('/dashboard_data')
+def dashboard_data():
+    if not is_logged_in():
+        return jsonify({'error': 'User not logged in'}), 401
+
+    try:
+        return jsonify(dashboard_cache.get())
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@blueprint.route('/chart')
+def chart():
+    return render_template('charts.html', chart_version=department_chart.fingerprint())
+
+# Rendered chart image; the fingerprint doubles as the ETag
+@blueprint.route('/chart.<fmt>')
+def chart_image(fmt):
+    if fmt not in CHART_MIMETYPES:
+        return 'Unsupported chart format', 404
+
+    fingerprint, body = department_chart.image(fmt)
+    response = current_app.response_class(body, mimetype=CHART_MIMETYPES[fmt])
+    response.set_etag(fingerprint)
+    if request.args.get('v') == fingerprint:
+        # Versioned URL: the content behind it can never change
+        response.cache_control.public = True
+        response.cache_control.max_age = 31536000
+    else:
+        response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+# Raw chart data so browsers can draw the chart client-side
+@blueprint.route('/chart_data')
+def chart_data():
+    fingerprint, departments, counts = department_chart.data()
+    response = jsonify({'departments': departments, 'counts': counts})
+    response.set_etag(fingerprint)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+# Statistics Endpoint
+@blueprint.route('/statistics')
+def statistics():
+    summary = dashboard_cache.get()
+
+    return render_template('statistics.html',
+                           total_employees=summary['employee_count'],
+                           recent_hires=summary['recent_hires'],
+                           upcoming_anniversaries=summary['upcoming_anniversaries'])
+
+
+# JSON analytics API: /analytics for every view, /analytics/<view> for one
+@blueprint.route('/analytics')
+def analytics():
+    if not is_logged_in():
+        return jsonify({'error': 'User not logged in'}), 401
+    return jsonify(workforce_analytics.summary())
+
+@blueprint.route('/analytics/<view>')
+def analytics_view(view):
+    if not is_logged_in():
+        return jsonify({'error': 'User not logged in'}), 401
+    if view not in ANALYTICS_VIEWS:
+        return jsonify({'error': f"Unknown view. Choose one of: {', '.join(ANALYTICS_VIEWS)}"}), 404
+    return jsonify({view: workforce_analytics.view(view)})
+
+@blueprint.route('/reports/<name>')
+def report(name):
+    if not is_logged_in():
+        return jsonify({'error': 'User not logged in'}), 401
+    if name not in REPORTS:
+        return jsonify({'error': f"Unknown report. Choose one of: {', '.join(REPORTS)}"}), 404
+    return jsonify(get_report(name))
+
+# Report download: /reports/salary/csv or /reports/salary/parquet
+@blueprint.route('/reports/<name>/<fmt>')
+def report_download(name, fmt):
+    if not is_logged_in():
+        return redirect(url_for('auth.login'))
+    if name not in REPORTS or fmt not in REPORT_DOWNLOAD_MIMETYPES:
+        abort(404)
+    if fmt == 'parquet' and not parquet_available():
+        # Optional dependency: needs pandas with pyarrow or fastparquet
+        abort(501)
+    rows = report_table(get_report(name))
+    body = table_to_csv(rows) if fmt == 'csv' else table_to_parquet(rows)
+    return Response(body, mimetype=REPORT_DOWNLOAD_MIMETYPES[fmt],
+                    headers={'Content-Disposition': f'attachment; filename={name}_report.{fmt}'})
+
+# Typeahead search: /search?q=ali&type=employee&limit=10
+@blueprint.route('/search')
+def search():
+    if not is_logged_in():
+        return jsonify({'error': 'User not logged in'}), 401
+
+    kind = request.args.get('type')
+    if kind not in (None, '', 'employee', 'document'):
+        return jsonify({'error': 'type must be employee or document'}), 400
+
+    user_id = session['user_id']
+
+    # Documents go through the same (cached) permission check as downloads
+    def visible(result_kind, id):
+        if result_kind != 'document':
+            return True
+        try:
+            return document_permissions.can(user_id, id, VIEW)
+        except DocumentNotFound:
+            return False
+
+    started = time.perf_counter()
+    results = search_index.search(request.args.get('q', ''), kind=kind or None, limit=page_size(request.args.get('limit')), include=visible)
+    return jsonify({
+        'results': [dict(record, type=result_kind, score=score) for score, result_kind, record in results],
+        'took_ms': round((time.perf_counter() - started) * 1000, 2),
+    })
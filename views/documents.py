@@ -0,0 +1,176 @@
+import os
+
+from flask import Blueprint, request, session, render_template, redirect, url_for, flash, send_file, abort, current_app
+from werkzeug.utils import secure_filename
+
+from database import db_connection, run_transaction
+from documents import DocumentTooLarge
+from services import document_permissions, document_store, employee_list, search_index
+from sharing import VIEW, DocumentNotFound, SharingException
+from views import is_logged_in
+
+blueprint = Blueprint('documents', __name__)
+
+
+def allowed_file(filename):
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
+
+# Documents the user owns, can see because they predate sharing, or has been shared
+def get_documents(user_id):
+    with db_connection() as conn, conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT d.id, d.name, d.doc_type, d.filename, d.size
+            FROM documents d
+            WHERE d.owner_id = %s OR d.owner_id IS NULL
+               OR EXISTS (SELECT 1 FROM document_shares s WHERE s.document_id = d.id AND s.user_id = %s)
+            ORDER BY d.id DESC
+        """, (user_id, user_id))
+        return cursor.fetchall()
+
+def get_recipients(user_id):
+    with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+        cursor.execute("SELECT id, name, email FROM users WHERE id <> %s ORDER BY name", (user_id,))
+        return cursor.fetchall()
+
+def upload_document():
+    document_name = request.form['document_name']
+    document_type = request.form['document_type']
+    employee_id = request.form['employee_id']
+    file = request.files['file']
+
+    # Validate and save the uploaded file
+    if not file or not file.filename or not allowed_file(file.filename):
+        flash('Please choose a PDF, Word document or image to upload.', 'error')
+        return redirect(url_for('documents.document_storage'))
+
+    sha256, size = document_store.commit(file.stream)
+
+    # Store the document details; identical content shares one file on disk
+    def work(cursor):
+        cursor.execute("""
+            INSERT INTO documents (employee_id, name, doc_type, filename, content_type, sha256, size, owner_id)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        """, (employee_id, document_name, document_type, filename, file.mimetype, sha256, size, session['user_id']))
+        return cursor.lastrowid
+
+    filename = secure_filename(file.filename) or 'document'
+    document_id = run_transaction(work)
+    search_index.add_document({'id': document_id, 'name': document_name, 'doc_type': document_type, 'filename': filename})
+    flash('Document uploaded successfully!', 'success')
+
+    # Redirect to the same page or another page upon successful upload
+    return redirect(url_for('documents.document_storage'))
+
+@blueprint.route('/document_storage', methods=['GET', 'POST'])
+def document_storage():
+    if not is_logged_in():
+        return redirect(url_for('auth.login'))
+
+    if request.method == 'POST':
+        # The file part is parsed straight into the store's temporary file and
+        # hashed as it arrives; parts that end up not stored are deleted
+        uploads = []
+
+        def open_upload():
+            uploads.append(document_store.open_upload())
+            return uploads[-1]
+
+        request.upload_stream_factory = open_upload
+        try:
+            return upload_document()
+        except DocumentTooLarge as e:
+            flash(str(e), 'error')
+            return redirect(url_for('documents.document_storage'))
+        finally:
+            for upload in uploads:
+                upload.discard()
+
+    # Fetch employee and document data
+    employees = employee_list.get_employee_names()
+    documents = get_documents(session['user_id'])
+
+    return render_template('document_storage.html', employees=employees, documents=documents)
+
+# Document download; supports conditional and Range (206) requests,
+# and hands the file to the front-end server when USE_X_SENDFILE is set.
+# Documents the user may not view answer 404, so their ids reveal nothing.
+@blueprint.route('/documents/<int:id>/download')
+def download_document(id):
+    if not is_logged_in():
+        return redirect(url_for('auth.login'))
+    try:
+        if not document_permissions.can(session['user_id'], id, VIEW):
+            abort(404)
+    except DocumentNotFound:
+        abort(404)
+
+    with db_connection() as conn, conn.cursor(dictionary=True, prepared=True) as cursor:
+        cursor.execute("SELECT filename, content_type, sha256 FROM documents WHERE id = %s", (id,))
+        document = cursor.fetchone()
+    if not document:
+        abort(404)
+
+    path = document_store.path_for(document['sha256'])
+    if not os.path.exists(path):
+        abort(404)
+
+    return send_file(os.path.abspath(path),
+                     mimetype=document['content_type'] or None,
+                     download_name=document['filename'],
+                     etag=document['sha256'],
+                     conditional=True,
+                     max_age=3600)
+
+# Share or revoke: one document (or several) with many recipients in one transaction
+@blueprint.route('/document_sharing', methods=['GET', 'POST'])
+def document_sharing():
+    if not is_logged_in():
+        return redirect(url_for('auth.login'))
+    user_id = session['user_id']
+
+    if request.method == 'POST':
+        try:
+            document_ids = [int(id) for id in request.form.getlist('document_id')]
+            recipients = [int(id) for id in request.form.getlist('recipient')]
+        except ValueError:
+            flash('Invalid document or recipient.', 'error')
+            return redirect(url_for('documents.document_sharing'))
+
+        try:
+            if request.form.get('action') == 'revoke':
+                removed = document_permissions.revoke(document_ids, recipients, user_id)
+                flash(f'Revoked {removed} shares.', 'success')
+            else:
+                permission = request.form.get('permissions', VIEW)
+                shared = document_permissions.share(document_ids, recipients, permission, user_id)
+                flash(f'Document shared ({shared} shares).', 'success')
+        except SharingException as e:
+            flash(str(e), 'error')
+
+        return redirect(url_for('documents.document_sharing'))
+
+    documents = document_permissions.shareable_documents(user_id)
+    recipients = get_recipients(user_id)
+    granted, received = document_permissions.list_shares(user_id)
+    return render_template('document_sharing.html', documents=documents, recipients=recipients, granted=granted, received=received)
+
+@blueprint.route('/compliance')
+def compliance():
+    if not is_logged_in():
+        return redirect(url_for('auth.login'))
+
+    # Who owns each document and how widely it is shared, plus the latest audit trail
+    compliance_data = document_permissions.overview()
+    with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+        cursor.execute("""
+            SELECT entity_type, entity_id, action, actor_id, created_at
+            FROM audit_logs
+            ORDER BY created_at DESC, id DESC
+            LIMIT 100
+        """)
+        audit_logs = cursor.fetchall()
+    return render_template('compliance.html', compliance_data=compliance_data, audit_logs=audit_logs)
+
+@blueprint.route('/document_management')
+def document_management():
+    return render_template('document_management.html')
@@ -0,0 +1,219 @@
+import os
+import shutil
+import tempfile
+
+import click
+from flask import Blueprint, request, render_template, redirect, url_for, flash, jsonify, Response
+
+import storage
+from bulk import detect_format, iter_records, import_employees, format_csv, format_jsonl, EMPLOYEE_FIELDS
+from database import DUPLICATE_KEY_ERROR
+from employees import Employee, EmployeeException
+from pagination import decode_cursor, page_size
+from services import IMPORT_SPOOL_PREFIX, employee_list, employee_factory, remove_spooled_upload
+from validation import EMPLOYEE_VALIDATOR
+from views import is_logged_in, cached_page
+from views.jobs import submit_job
+
+# cli_group=None keeps the commands at the top level (flask --app app import-employees)
+blueprint = Blueprint('employees', __name__, cli_group=None)
+
+
+# Add Employee Route
+@blueprint.route('/add_employee', methods=['GET', 'POST'])
+def add_employee():
+    if request.method == 'POST':
+        # The form is validated as a whole so every problem is reported at once
+        values, errors = EMPLOYEE_VALIDATOR.validate(request.form)
+        if errors:
+            for error in errors:
+                flash(error, 'error')
+            return redirect(url_for('employees.add_employee'))
+
+        try:
+            employee_list.add_employee(Employee(**values))
+            flash('Employee added successfully!', 'success')
+        except EmployeeException as e:
+            flash(str(e), 'error')
+        except storage.IntegrityError as e:
+            if e.errno != DUPLICATE_KEY_ERROR:
+                raise
+            flash(f"Employee with ID {values['id']} already exists.", 'error')
+
+        return redirect(url_for('dashboard.index'))
+
+    return render_template('add_employee.html')
+
+# Bulk Import Route (CSV, JSON Lines or JSON array upload)
+# With ?async=1 the upload is spooled to disk and imported as a background job
+@blueprint.route('/import_employees', methods=['POST'])
+def import_employees_route():
+    if not is_logged_in():
+        return jsonify({'error': 'User not logged in'}), 401
+
+    file = request.files.get('file')
+    if not file or not file.filename:
+        return jsonify({'error': 'No file uploaded'}), 400
+
+    fmt = detect_format(file.filename)
+    if request.args.get('async'):
+        fd, path = tempfile.mkstemp(prefix=IMPORT_SPOOL_PREFIX, suffix=f'.{fmt}')
+        try:
+            with os.fdopen(fd, 'wb') as spool:
+                shutil.copyfileobj(file.stream, spool)
+            response = submit_job('import_employees', {'path': path, 'format': fmt})
+        except BaseException:
+            remove_spooled_upload(path)
+            raise
+        # Once queued, the job deletes the file when it ends
+        if response.status_code != 202:
+            remove_spooled_upload(path)
+        return response
+    records = iter_records(file.stream, fmt)
+    report = import_employees(records, employee_factory, employee_list.add_employees)
+    # A file that stops parsing part-way still reports what was imported before it
+    return jsonify(report), 400 if 'error' in report else 200
+
+# Bulk Export Route, streamed as CSV or JSON Lines
+@blueprint.route('/export_employees')
+def export_employees():
+    if not is_logged_in():
+        return redirect(url_for('auth.login'))
+
+    if request.args.get('format') == 'jsonl':
+        body, mimetype, extension = format_jsonl(employee_list.iter_employees(), EMPLOYEE_FIELDS), 'application/x-ndjson', 'jsonl'
+    else:
+        body, mimetype, extension = format_csv(employee_list.iter_employees(), EMPLOYEE_FIELDS), 'text/csv', 'csv'
+    return Response(body, mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename=employees.{extension}'})
+
+# View Employee Route
+@blueprint.route('/employee/<int:id>', methods=['GET', 'POST'])
+@cached_page('employees')
+def employee(id):
+    if request.method == 'POST':
+        name = request.form.get('name')
+        email = request.form.get('email')
+        year_of_birth = request.form.get('year_of_birth')
+        qualification = request.form.get('qualification')
+        salary = request.form.get('salary')
+        job_title = request.form.get('job_title')
+        date_of_joining = request.form.get('date_of_joining')
+        department = request.form.get('department')
+        status = request.form.get('status')
+        version = request.form.get('version') or None
+
+        try:
+            employee_list.update_employee(id, name, email, year_of_birth, qualification, salary, job_title, date_of_joining, department, status, version)
+            flash('Employee updated successfully!', 'success')
+        except EmployeeException as e:
+            flash(str(e), 'error')
+
+        return redirect(url_for('dashboard.index'))
+
+    employee = employee_list.get_employee_by_id(id)
+    if not employee:
+        flash('Employee not found.', 'error')
+        return redirect(url_for('dashboard.index'))
+
+    return render_template('profile_employee.html', employee=employee)
+
+# Delete Employee Route
+@blueprint.route('/delete_employee/<int:id>', methods=['POST'])
+def delete_employee(id):
+    try:
+        employee_list.delete_employee(id)
+        flash('Employee deleted successfully!', 'success')
+    except EmployeeException as e:
+        flash(str(e), 'error')
+
+    return redirect(url_for('dashboard.index'))
+
+@blueprint.route('/list_employees')
+@cached_page('employees')
+def list_employees():
+    if not is_logged_in():
+        return redirect(url_for('auth.login'))
+    
+    employees, next_cursor, query = employee_page_from_request()
+    return render_template('list_employees.html', employees=employees, next_cursor=next_cursor, query=query)
+
+# JSON variant of /list_employees with the same query parameters
+@blueprint.route('/employees_data')
+def employees_data():
+    if not is_logged_in():
+        return jsonify({'error': 'User not logged in'}), 401
+
+    employees, next_cursor, query = employee_page_from_request()
+    return jsonify({'employees': employees, 'next_cursor': next_cursor})
+
+# Reads filter, sort and cursor parameters shared by the employee list endpoints
+def employee_page_from_request():
+    query = {
+        'department': request.args.get('department', ''),
+        'status': request.args.get('status', ''),
+        'job_title': request.args.get('job_title', ''),
+        'sort': request.args.get('sort', 'id'),
+        'dir': 'desc' if request.args.get('dir') == 'desc' else 'asc',
+        'limit': page_size(request.args.get('limit')),
+    }
+    employees, next_cursor = employee_list.get_employee_page(
+        filters=query,
+        sort=query['sort'],
+        descending=query['dir'] == 'desc',
+        after=decode_cursor(request.args.get('after')),
+        limit=query['limit'])
+    return employees, next_cursor, query
+
+@blueprint.route('/employee/edit/<int:id>', methods=['GET', 'POST'])
+def edit_employee(id):
+    # update_employee reports missing employees itself, so POST skips the lookup
+    if request.method == 'POST':
+        name = request.form.get('name')
+        email = request.form.get('email')
+        year_of_birth = request.form.get('year_of_birth')
+        qualification = request.form.get('qualification')
+        salary = request.form.get('salary')
+        job_title = request.form.get('job_title')
+        date_of_joining = request.form.get('date_of_joining')
+        department = request.form.get('department')
+        status = request.form.get('status')
+        version = request.form.get('version') or None
+
+        try:
+            employee_list.update_employee(id, name, email, year_of_birth, qualification, salary, job_title, date_of_joining, department, status, version)
+            flash('Employee updated successfully!', 'success')
+        except EmployeeException as e:
+            flash(str(e), 'error')
+
+        return redirect(url_for('dashboard.index'))
+
+    employee = employee_list.get_employee_by_id(id)
+    if not employee:
+        flash('Employee not found.', 'error')
+        return redirect(url_for('dashboard.index'))
+
+    return render_template('edit_employee.html', employee=employee)
+
+
+# CLI: flask --app app import-employees employees.csv
+@blueprint.cli.command('import-employees')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+def import_employees_command(path):
+    with open(path, 'rb') as stream:
+        report = import_employees(iter_records(stream, detect_format(path)), employee_factory, employee_list.add_employees)
+    click.echo(f"Imported {report['imported']} employees, {len(report['errors'])} errors")
+    for error in report['errors']:
+        click.echo(f"  row {error['row']}: {error['error']}")
+    if 'error' in report:
+        raise click.ClickException(report['error'])
+
+# CLI: flask --app app export-employees employees.csv
+@blueprint.cli.command('export-employees')
+@click.argument('path', type=click.Path(dir_okay=False, writable=True))
+def export_employees_command(path):
+    formatter = format_jsonl if detect_format(path) == 'jsonl' else format_csv
+    with open(path, 'w', encoding='utf-8', newline='') as out:
+        for chunk in formatter(employee_list.iter_employees(), EMPLOYEE_FIELDS):
+            out.write(chunk)
+    click.echo(f"Exported employees to {path}")
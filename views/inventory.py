@@ -0,0 +1,89 @@
+from datetime import date
+
+from flask import Blueprint, request, render_template, redirect, url_for, flash, jsonify
+
+from inventory import InventoryException
+from pagination import decode_cursor, page_size
+from services import inventory_stock, assignment_cache, employee_list
+from views import is_logged_in, cached_page
+
+blueprint = Blueprint('inventory', __name__)
+
+
+@blueprint.route('/add_inventory', methods=['GET', 'POST'])
+def add_inventory():
+    if request.method == 'POST':
+        name = request.form['name']
+        quantity = int(request.form['quantity'])
+        description = request.form.get('description', '')
+
+        try:
+            inventory_stock.add_item(name, quantity, description)
+        except InventoryException as e:
+            flash(str(e), 'error')
+            return redirect(url_for('inventory.add_inventory'))
+        return redirect(url_for('inventory.inventory_list'))
+    
+    return render_template('add_inventory.html')
+
+@blueprint.route('/inventory_list')
+@cached_page('inventory')
+def inventory_list():
+    inventory_items = inventory_stock.list_items()
+    return render_template('inventory_list.html', inventory_items=inventory_items)
+
+@blueprint.route('/assign_inventory', methods=['GET', 'POST'])
+def assign_inventory():
+    if request.method == 'POST':
+        # Several employees and/or items may be selected: every item goes to every employee
+        employee_ids = [int(id) for id in request.form.getlist('employee_id')]
+        inventory_ids = [int(id) for id in request.form.getlist('inventory_id')]
+        assigned_date = request.form['assigned_date']
+
+        try:
+            inventory_stock.assign_bulk(employee_ids, inventory_ids, assigned_date)
+        except InventoryException as e:
+            flash(str(e), 'error')
+            return redirect(url_for('inventory.assign_inventory'))
+        return redirect(url_for('inventory.employee_inventory_list'))
+    
+    employees = employee_list.get_employee_names()
+    inventory_items = inventory_stock.list_items()
+
+    return render_template('assign_inventory.html', employees=employees, inventory_items=inventory_items)
+
+@blueprint.route('/return_inventory/<int:id>', methods=['POST'])
+def return_inventory(id):
+    try:
+        inventory_stock.return_assignment(id, request.form.get('returned_date') or date.today().isoformat())
+        flash('Inventory returned successfully!', 'success')
+    except InventoryException as e:
+        flash(str(e), 'error')
+    return redirect(url_for('inventory.employee_inventory_list'))
+
+@blueprint.route('/employee_inventory_list')
+def employee_inventory_list():
+    query = {
+        'employee_id': request.args.get('employee_id', type=int),
+        'inventory_id': request.args.get('inventory_id', type=int),
+        'date_from': request.args.get('date_from', ''),
+        'date_to': request.args.get('date_to', ''),
+        'limit': page_size(request.args.get('limit')),
+    }
+    after = decode_cursor(request.args.get('after'))
+    key = (tuple(sorted(query.items())), tuple(after) if after else None)
+    assignments, next_cursor = assignment_cache.get_or_load(key, lambda: inventory_stock.get_assignment_page(after=after, **query))
+    return render_template('employee_inventory_list.html', assignments=assignments, next_cursor=next_cursor, query=query)
+
+# Items currently assigned to one employee (used by the profile page)
+@blueprint.route('/employee/<int:id>/inventory')
+def employee_inventory(id):
+    if not is_logged_in():
+        return jsonify({'error': 'User not logged in'}), 401
+
+    items = assignment_cache.get_or_load(('employee', id), lambda: inventory_stock.get_employee_items(id))
+    return jsonify({'employee_id': id, 'items': items})
+
+@blueprint.route('/inventory')
+def inventory():
+    return render_template('inventory.html')
@@ -0,0 +1,76 @@
+from flask import Blueprint, request, session, jsonify, url_for
+
+from jobs import JobQueueFull, FINISHED, HIGH, LOW, NORMAL
+from services import jobs
+from views import is_logged_in
+
+blueprint = Blueprint('jobs', __name__)
+
+
+# Seconds clients are asked to wait before retrying a refused submission
+RETRY_AFTER_SECONDS = 5
+
+
+def job_response(job, status=200):
+    response = jsonify(dict(job.to_dict(), url=url_for('jobs.job_status', job_id=job.id)))
+    response.status_code = status
+    if job.status not in FINISHED:
+        response.headers['Location'] = url_for('jobs.job_status', job_id=job.id)
+    return response
+
+def submit_job(kind, params=None, priority=NORMAL):
+    """
+    Queues a job for the logged in user and returns the 202 response,
+    or 503 with Retry-After when the queue is full.
+    """
+    try:
+        job = jobs.submit(kind, params, priority=priority, owner=session.get('user_id'))
+    except JobQueueFull as e:
+        response = jsonify({'error': str(e)})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(RETRY_AFTER_SECONDS)
+        return response
+    return job_response(job, 202)
+
+# Submit a job: POST /jobs {"kind": "report", "params": {"name": "salary"}, "priority": 0}
+@blueprint.route('/jobs', methods=['POST'])
+def create_job():
+    if not is_logged_in():
+        return jsonify({'error': 'User not logged in'}), 401
+
+    data = request.get_json(silent=True) or {}
+    kind = data.get('kind')
+    if not jobs.is_public(kind):
+        return jsonify({'error': f"Unknown job kind. Choose one of: {', '.join(jobs.public_kinds())}"}), 400
+    params = data.get('params') or {}
+    if not isinstance(params, dict):
+        return jsonify({'error': 'params must be an object'}), 400
+    priority = data.get('priority', NORMAL)
+    if not isinstance(priority, int) or not HIGH <= priority <= LOW:
+        return jsonify({'error': f"priority must be an integer from {HIGH} (highest) to {LOW}"}), 400
+    return submit_job(kind, params, priority)
+
+# Poll a job: status, timings and, once finished, its result or error
+@blueprint.route('/jobs/<job_id>')
+def job_status(job_id):
+    if not is_logged_in():
+        return jsonify({'error': 'User not logged in'}), 401
+
+    job = jobs.get(job_id)
+    if job is None or job.owner != session.get('user_id'):
+        return jsonify({'error': 'Job not found'}), 404
+    return job_response(job)
+
+@blueprint.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    if not is_logged_in():
+        return jsonify({'error': 'User not logged in'}), 401
+
+    job = jobs.get(job_id)
+    if job is None or job.owner != session.get('user_id'):
+        return jsonify({'error': 'Job not found'}), 404
+    if not jobs.cancel(job_id):
+        return jsonify({'error': f"Job already {jobs.get(job_id).status}"}), 409
+    # A job running in another worker is only flagged; it ends as cancelled once that worker sees the flag
+    job = jobs.get(job_id)
+    return job_response(job, 200 if job.status in FINISHED else 202)